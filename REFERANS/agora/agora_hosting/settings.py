@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/5.1/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,7 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'customers.metrics.RequestMetricsMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -54,7 +56,8 @@ ROOT_URLCONF = 'agora_hosting.urls'
 
 TEMPLATES = [
     {
-        'BACKEND': 'django.template.backends.django.DjangoTemplates',
+        # DjangoTemplates ile aynı; istek ölçümü açıkken render süresini de kaydeder
+        'BACKEND': 'customers.metrics.InstrumentedDjangoTemplates',
         'DIRS': [
             BASE_DIR / 'templates',
         ],
@@ -76,13 +79,51 @@ WSGI_APPLICATION = 'agora_hosting.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/5.1/ref/settings/#databases
 
+# CONN_MAX_AGE: bağlantılar istekler arasında açık kalır (pragma'lar bağlantı başına bir kez).
+# timeout: kilitli veritabanında hata vermeden önce beklenecek saniye (busy_timeout).
+# transaction_mode IMMEDIATE: yazma kilidi transaction başında alınır; okumadan yazmaya
+# geçerken oluşan "database is locked" hataları yerine sırayla beklenir.
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
         'NAME': BASE_DIR / 'db.sqlite3',
+        'CONN_MAX_AGE': 60,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'timeout': 20,
+            'transaction_mode': 'IMMEDIATE',
+        },
     }
 }
 
+# Okuma replikası (customers.db.ReplicaRouter): AGORA_DB_REPLICA tanımlıysa liste, detay ve
+# dashboard görünümlerinin okumaları bu bağlantıdan yapılır. SQLite'ta aynı dosyaya salt
+# okunur ikinci bağlantı (WAL sayesinde yazarları beklemez):
+#   AGORA_DB_REPLICA="file:/yol/db.sqlite3?mode=ro"
+if os.environ.get('AGORA_DB_REPLICA'):
+    DATABASES['replica'] = {
+        **DATABASES['default'],
+        'NAME': os.environ['AGORA_DB_REPLICA'],
+        'OPTIONS': {'timeout': 20},
+        'TEST': {'MIRROR': 'default'},
+    }
+
+DATABASE_ROUTERS = ['customers.db.ReplicaRouter']
+
+# Veritabanı dosyasının journal modu. Kalıcı bir ayardır; bağlantı açılışında değil, kurulumda
+# bir kez uygulanır: manage.py set_journal_mode. WAL: okuyucular yazarı, yazar okuyucuları beklemez.
+CUSTOMERS_SQLITE_JOURNAL_MODE = 'WAL'
+
+# Her yeni SQLite bağlantısında uygulanan pragma'lar (customers.db.apply_pragmas); yalnızca
+# bağlantıya özgü olanlar. synchronous=NORMAL WAL'da güvenlidir (çökmede yalnızca son
+# commit'ler kaybolabilir, dosya bozulmaz).
+CUSTOMERS_SQLITE_PRAGMAS = {
+    'synchronous': 'NORMAL',
+    'mmap_size': 256 * 1024 * 1024,
+    'cache_size': -64 * 1024,  # negatif: KiB cinsinden (64 MB)
+    'temp_store': 'MEMORY',
+}
+
 
 # Password validation
 # https://docs.djangoproject.com/en/5.1/ref/settings/#auth-password-validators
@@ -129,3 +170,64 @@ DEFAULT_AUTO_FIELD = 'django.db.models.BigAutoField'
 LOGIN_URL = 'login'
 LOGIN_REDIRECT_URL = 'customers:dashboard'
 LOGOUT_REDIRECT_URL = 'login'
+
+# İstek ölçümleri (customers.metrics.RequestMetricsMiddleware)
+# Açıkken /metrics/ adresi Prometheus formatında, ?format=json ile JSON döner.
+# Erişim: staff kullanıcılar veya "Authorization: Bearer <token>" başlığı.
+CUSTOMERS_METRICS_ENABLED = False
+CUSTOMERS_METRICS_TOKEN = None
+
+# "Yakında bitecek" penceresi (gün): dashboard, listeler ve /api/expirations/ varsayılanı
+CUSTOMERS_EXPIRING_SOON_DAYS = 30
+
+# E-posta (yenileme hatırlatmaları). Geliştirmede yerel SMTP havuzu:
+#   python -m aiosmtpd -n -l localhost:1025
+EMAIL_BACKEND = 'django.core.mail.backends.smtp.EmailBackend'
+EMAIL_HOST = 'localhost'
+EMAIL_PORT = 1025
+DEFAULT_FROM_EMAIL = 'Com People <destek@compeople.com.tr>'
+
+# Hatırlatma gönderiminde eşzamanlı SMTP bağlantısı sayısı
+CUSTOMERS_REMINDER_WORKERS = 4
+
+# Önbellek (customers.cache): sonuçlar model sürüm anahtarlarına bağlanır,
+# kayıt/silme sinyalleri sürümü artırır. Sürüm anahtarları tüm worker süreçlerince
+# görülmelidir; süreç içi LocMemCache'te bir süreçteki kayıt diğerlerinin önbelleğini
+# geçersiz kılmaz (customers.W001 uyarısı). Bu yüzden varsayılan, aynı makinedeki süreçlerin
+# paylaştığı dosya önbelleğidir. Tahliyesi LRU değildir ve bellek değil disk kullanır: her set'te
+# dizin sayılır, MAX_ENTRIES aşılınca dosyaların rastgele 1/CULL_FREQUENCY'si silinir (bayat
+# kayıtlar zaten TIMEOUT ile düşer). Bellekte sınırlı, LRU tahliyeli paylaşımlı önbellek için Redis:
+#   'BACKEND': 'django.core.cache.backends.redis.RedisCache', 'LOCATION': 'redis://127.0.0.1:6379/1'
+#   (Redis tarafında maxmemory + maxmemory-policy allkeys-lru)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'customers': {
+        'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache',
+        'LOCATION': os.environ.get('AGORA_CACHE_DIR', BASE_DIR / 'cache' / 'customers'),
+        'TIMEOUT': 300,
+        'OPTIONS': {
+            'MAX_ENTRIES': 2000,
+            'CULL_FREQUENCY': 10,
+        },
+    },
+}
+CUSTOMERS_CACHE_ALIAS = 'customers'
+CUSTOMERS_CACHE_TIMEOUT = 300
+
+# Yenileme faturaları (customers.renewals, generate_renewal_invoices komutu).
+# Numara: önek + 6 haneli sıra ({year} fatura yılıdır), ör. YNL-2025-000042.
+# Fiyatlar hizmet türüne göre; hosting için paket adına özel fiyat tanımlanabilir.
+# Fiyatı olmayan hizmetler faturalanmaz ve raporda listelenir.
+CUSTOMERS_INVOICE_PREFIX = 'YNL-{year}-'
+CUSTOMERS_RENEWAL_PRICES = {
+    'domain': '450.00',
+    'hosting': '1500.00',
+    'ssl': '750.00',
+}
+CUSTOMERS_RENEWAL_PACKAGE_PRICES = {}
+
+# Müşteri silme: açıkken müşteri tek UPDATE ile gizlenir (deleted_at) ve ilişkili kayıtlar
+# purge_customers komutuyla partiler halinde silinir. Kapalıyken Django'nun CASCADE silmesi.
+CUSTOMERS_SOFT_DELETE = True
@@ -1,33 +1,314 @@
-from django.contrib import admin
-from .models import Customer, Domain, HostingService, SSLCertificate, Invoice
+from datetime import date, timedelta
+
+from django.contrib import admin, messages
+from django.contrib.admin.views.main import PAGE_VAR
+from django.core.exceptions import PermissionDenied
+from django.core.paginator import Paginator
+from django.db.models import F, Max, Min, Q, QuerySet
+from django.db.models.expressions import Col
+from django.template.response import TemplateResponse
+from django.urls import path
+from django.utils.functional import cached_property
+
+from .forms import ImportForm
+from .importers import detect_format, import_files, open_text
+from .models import (
+    Customer, DashboardCounter, Domain, HostingService, SSLCertificate, Invoice, InvoiceSequence, PurgeJob, ReminderLog,
+    Renewal, SweepRun,
+)
+from .purge import soft_delete, soft_delete_enabled
+from .renewals import bulk_renew
+from .search import matching_ids
+
+# Yükleme sonrası sayfada gösterilecek en fazla hata satırı
+DISPLAYED_IMPORT_ERRORS = 200
+# Filtreli listelerde sayım en az bu kadar satırda kesilir; istenen sayfadan sonra
+# COUNT_PAGES_AHEAD sayfa daha sayılır ki kesilen listenin sonraki sayfalarına geçilebilsin
+COUNT_LIMIT = 10000
+COUNT_PAGES_AHEAD = 5
+# Filtresiz listelerin toplamı: signals ile güncel tutulan dashboard sayaçları
+TOTAL_COUNTERS = {
+    Customer: 'customer.total',
+    Domain: 'domain.total',
+    HostingService: 'hosting.total',
+    SSLCertificate: 'ssl.total',
+    Invoice: 'invoice.total',
+}
+
+
+class CounterPaginator(Paginator):
+    """Changelist sayımı: tam COUNT(*) yerine sayaç tablosu ya da sınırlı sayım.
+
+    Sınırlı sayım istenen sayfanın birkaç sayfa ötesine kadar yapılır; kesildiyse
+    ``truncated`` doğrudur ve şablonlar adedi "10000+" olarak gösterir.
+    """
+
+    def __init__(self, *args, page=1, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.requested_page = page
+        self.truncated = False
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        name = TOTAL_COUNTERS.get(queryset.model)
+        # Varsayılan manager'ın kendi koşulu (silinmiş müşteriler) filtre sayılmaz
+        if name and queryset.query.where == queryset.model._default_manager.all().query.where:
+            total = DashboardCounter.objects.filter(name=name).values_list('count', flat=True).first()
+            if total is not None:
+                return total
+        limit = max(COUNT_LIMIT, (self.requested_page + COUNT_PAGES_AHEAD) * self.per_page)
+        count = queryset.order_by()[:limit + 1].count()
+        self.truncated = count > limit
+        return min(count, limit)
+
+
+def _truncate(value, kind):
+    if kind == 'year':
+        return date(value.year, 1, 1)
+    if kind == 'month':
+        return date(value.year, value.month, 1)
+    return value
+
+
+def _next_period(value, kind):
+    if kind == 'year':
+        return date(value.year + 1, 1, 1)
+    if kind == 'month':
+        return date(value.year + value.month // 12, value.month % 12 + 1, 1)
+    return value + timedelta(days=1)
+
+
+class DateSeekQuerySet(QuerySet):
+    """date_hierarchy sorguları tarih index'inde sıralı aramalarla.
+
+    Django ilk seviyeyi MIN() ve MAX() ile birlikte (SQLite'ta tam tarama), dönemleri
+    SELECT DISTINCT ile bulur. Liste yalnızca tarih alanıyla (ya da hiç) filtrelenmişse
+    her uç ve her dönem için index'te bir sonraki değere atlanır: sorgu sayısı dönem
+    sayısı kadardır, satır sayısından bağımsızdır. Başka filtre varsa veritabanı başka
+    bir index seçebileceğinden Django'nun tek sorgusu kullanılır.
+    dates() queryset değil liste döner; yalnızca admin içinde kullanılır.
+    """
+
+    def _seekable(self, field_name):
+        if self.query.is_sliced:
+            return False
+        return all(
+            expression.target.name == field_name
+            for lookup in self.query.where.leaves()
+            for expression in lookup.flatten()
+            if isinstance(expression, Col)
+        )
+
+    def _first(self, field_name, descending=False, **lookups):
+        return (
+            self.filter(**{f'{field_name}__isnull': False}, **lookups)
+            .order_by(f'-{field_name}' if descending else field_name)
+            .values_list(field_name, flat=True)
+            .first()
+        )
+
+    def aggregate(self, *args, **kwargs):
+        seeks = {}
+        for name, expression in kwargs.items():
+            if not isinstance(expression, (Min, Max)) or expression.filter is not None:
+                break
+            source = expression.get_source_expressions()[0]
+            if not isinstance(source, F):
+                break
+            seeks[name] = (source.name, isinstance(expression, Max))
+        if args or not kwargs or len(seeks) != len(kwargs) or not all(
+            self._seekable(field_name) for field_name, _ in seeks.values()
+        ):
+            return super().aggregate(*args, **kwargs)
+        return {name: self._first(field_name, descending) for name, (field_name, descending) in seeks.items()}
+
+    def dates(self, field_name, kind, order='ASC'):
+        if kind not in ('year', 'month', 'day') or not self._seekable(field_name):
+            return super().dates(field_name, kind, order)
+        periods = []
+        value = self._first(field_name)
+        while value is not None:
+            periods.append(_truncate(value, kind))
+            value = self._first(field_name, **{f'{field_name}__gte': _next_period(value, kind)})
+        return periods[::-1] if order == 'DESC' else periods
+
+
+class LargeTableMixin:
+    # Büyük tablolar: sayım CounterPaginator'dan, filtresiz toplam ayrıca sayılmaz
+    paginator = CounterPaginator
+    show_full_result_count = False
+
+    def get_paginator(self, request, queryset, per_page, orphans=0, allow_empty_first_page=True):
+        try:
+            page = max(1, int(request.GET.get(PAGE_VAR, 1)))
+        except ValueError:
+            page = 1
+        return self.paginator(queryset, per_page, orphans, allow_empty_first_page, page=page)
+
+    def get_queryset(self, request):
+        queryset = super().get_queryset(request)
+        if self.date_hierarchy:
+            queryset = DateSeekQuerySet(queryset.model, query=queryset.query.chain(), using=queryset._db)
+        return queryset
+
+
+class IndexedSearchMixin:
+    # Arama kutusu tam metin index'ini kullanır; index yoksa search_fields (LIKE) devreye girer.
+    # search_by_customer: müşteri adıyla eşleşen kayıtlar da listelenir (customer__company_name gibi)
+    search_kind = None
+    search_by_customer = False
+
+    def get_search_results(self, request, queryset, search_term):
+        ids = matching_ids(self.search_kind, search_term)
+        if ids is None:
+            return super().get_search_results(request, queryset, search_term)
+        condition = Q(pk__in=ids)
+        if self.search_by_customer:
+            condition |= Q(customer_id__in=matching_ids('customer', search_term))
+        return queryset.filter(condition), False
+
+def renew_action(months, description):
+    def action(modeladmin, request, queryset):
+        renewals = bulk_renew(modeladmin.renewal_type, list(queryset.values_list('pk', flat=True)), months=months)
+        modeladmin.message_user(request, f'{len(renewals)} hizmet yenilendi.', messages.SUCCESS)
+    action.__name__ = f'renew_{months}_months'
+    return admin.action(description=description, permissions=['change'])(action)
+
+
+class RenewalActionsMixin:
+    # Seçilen hizmetleri tek transaction'da uzatır (renewals.bulk_renew)
+    renewal_type = None
+    actions = [renew_action(1, 'Seçilenleri 1 ay yenile'), renew_action(12, 'Seçilenleri 1 yıl yenile')]
+
 
 @admin.register(Customer)
-class CustomerAdmin(admin.ModelAdmin):
+class CustomerAdmin(LargeTableMixin, IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = 'customer'
+    # Otomatik tamamlama sıralı sayfalar; customer_company_idx
+    ordering = ['company_name', 'pk']
     list_display = ['company_name', 'contact_name', 'email', 'phone', 'registration_date']
     list_filter = ['registration_date']
-    search_fields = ['company_name', 'contact_name', 'email']
+    search_fields = ['company_name', 'contact_name', 'email', 'customer_no']
+    change_list_template = 'admin/customers/customer/change_list.html'
+
+    def get_urls(self):
+        urls = [
+            path('import/', self.admin_site.admin_view(self.import_view), name='customers_customer_import'),
+        ]
+        return urls + super().get_urls()
+
+    def import_view(self, request):
+        if not self.has_add_permission(request):
+            raise PermissionDenied
+        report = None
+        form = ImportForm(request.POST or None, request.FILES or None)
+        if request.method == 'POST' and form.is_valid():
+            upload = form.cleaned_data['file']
+            report = import_files(
+                [(form.cleaned_data['kind'], open_text(upload.file), detect_format(upload.name))],
+                dry_run=form.cleaned_data['dry_run'],
+            )
+        context = {
+            **self.admin_site.each_context(request),
+            'opts': self.model._meta,
+            'title': 'Toplu İçe Aktarma',
+            'form': form,
+            'report': report,
+            'counts': [(kind, counts) for kind, counts in report.counts.items() if any(counts.values())] if report else [],
+            'errors': report.errors[:DISPLAYED_IMPORT_ERRORS] if report else [],
+            'hidden_errors': report.error_count - DISPLAYED_IMPORT_ERRORS if report else 0,
+        }
+        return TemplateResponse(request, 'admin/customers/customer/import.html', context)
+
+    # Silme de görünümdeki gibi: ilişkili kayıtlar toplanıp listelenmez, PurgeJob temizler
+    def get_deleted_objects(self, objs, request):
+        if not soft_delete_enabled():
+            return super().get_deleted_objects(objs, request)
+        perms_needed = set() if self.has_delete_permission(request) else {self.opts.verbose_name}
+        objs = list(objs)
+        return [str(obj) for obj in objs], {self.opts.verbose_name_plural: len(objs)}, perms_needed, []
+
+    def delete_model(self, request, obj):
+        if soft_delete_enabled():
+            soft_delete(obj)
+        else:
+            super().delete_model(request, obj)
+
+    def delete_queryset(self, request, queryset):
+        if not soft_delete_enabled():
+            return super().delete_queryset(request, queryset)
+        for customer in queryset:
+            soft_delete(customer)
 
 @admin.register(Domain)
-class DomainAdmin(admin.ModelAdmin):
+class DomainAdmin(RenewalActionsMixin, LargeTableMixin, IndexedSearchMixin, admin.ModelAdmin):
+    renewal_type = 'domain'
+    search_kind = 'domain'
+    search_by_customer = True
+    ordering = ['name', 'pk']
     list_display = ['name', 'customer', 'registration_date', 'expiration_date', 'is_active']
+    list_select_related = ['customer']
+    autocomplete_fields = ['customer']
     list_filter = ['is_active', 'registration_date']
     search_fields = ['name', 'customer__company_name']
 
 @admin.register(HostingService)
-class HostingServiceAdmin(admin.ModelAdmin):
+class HostingServiceAdmin(RenewalActionsMixin, LargeTableMixin, admin.ModelAdmin):
+    renewal_type = 'hosting'
     list_display = ['customer', 'domain', 'package', 'status', 'start_date', 'expiration_date']
     list_filter = ['status', 'package']
     search_fields = ['customer__company_name', 'domain__name']
     date_hierarchy = 'start_date'
+    list_select_related = ['customer', 'domain']
+    autocomplete_fields = ['customer', 'domain']
 
 @admin.register(SSLCertificate)
-class SSLCertificateAdmin(admin.ModelAdmin):
+class SSLCertificateAdmin(RenewalActionsMixin, LargeTableMixin, admin.ModelAdmin):
+    renewal_type = 'ssl'
     list_display = ['domain', 'start_date', 'expiration_date', 'is_active']
     list_filter = ['is_active']
     search_fields = ['domain__name']
+    list_select_related = ['domain']
+    autocomplete_fields = ['customer', 'domain']
 
 @admin.register(Invoice)
-class InvoiceAdmin(admin.ModelAdmin):
+class InvoiceAdmin(LargeTableMixin, IndexedSearchMixin, admin.ModelAdmin):
+    search_kind = 'invoice'
+    search_by_customer = True
     list_display = ['invoice_number', 'customer', 'amount', 'issue_date', 'due_date', 'payment_status']
-    list_filter = ['payment_status', 'payment_method']
+    list_filter = ['payment_status', 'payment_method', 'service_type']
     search_fields = ['invoice_number', 'customer__company_name']
+    date_hierarchy = 'issue_date'
+    list_select_related = ['customer']
+    autocomplete_fields = ['customer']
+
+@admin.register(InvoiceSequence)
+class InvoiceSequenceAdmin(admin.ModelAdmin):
+    list_display = ['prefix', 'last_value']
+
+@admin.register(SweepRun)
+class SweepRunAdmin(admin.ModelAdmin):
+    list_display = ['ran_at', 'as_of', 'overdue_invoices', 'expired_hosting', 'reactivated_hosting']
+
+@admin.register(ReminderLog)
+class ReminderLogAdmin(LargeTableMixin, admin.ModelAdmin):
+    list_display = ['customer', 'service_type', 'object_id', 'expiration_date', 'recipients', 'sent_at']
+    list_filter = ['service_type']
+    search_fields = ['customer__company_name', 'recipients']
+    list_select_related = ['customer']
+    autocomplete_fields = ['customer']
+
+@admin.register(Renewal)
+class RenewalAdmin(LargeTableMixin, admin.ModelAdmin):
+    list_display = ['customer', 'service_type', 'object_id', 'previous_expiration', 'new_expiration', 'renewed_at']
+    list_filter = ['service_type']
+    search_fields = ['customer__company_name']
+    list_select_related = ['customer']
+    autocomplete_fields = ['customer']
+
+@admin.register(PurgeJob)
+class PurgeJobAdmin(admin.ModelAdmin):
+    list_display = ['company_name', 'customer_id', 'status', 'requested_at', 'finished_at', 'total_rows', 'deleted_rows']
+    list_filter = ['status']
+    readonly_fields = [field.name for field in PurgeJob._meta.fields]
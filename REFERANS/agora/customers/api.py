@@ -0,0 +1,134 @@
+from collections import defaultdict
+
+from .models import Customer, HostingService, Domain, SSLCertificate, Invoice
+
+# Mobil istemci için salt okunur JSON kaynakları. Satırlar model örneği
+# oluşturulmadan .values() ile okunur; ileri ilişkiler (customer, domain) aynı
+# sorguda JOIN ile, geri ilişkiler (müşterinin domainleri vb.) sayfa başına tek
+# IN sorgusuyla gelir.
+#   model:    kaynağın modeli
+#   fields:   izin verilen alanlar (?fields=a,b)
+#   default:  ?fields verilmezse dönen alanlar
+#   related:  ileri ilişki adı -> ilişkili kaynak (?embed=customer)
+#   children: geri ilişki adı -> (kaynak, yabancı anahtar) (?embed=domains)
+API_RESOURCES = {
+    'customers': {
+        'model': Customer,
+        'fields': (
+            'id', 'customer_no', 'company_name', 'contact_name', 'email', 'email2', 'email3', 'phone',
+            'address', 'tax_office', 'tax_number', 'registration_date', 'notes', 'created_at', 'updated_at',
+        ),
+        'default': ('id', 'customer_no', 'company_name', 'contact_name', 'email', 'phone'),
+        'related': {},
+        'children': {
+            'domains': ('domains', 'customer'),
+            'hosting': ('hosting', 'customer'),
+            'ssl': ('ssl', 'customer'),
+            'invoices': ('invoices', 'customer'),
+        },
+    },
+    'domains': {
+        'model': Domain,
+        'fields': (
+            'id', 'customer_id', 'name', 'registration_date', 'expiration_date', 'is_active',
+            'nameserver1', 'nameserver2', 'nameserver3', 'nameserver4', 'updated_at',
+        ),
+        'default': ('id', 'name', 'expiration_date', 'is_active'),
+        'related': {'customer': 'customers'},
+        'children': {},
+    },
+    'hosting': {
+        'model': HostingService,
+        'fields': (
+            'id', 'customer_id', 'domain_id', 'package', 'status', 'start_date', 'expiration_date',
+            'renewal_count', 'notes', 'updated_at',
+        ),
+        'default': ('id', 'package', 'status', 'expiration_date'),
+        'related': {'customer': 'customers', 'domain': 'domains'},
+        'children': {},
+    },
+    'ssl': {
+        'model': SSLCertificate,
+        'fields': ('id', 'customer_id', 'domain_id', 'start_date', 'expiration_date', 'is_active', 'updated_at'),
+        'default': ('id', 'expiration_date', 'is_active'),
+        'related': {'customer': 'customers', 'domain': 'domains'},
+        'children': {},
+    },
+    'invoices': {
+        'model': Invoice,
+        'fields': (
+            'id', 'customer_id', 'invoice_number', 'description', 'amount', 'issue_date', 'due_date',
+            'payment_status', 'payment_date', 'payment_method', 'payment_notes', 'notes',
+            'service_type', 'service_id', 'service_expiration', 'updated_at',
+        ),
+        'default': ('id', 'invoice_number', 'amount', 'due_date', 'payment_status'),
+        'related': {'customer': 'customers'},
+        'children': {},
+    },
+}
+
+
+class ApiError(Exception):
+    def __init__(self, code, detail):
+        super().__init__(detail)
+        self.code = code
+        self.detail = detail
+
+
+def _split(value):
+    return [part for part in (value or '').replace(' ', '').split(',') if part]
+
+
+def _fields(request, resource, param='fields'):
+    spec = API_RESOURCES[resource]
+    fields = _split(request.GET.get(param)) or list(spec['default'])
+    unknown = [field for field in fields if field not in spec['fields']]
+    if unknown:
+        raise ApiError('INVALID_FIELDS', f"{resource} için geçersiz alan: {', '.join(unknown)}")
+    return list(dict.fromkeys(fields))
+
+
+class Selection:
+    """İstekteki ?fields= ve ?embed= seçimini values() sütunlarına ve çıktı şekline çevirir."""
+
+    def __init__(self, request, resource):
+        spec = API_RESOURCES[resource]
+        self.resource = resource
+        self.fields = _fields(request, resource)
+        self.related = {}
+        self.children = {}
+        for name in _split(request.GET.get('embed')):
+            # İlişkili kaynağın alanları ?fields.<ilişki>= ile seçilir
+            if name in spec['related']:
+                self.related[name] = _fields(request, spec['related'][name], f'fields.{name}')
+            elif name in spec['children']:
+                child, fk = spec['children'][name]
+                self.children[name] = (child, fk, _fields(request, child, f'fields.{name}'))
+            else:
+                raise ApiError('INVALID_EMBED', f'{resource} için geçersiz ilişki: {name}')
+
+    def columns(self, extra=()):
+        columns = ['pk', *extra, *self.fields]
+        for name, fields in self.related.items():
+            columns += [f'{name}__{field}' for field in fields]
+        return list(dict.fromkeys(columns))
+
+    def serialize(self, rows):
+        related = [(name, [(field, f'{name}__{field}') for field in fields]) for name, fields in self.related.items()]
+        items = []
+        for row in rows:
+            item = {field: row[field] for field in self.fields}
+            for name, pairs in related:
+                item[name] = {field: row[column] for field, column in pairs}
+            items.append(item)
+        for name, (child, fk, fields) in self.children.items():
+            # Geri ilişki: sayfadaki tüm satırlar için tek sorgu
+            grouped = defaultdict(list)
+            queryset = API_RESOURCES[child]['model'].objects.filter(
+                **{f'{fk}_id__in': [row['pk'] for row in rows]}
+            ).order_by(f'{fk}_id', 'pk').values(f'{fk}_id', *fields)
+            for child_row in queryset:
+                grouped[child_row[f'{fk}_id']].append({field: child_row[field] for field in fields})
+            for item, row in zip(items, rows):
+                item[name] = grouped.get(row['pk'], [])
+        return items
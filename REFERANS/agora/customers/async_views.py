@@ -0,0 +1,140 @@
+import asyncio
+
+from asgiref.sync import sync_to_async
+from django.contrib.auth.decorators import login_required
+from django.shortcuts import aget_object_or_404, render
+from django.utils import timezone
+
+from .cache import acached, request_key
+from .db import replica_reads
+from .expirations import expiring, soon as expiration_soon
+from .lists import LISTS, paginate_options
+from .models import Customer, HostingService, Domain, SSLCertificate, Invoice
+from .pagination import akeyset_paginate
+from .stats import aget_dashboard_stats, ainvoice_stats
+from .sweeper import unpaid_q
+
+# views.py'deki dashboard, müşteri detayı ve listelerin async karşılıkları (ASGI altında
+# /async/ önekiyle). Birbirinden bağımsız sorgular asyncio.gather ile birlikte beklenir.
+# Şablonlar aynıdır; render senkron olduğundan sync_to_async ile çalıştırılır.
+
+# Liste adı -> (şablon, context adı, önbellek adı ve modelleri). Önbellek anahtarları senkron
+# görünümlerle aynıdır; iki yol aynı kayıtları paylaşır. None ise önbelleğe alınmaz.
+ASYNC_LISTS = {
+    'customers': ('customers/customer_list.html', 'customers', None),
+    'hosting': ('customers/hosting_list.html', 'hosting_services', None),
+    'domains': ('customers/domain_list.html', 'domains', ('domain_list', [Domain, Customer])),
+    'ssl': ('customers/ssl_list.html', 'ssl_certificates', ('ssl_list', [SSLCertificate, Domain, Customer])),
+    'invoices': ('customers/invoice_list.html', 'invoices', ('invoice_list', [Invoice, Customer])),
+}
+
+
+async def _render(request, template_name, context):
+    # Context processor'lar request.user'ı senkron okur; async okunan kullanıcı yeniden sorgulanmasın
+    request.user = await request.auser()
+    return await sync_to_async(render)(request, template_name, context)
+
+
+async def _list(request, name):
+    template_name, context_name, cache = ASYNC_LISTS[name]
+
+    async def page():
+        return await akeyset_paginate(request, LISTS[name]['queryset'](), **paginate_options(name))
+
+    if cache is None:
+        result = await page()
+    else:
+        result = await acached(*cache, page, key_parts=request_key(request))
+    return await _render(request, template_name, {context_name: result, 'page': result})
+
+
+@login_required
+@replica_reads
+async def dashboard(request):
+    async def recent_customers():
+        return [customer async for customer in Customer.objects.order_by('-created_at')[:5]]
+
+    async def pending_invoices():
+        queryset = Invoice.objects.filter(unpaid_q()).select_related('customer').order_by('due_date')
+        return [invoice async for invoice in queryset[:5]]
+
+    stats, recent, pending = await asyncio.gather(
+        acached(
+            'dashboard_stats', [Customer, HostingService, Domain, SSLCertificate, Invoice], aget_dashboard_stats,
+            key_parts=[timezone.localdate()],
+        ),
+        acached('recent_customers', [Customer], recent_customers),
+        acached('pending_invoices', [Invoice, Customer], pending_invoices),
+    )
+
+    # Şablon kullanmadığı sürece çalışmayan tembel sorgular (senkron görünümle aynı)
+    soon = expiration_soon()
+    expiring_services = {
+        'hosting': expiring('hosting', end=soon).select_related('domain', 'customer').order_by('expiration_date')[:5],
+        'domains': expiring('domain', end=soon).select_related('customer').order_by('expiration_date')[:5],
+        'ssl': expiring('ssl', end=soon).select_related('domain', 'customer').order_by('expiration_date')[:5],
+    }
+
+    return await _render(request, 'customers/dashboard.html', {
+        **stats,
+        'recent_customers': recent,
+        'expiring_services': expiring_services,
+        'pending_invoices': pending,
+    })
+
+
+@login_required
+@replica_reads
+async def customer_detail(request, pk):
+    customer = await aget_object_or_404(Customer, pk=pk)
+
+    async def rows(queryset):
+        return [obj async for obj in queryset]
+
+    invoices = Invoice.objects.filter(customer=customer).order_by('-issue_date')
+    hosting_services, domains, ssl_certificates, invoice_list, invoice_stats = await asyncio.gather(
+        rows(HostingService.objects.filter(customer=customer).select_related('domain')),
+        rows(Domain.objects.filter(customer=customer)),
+        rows(SSLCertificate.objects.filter(domain__customer=customer).select_related('domain')),
+        rows(invoices),
+        ainvoice_stats(queryset=invoices.order_by()),
+    )
+
+    return await _render(request, 'customers/customer_detail.html', {
+        'customer': customer,
+        'hosting_services': hosting_services,
+        'domains': domains,
+        'ssl_certificates': ssl_certificates,
+        'invoices': invoice_list,
+        'invoice_stats': invoice_stats,
+    })
+
+
+@login_required
+@replica_reads
+async def customer_list(request):
+    return await _list(request, 'customers')
+
+
+@login_required
+@replica_reads
+async def hosting_list(request):
+    return await _list(request, 'hosting')
+
+
+@login_required
+@replica_reads
+async def domain_list(request):
+    return await _list(request, 'domains')
+
+
+@login_required
+@replica_reads
+async def ssl_list(request):
+    return await _list(request, 'ssl')
+
+
+@login_required
+@replica_reads
+async def invoice_list(request):
+    return await _list(request, 'invoices')
@@ -0,0 +1,57 @@
+from django.db.models import Q
+
+from .models import Customer, Domain
+from .text import fold
+
+DEFAULT_LIMIT = 20
+MAX_RESULTS = 50
+# Aralığın üst sınırı: önekle başlayan her değer prefix + bu karakterden küçüktür
+_HIGHEST = '\U0010ffff'
+
+# Kaynak adı -> model, gösterilen alan, katlanmış anahtar alanı, ek sütunlar ve izin verilen
+# ?filtre -> alan eşlemesi. Arama anahtar sütununun index'inde bir aralık okumasıdır (LIKE index
+# kullanmaz); sonuç LIMIT ile kesildiğinden süre tablo büyüklüğünden bağımsızdır.
+RESOURCES = {
+    'customers': {
+        'model': Customer,
+        'field': 'company_name',
+        'key': 'company_name_key',
+        'columns': ['customer_no'],
+        'filters': {},
+    },
+    'domains': {
+        'model': Domain,
+        'field': 'name',
+        'key': 'name_key',
+        'columns': ['customer_id'],
+        'filters': {'customer': 'customer_id'},
+    },
+}
+
+
+def prefix_q(field, term):
+    # Terim anahtar sütunuyla aynı katlanır: "ŞAHİN", "şahin" ve "sahin" aynı aralıktır
+    prefix = fold(term)
+    return Q(**{f'{field}__gte': prefix, f'{field}__lt': prefix + _HIGHEST})
+
+
+def suggest_queryset(resource, term='', filters=None):
+    config = RESOURCES[resource]
+    queryset = config['model'].objects.all()
+    if term:
+        queryset = queryset.filter(prefix_q(config['key'], term))
+    for name, value in (filters or {}).items():
+        queryset = queryset.filter(**{config['filters'][name]: value})
+    return queryset.order_by(config['key'], 'pk').values('pk', config['field'], *config['columns'])
+
+
+def suggest(resource, term='', limit=DEFAULT_LIMIT, filters=None):
+    """``term`` ile başlayan kayıtlar; (öğeler, devamı var mı) döner."""
+    config = RESOURCES[resource]
+    limit = max(1, min(limit, MAX_RESULTS))
+    rows = list(suggest_queryset(resource, term, filters)[:limit + 1])
+    items = [
+        {'id': row['pk'], 'text': row[config['field']], **{column: row[column] for column in config['columns']}}
+        for row in rows[:limit]
+    ]
+    return items, len(rows) > limit
@@ -0,0 +1,154 @@
+import hashlib
+import threading
+import time
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import connections, router, transaction
+
+DEFAULT_ALIAS = 'default'
+DEFAULT_TIMEOUT = 300
+KEY_PREFIX = 'customers'
+_MISSING = object()
+
+
+def get_cache():
+    return caches[getattr(settings, 'CUSTOMERS_CACHE_ALIAS', DEFAULT_ALIAS)]
+
+
+def _version_key(model):
+    # Sürümler veritabanına özgüdür: aynı önbelleği paylaşan başka bir kurulum ya da
+    # test veritabanı birbirinin sürümlerini (dolayısıyla kayıtlarını) görmez
+    database = connections[router.db_for_write(model)].settings_dict['NAME']
+    return f'{KEY_PREFIX}:version:{database}:{model._meta.label_lower}'
+
+
+def _new_version():
+    # Sürüm anahtarı önbellekten düşerse 1'den başlamak eski kayıtları geri getirebilir;
+    # zamana dayalı başlangıç değeri bunu önler
+    return time.time_ns() // 1000
+
+
+def versions(models):
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    found = cache.get_many(keys)
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        cache.set_many(missing, timeout=None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+async def aversions(models):
+    cache = get_cache()
+    keys = [_version_key(model) for model in models]
+    found = await cache.aget_many(keys)
+    missing = {key: _new_version() for key in keys if key not in found}
+    if missing:
+        await cache.aset_many(missing, timeout=None)
+        found.update(missing)
+    return [found[key] for key in keys]
+
+
+def bump(model):
+    """Modelin sürümünü artırır; o modele bağlı tüm önbellek kayıtları geçersiz olur."""
+    cache = get_cache()
+    key = _version_key(model)
+    if cache.add(key, _new_version(), timeout=None):
+        return
+    # BaseCache.incr (dosya, locmem) anahtarı varsayılan TIMEOUT ile yeniden yazar; süresi dolan
+    # sürüm eski bir değerle yeniden oluşup eski kayıtları geri getirebilirdi. Süresiz yazılır ve
+    # eşzamanlı iki artış aynı değeri üretmesin diye zamana dayalı değerden küçük olmaz.
+    current = cache.get(key)
+    value = _new_version() if current is None else max(current + 1, _new_version())
+    cache.set(key, value, timeout=None)
+
+
+def invalidate(model):
+    # Hemen artırmak aynı transaction içindeki okumaları korur; commit sonrası ikinci
+    # artış, commit öncesi eski veriyi yeni sürümle önbelleğe yazmış okuyucuları düzeltir
+    bump(model)
+    transaction.on_commit(lambda: bump(model))
+
+
+class CacheStats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.counts = {}
+
+    def record(self, name, hit):
+        with self._lock:
+            counts = self.counts.setdefault(name, {'hits': 0, 'misses': 0})
+            counts['hits' if hit else 'misses'] += 1
+
+    def snapshot(self):
+        with self._lock:
+            return {name: dict(counts) for name, counts in sorted(self.counts.items())}
+
+    def reset(self):
+        with self._lock:
+            self.counts = {}
+
+    def prometheus(self):
+        lines = [
+            '# HELP agora_cache_requests_total Önbellek okumaları (sonuca göre)',
+            '# TYPE agora_cache_requests_total counter',
+        ]
+        for name, counts in self.snapshot().items():
+            for result in ('hits', 'misses'):
+                lines.append(f'agora_cache_requests_total{{name="{name}",result="{result[:-1]}"}} {counts[result]}')
+        return '\n'.join(lines) + '\n'
+
+
+stats = CacheStats()
+
+
+def _key(name, key_parts, versions):
+    parts = [str(part) for part in key_parts] + [str(version) for version in versions]
+    digest = hashlib.md5('\x1f'.join(parts).encode()).hexdigest()
+    return f'{KEY_PREFIX}:{name}:{digest}'
+
+
+def _timeout(timeout):
+    if timeout is None:
+        return getattr(settings, 'CUSTOMERS_CACHE_TIMEOUT', DEFAULT_TIMEOUT)
+    return timeout
+
+
+def cached(name, models, compute, key_parts=(), timeout=None):
+    """``compute()`` sonucunu ``models`` sürümlerine bağlı bir anahtarla önbelleğe alır.
+
+    Modellerden birine yazıldığında sürüm değişir ve sonraki çağrı yeniden
+    hesaplar; eski kayıtlar silinmez, TIMEOUT ile ya da backend'in tahliyesiyle düşer
+    (dosya önbelleğinde LRU değildir: MAX_ENTRIES aşılınca rastgele 1/CULL_FREQUENCY silinir).
+    """
+    cache = get_cache()
+    key = _key(name, key_parts, versions(models))
+    value = cache.get(key, _MISSING)
+    if value is not _MISSING:
+        stats.record(name, hit=True)
+        return value
+    stats.record(name, hit=False)
+    value = compute()
+    cache.set(key, value, _timeout(timeout))
+    return value
+
+
+async def acached(name, models, compute, key_parts=(), timeout=None):
+    """cached'in async karşılığı; ``compute`` bir coroutine fonksiyonudur."""
+    cache = get_cache()
+    key = _key(name, key_parts, await aversions(models))
+    value = await cache.aget(key, _MISSING)
+    if value is not _MISSING:
+        stats.record(name, hit=True)
+        return value
+    stats.record(name, hit=False)
+    value = await compute()
+    await cache.aset(key, value, _timeout(timeout))
+    return value
+
+
+def request_key(request):
+    """Liste sayfaları için sorgu parametrelerinden sıralı anahtar parçası."""
+    return sorted((key, tuple(values)) for key, values in request.GET.lists())
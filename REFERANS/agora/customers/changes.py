@@ -0,0 +1,114 @@
+from django.db import connection
+from django.utils import timezone
+
+from .api import API_RESOURCES
+from .models import ChangeEvent
+
+DEFAULT_LIMIT = 500
+MAX_LIMIT = 5000
+
+# Model -> api kaynağı; olaylar api/<kaynak>/ ile aynı adları taşır
+MODEL_RESOURCES = {spec['model']: resource for resource, spec in API_RESOURCES.items()}
+
+# Değişiklik günlüğü. Her yazma (tekil save/delete sinyallerle, toplu yazanlar kendi
+# transaction'ları içinde) ChangeEvent'e bir satır ekler; satırın id'si imleçtir.
+# SQLite tek yazarlıdır, id'ler commit sırasıyla artar: bir istemcinin gördüğü imleçten
+# küçük bir id sonradan görünmez. Aynı kaydın eski olayları compact() ile silinebilir.
+
+
+def record(model, ids, deleted=False):
+    """``ids`` için olay yazar (tek INSERT)."""
+    resource = MODEL_RESOURCES.get(model)
+    if resource is None or not ids:
+        return
+    now = timezone.now()
+    ChangeEvent.objects.bulk_create(
+        [ChangeEvent(resource=resource, object_id=pk, deleted=deleted, changed_at=now) for pk in ids],
+        batch_size=1000,
+    )
+
+
+def insert_events(resource, queryset, deleted=False):
+    """Sorgunun eşleştiği her satır için olay yazar; id'ler Python'a okunmaz.
+
+    ``INSERT INTO ... SELECT`` tek ifadedir; QuerySet.update öncesinde aynı koşulla
+    çağrılır (güncellenecek satırlar) ya da migration'da mevcut kayıtlar için.
+    """
+    sql, params = queryset.order_by().values_list('pk').query.get_compiler(connection=connection).as_sql()
+    changed_at = connection.ops.adapt_datetimefield_value(timezone.now())
+    table = connection.ops.quote_name(ChangeEvent._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'INSERT INTO {table} (resource, object_id, deleted, changed_at) '
+            f'SELECT %s, sub.*, %s, %s FROM ({sql}) sub',
+            [resource, deleted, changed_at, *params],
+        )
+        return cursor.rowcount
+
+
+def record_queryset(queryset, deleted=False):
+    resource = MODEL_RESOURCES.get(queryset.model)
+    if resource is None:
+        return 0
+    return insert_events(resource, queryset, deleted=deleted)
+
+
+def latest_cursor():
+    return ChangeEvent.objects.order_by('-pk').values_list('pk', flat=True).first() or 0
+
+
+def since(cursor=0, resources=None, limit=DEFAULT_LIMIT):
+    """``cursor``dan sonraki değişiklikler.
+
+    Olaylar id sırasıyla ``limit`` kadar okunur; aynı kayda ait olaylardan yalnızca
+    sonuncusu döner. Kayıtların güncel hali kaynak başına tek IN sorgusuyla gelir;
+    satırı artık olmayan (ya da soft-delete edilmiş) kayıt tombstone olarak döner.
+    """
+    limit = max(1, min(limit, MAX_LIMIT))
+    events = ChangeEvent.objects.filter(pk__gt=cursor).order_by('pk')
+    if resources is not None:
+        events = events.filter(resource__in=resources)
+    events = list(events.values_list('pk', 'resource', 'object_id')[:limit + 1])
+    has_more = len(events) > limit
+    events = events[:limit]
+
+    latest = {}
+    for seq, resource, object_id in events:
+        latest.pop((resource, object_id), None)
+        latest[(resource, object_id)] = seq
+
+    by_resource = {}
+    for resource, object_id in latest:
+        by_resource.setdefault(resource, []).append(object_id)
+    rows = {}
+    for resource, ids in by_resource.items():
+        spec = API_RESOURCES[resource]
+        # Model.objects: soft-delete edilmiş müşteriler görünmez, tombstone olur
+        for row in spec['model'].objects.filter(pk__in=ids).values(*spec['fields']):
+            rows[(resource, row['id'])] = row
+
+    items = []
+    for (resource, object_id), seq in latest.items():
+        row = rows.get((resource, object_id))
+        items.append({
+            'seq': seq,
+            'type': resource,
+            'id': object_id,
+            'deleted': row is None,
+            'data': row,
+        })
+    return {
+        'items': items,
+        'next_cursor': events[-1][0] if events else cursor,
+        'has_more': has_more,
+    }
+
+
+def compact():
+    """Her kaydın yalnızca son olayını bırakır; silinen olay sayısını döner."""
+    table = connection.ops.quote_name(ChangeEvent._meta.db_table)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            f'DELETE FROM {table} WHERE id NOT IN (SELECT MAX(id) FROM {table} GROUP BY resource, object_id)'
+        )
+        return cursor.rowcount
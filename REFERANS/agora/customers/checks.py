@@ -0,0 +1,24 @@
+from django.conf import settings
+from django.core.checks import Warning, register
+
+from .cache import DEFAULT_ALIAS
+
+# Süreç içi önbellek: sürüm anahtarı artışı diğer worker süreçlerine ulaşmaz
+PROCESS_LOCAL_BACKEND = 'django.core.cache.backends.locmem.LocMemCache'
+
+
+@register()
+def check_shared_cache(app_configs, **kwargs):
+    alias = getattr(settings, 'CUSTOMERS_CACHE_ALIAS', DEFAULT_ALIAS)
+    backend = settings.CACHES.get(alias, {}).get('BACKEND')
+    if backend != PROCESS_LOCAL_BACKEND:
+        return []
+    return [Warning(
+        f'CUSTOMERS_CACHE_ALIAS ({alias!r}) süreç içi bir önbellek kullanıyor.',
+        hint=(
+            'Kayıt sinyallerinin artırdığı sürüm anahtarları diğer worker süreçlerine ulaşmaz; '
+            'onlar TIMEOUT boyunca eski liste ve dashboard sonuçları döner. Birden fazla süreçle '
+            'çalışırken dosya, veritabanı ya da Redis önbelleği kullanın veya tek süreçle çalıştırın.'
+        ),
+        id='customers.W001',
+    )]
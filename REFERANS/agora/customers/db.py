@@ -0,0 +1,104 @@
+import contextvars
+from contextlib import contextmanager
+from functools import wraps
+
+from asgiref.sync import iscoroutinefunction
+from django.conf import settings
+from django.db import DEFAULT_DB_ALIAS
+
+REPLICA_ALIAS = 'replica'
+
+# Okumaların gideceği bağlantı; yalnızca replica_reads / read_from_replica içinde
+# ayarlıdır. contextvar olduğundan thread'ler ve async görevler birbirini etkilemez.
+_read_alias = contextvars.ContextVar('customers_read_alias', default=None)
+
+
+def replica_alias():
+    """Yapılandırılmışsa replica bağlantısının adı, yoksa None (her şey primary'ye gider)."""
+    alias = getattr(settings, 'CUSTOMERS_REPLICA_ALIAS', REPLICA_ALIAS)
+    return alias if alias in settings.DATABASES else None
+
+
+@contextmanager
+def read_from_replica():
+    token = _read_alias.set(replica_alias())
+    try:
+        yield
+    finally:
+        _read_alias.reset(token)
+
+
+def replica_reads(view):
+    """Salt okunur görünümler için: GET/HEAD isteklerindeki okumalar replica'dan yapılır.
+
+    Oturum ve kullanıcı sorguları middleware'de, bu dekoratörden önce primary'den
+    okunur. POST gibi yazan istekler tamamen primary'de kalır.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def async_wrapper(request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD'):
+                return await view(request, *args, **kwargs)
+            with read_from_replica():
+                return await view(request, *args, **kwargs)
+        return async_wrapper
+
+    @wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method not in ('GET', 'HEAD'):
+            return view(request, *args, **kwargs)
+        with read_from_replica():
+            return view(request, *args, **kwargs)
+    return wrapper
+
+
+class ReplicaRouter:
+    """Yazmalar her zaman primary'ye; okumalar yalnızca işaretli bağlamda replica'ya."""
+
+    def db_for_read(self, model, **hints):
+        return _read_alias.get()
+
+    def db_for_write(self, model, **hints):
+        return DEFAULT_DB_ALIAS
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Replica primary'nin kopyası; iki bağlantıdan gelen nesneler ilişkilendirilebilir
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db == DEFAULT_DB_ALIAS
+
+
+# Veritabanı dosyasına yazılan kalıcı pragma'lar; bağlantı açılışında uygulanmaz
+PERSISTENT_PRAGMAS = {'journal_mode'}
+
+
+def apply_pragmas(connection):
+    """CUSTOMERS_SQLITE_PRAGMAS ayarındaki bağlantı başına pragma'ları yeni SQLite bağlantısına uygular.
+
+    journal_mode kalıcıdır: her bağlantıda (manage.py check, shell...) uygulanırsa dosyayı
+    değiştirir. Kurulumda bir kez ``manage.py set_journal_mode`` ile ayarlanır.
+    """
+    if connection.vendor != 'sqlite':
+        return
+    pragmas = getattr(settings, 'CUSTOMERS_SQLITE_PRAGMAS', {})
+    with connection.cursor() as cursor:
+        for name, value in pragmas.items():
+            if name not in PERSISTENT_PRAGMAS:
+                cursor.execute(f'PRAGMA {name} = {value}')
+
+
+def journal_mode(connection):
+    with connection.cursor() as cursor:
+        cursor.execute('PRAGMA journal_mode')
+        return cursor.fetchone()[0]
+
+
+def set_journal_mode(connection, mode):
+    """Veritabanı dosyasının journal modunu değiştirir; yeni modu döner.
+
+    Başka bağlantı açıkken WAL'a geçilemeyebilir; SQLite değiştiremezse eski mod döner.
+    """
+    with connection.cursor() as cursor:
+        cursor.execute(f'PRAGMA journal_mode = {mode}')
+        return cursor.fetchone()[0]
@@ -0,0 +1,88 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import BooleanField, CharField, ExpressionWrapper, F, Q, Value
+from django.utils import timezone
+
+from .models import HostingService, Domain, SSLCertificate
+
+DEFAULT_EXPIRING_SOON_DAYS = 30
+# Birleşik akışın sıralaması: tarih, tür, id (tür adları worker'daki /renewals ile aynı)
+TYPES = ('domain', 'hosting', 'ssl')
+FIELDS = ('id', 'customer_id', 'expiration_date', 'type', 'domain_name', 'customer_name', 'active')
+
+
+def expiring_soon_days():
+    return getattr(settings, 'CUSTOMERS_EXPIRING_SOON_DAYS', DEFAULT_EXPIRING_SOON_DAYS)
+
+
+def soon(today=None):
+    return (today or timezone.localdate()) + timedelta(days=expiring_soon_days())
+
+
+def _base(service_type):
+    # "aktif" tanımı modele göre değişir; hosting'de status, diğerlerinde is_active.
+    # Silinmiş müşterilerin hizmetleri temizlenene kadar hatırlatılmaz ve faturalanmaz.
+    if service_type == 'hosting':
+        queryset = HostingService.objects.annotate(
+            domain_name=F('domain__name'),
+            active=ExpressionWrapper(Q(status='active'), output_field=BooleanField()),
+        )
+        active = Q(status='active')
+    elif service_type == 'domain':
+        queryset = Domain.objects.annotate(domain_name=F('name'), active=F('is_active'))
+        active = Q(is_active=True)
+    else:
+        queryset = SSLCertificate.objects.annotate(domain_name=F('domain__name'), active=F('is_active'))
+        active = Q(is_active=True)
+    return queryset.filter(customer__deleted_at__isnull=True), active
+
+
+def expiring(service_type, start=None, end=None, active_only=True):
+    """Tek bir modelin [start, end] aralığında biten kayıtları (expiration_date index'i üzerinden)."""
+    queryset, active = _base(service_type)
+    if active_only:
+        queryset = queryset.filter(active)
+    if start is not None:
+        queryset = queryset.filter(expiration_date__gte=start)
+    if end is not None:
+        queryset = queryset.filter(expiration_date__lte=end)
+    return queryset
+
+
+def _after(service_type, cursor):
+    # (expiration_date, type, id) > imleç; tür her dalda sabit olduğundan koşul dala göre sadeleşir
+    date, cursor_type, pk = cursor
+    if service_type > cursor_type:
+        return Q(expiration_date__gte=date)
+    if service_type < cursor_type:
+        return Q(expiration_date__gt=date)
+    return Q(expiration_date__gt=date) | Q(expiration_date=date, pk__gt=pk)
+
+
+def expiration_index(start=None, end=None, types=TYPES, active_only=False, after=None):
+    """Hosting, domain ve SSL bitişlerini tek UNION ALL sorgusunda, tarihe göre sıralı döner.
+
+    Satırlar ``FIELDS`` anahtarlı sözlüklerdir. ``after`` bir önceki sayfanın
+    son satırının (expiration_date, type, id) üçlüsüdür; her dal kendi tarih
+    index'ini kullanır, OFFSET yoktur.
+    """
+    branches = []
+    for service_type in TYPES:
+        if service_type not in types:
+            continue
+        queryset = expiring(service_type, start, end, active_only)
+        if after is not None:
+            queryset = queryset.filter(_after(service_type, after))
+        branches.append(
+            queryset.annotate(
+                type=Value(service_type, output_field=CharField()),
+                customer_name=F('customer__company_name'),
+            ).values(*FIELDS).order_by()
+        )
+    if not branches:
+        return HostingService.objects.none().values(*FIELDS)
+    queryset = branches[0]
+    if len(branches) > 1:
+        queryset = queryset.union(*branches[1:], all=True)
+    return queryset.order_by('expiration_date', 'type', 'id')
@@ -0,0 +1,54 @@
+import csv
+
+from .lists import LISTS
+from .pagination import get_sort, ordering_for, search
+
+CHUNK_SIZE = 2000
+CSV_ROWS_PER_CHUNK = 500
+
+
+def export_queryset(name, request):
+    """Liste görünümüyle aynı arama (?q=) ve sıralama (?sort=) uygulanmış sorgu."""
+    options = LISTS[name]
+    queryset = search(options['queryset'](), request.GET.get('q', '').strip(), options['search_fields'])
+    sort = get_sort(request, options['sort_fields'], options['default_sort'])
+    return queryset.order_by(*ordering_for(sort))
+
+
+def export_header(name):
+    return [title for title, _ in LISTS[name]['columns']]
+
+
+def export_rows(name, queryset):
+    """Model örneği oluşturmadan values_list üzerinden, sabit bellekle satır üretir."""
+    paths = [path for _, path in LISTS[name]['columns']]
+    meta = queryset.model._meta
+    choices = {
+        index: dict(meta.get_field(path).flatchoices)
+        for index, path in enumerate(paths)
+        if '__' not in path and path != 'pk' and meta.get_field(path).choices
+    }
+    for values in queryset.values_list(*paths).iterator(chunk_size=CHUNK_SIZE):
+        row = list(values)
+        for index, labels in choices.items():
+            row[index] = labels.get(row[index], row[index])
+        yield ['Evet' if value is True else 'Hayır' if value is False else value for value in row]
+
+
+class _Echo:
+    def write(self, value):
+        return value
+
+
+def stream_csv(header, rows):
+    writer = csv.writer(_Echo())
+    # Excel'in UTF-8'i (Türkçe karakterleri) tanıması için BOM
+    yield '\ufeff' + writer.writerow(header)
+    chunk = []
+    for row in rows:
+        chunk.append(writer.writerow(row))
+        if len(chunk) >= CSV_ROWS_PER_CHUNK:
+            yield ''.join(chunk)
+            chunk = []
+    if chunk:
+        yield ''.join(chunk)
@@ -1,11 +1,51 @@
 from django import forms
 from .models import Customer, Domain, HostingService, SSLCertificate, Invoice
 from django.utils import timezone
+from django.urls import reverse
+from django.core.exceptions import ValidationError
+
+
+class AutocompleteSelect(forms.Select):
+    """Tüm tabloyu <option> olarak gömmeyen select.
+
+    Yalnızca boş seçenek ve seçili kayıt render edilir (en fazla bir sorgu);
+    diğer seçenekler yazdıkça api/autocomplete/<resource>/ uç noktasından gelir.
+    ``forward`` verilirse o alanın değeri aynı adlı filtre olarak gönderilir.
+    """
+
+    def __init__(self, resource, forward=None, attrs=None):
+        super().__init__(attrs)
+        self.resource = resource
+        self.forward = forward
+
+    def build_attrs(self, base_attrs, extra_attrs=None):
+        attrs = super().build_attrs(base_attrs, extra_attrs)
+        attrs['data-autocomplete-url'] = reverse('customers:api-autocomplete', args=[self.resource])
+        if self.forward:
+            attrs['data-autocomplete-forward'] = self.forward
+        return attrs
+
+    def optgroups(self, name, value, attrs=None):
+        field = self.choices.field
+        selected = [v for v in value if v not in ('', None)]
+        options = []
+        if field.empty_label is not None:
+            options.append(self.create_option(name, '', field.empty_label, not selected, 0))
+        try:
+            objects = list(self.choices.queryset.filter(pk__in=selected)) if selected else []
+        except (ValueError, TypeError, ValidationError):
+            # Geçersiz gönderilmiş değer; hata mesajını form alanı gösterir
+            objects = []
+        for obj in objects:
+            options.append(self.create_option(
+                name, field.prepare_value(obj), field.label_from_instance(obj), True, len(options),
+            ))
+        return [(None, options, 0)]
 
 class CustomerForm(forms.ModelForm):
     class Meta:
         model = Customer
-        fields = ['company_name', 'contact_name', 'email', 'email2', 'email3', 'phone', 'address', 'tax_office', 'tax_number', 'registration_date', 'notes']
+        fields = ['customer_no', 'company_name', 'contact_name', 'email', 'email2', 'email3', 'phone', 'address', 'tax_office', 'tax_number', 'registration_date', 'notes']
         widgets = {
             'registration_date': forms.DateInput(attrs={'type': 'date'}),
         }
@@ -20,6 +60,7 @@ class DomainForm(forms.ModelForm):
         model = Domain
         fields = ['customer', 'name', 'registration_date', 'expiration_date', 'is_active', 'nameserver1', 'nameserver2', 'nameserver3', 'nameserver4']
         widgets = {
+            'customer': AutocompleteSelect('customers'),
             'registration_date': forms.DateInput(attrs={'type': 'date'}),
             'expiration_date': forms.DateInput(attrs={'type': 'date'}),
         }
@@ -31,6 +72,8 @@ class HostingServiceForm(forms.ModelForm):
         model = HostingService
         fields = ['customer', 'domain', 'domain_name', 'package', 'status', 'start_date', 'expiration_date', 'notes']
         widgets = {
+            'customer': AutocompleteSelect('customers'),
+            'domain': AutocompleteSelect('domains', forward='customer'),
             'start_date': forms.DateInput(attrs={'type': 'date'}),
             'expiration_date': forms.DateInput(attrs={'type': 'date'}),
             'notes': forms.Textarea(attrs={'rows': 3}),
@@ -71,6 +114,8 @@ class SSLCertificateForm(forms.ModelForm):
         model = SSLCertificate
         fields = ['customer', 'domain', 'domain_name', 'start_date', 'expiration_date', 'is_active']
         widgets = {
+            'customer': AutocompleteSelect('customers'),
+            'domain': AutocompleteSelect('domains', forward='customer'),
             'start_date': forms.DateInput(attrs={'type': 'date'}),
             'expiration_date': forms.DateInput(attrs={'type': 'date'}),
         }
@@ -109,7 +154,7 @@ class InvoiceForm(forms.ModelForm):
         fields = ['customer', 'invoice_number', 'amount', 'issue_date', 'due_date', 
                  'payment_status', 'payment_method', 'payment_date', 'notes']
         widgets = {
-            'customer': forms.Select(attrs={'class': 'form-select'}),
+            'customer': AutocompleteSelect('customers', attrs={'class': 'form-select'}),
             'invoice_number': forms.TextInput(attrs={'class': 'form-control'}),
             'amount': forms.NumberInput(attrs={'class': 'form-control'}),
             'issue_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
@@ -118,4 +163,17 @@ class InvoiceForm(forms.ModelForm):
             'payment_method': forms.Select(attrs={'class': 'form-select'}),
             'payment_date': forms.DateInput(attrs={'class': 'form-control', 'type': 'date'}),
             'notes': forms.Textarea(attrs={'class': 'form-control', 'rows': 3}),
-        } 
\ No newline at end of file
+        } 
+
+class ImportForm(forms.Form):
+    KINDS = [
+        ('customers', 'Müşteriler'),
+        ('domains', 'Domainler'),
+        ('hostings', 'Hosting Hizmetleri'),
+        ('ssls', 'SSL Sertifikaları'),
+        ('invoices', 'Faturalar'),
+    ]
+
+    kind = forms.ChoiceField(choices=KINDS, label='Kayıt Türü')
+    file = forms.FileField(label='Dosya', help_text='CSV, JSON veya JSON Lines (.csv, .json, .jsonl)')
+    dry_run = forms.BooleanField(required=False, label='Yalnızca doğrula (kaydetme)')
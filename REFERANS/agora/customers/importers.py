@@ -0,0 +1,658 @@
+import csv
+import io
+import json
+import re
+from contextlib import nullcontext
+from datetime import datetime, time
+
+from django.core.exceptions import ValidationError
+from django.db import IntegrityError, transaction
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Customer, Domain, FoldedKeyField, HostingService, SSLCertificate, Invoice, Renewal
+from .signals import bulk_changed
+from . import changes, nameservers
+
+DEFAULT_BATCH_SIZE = 1000
+MAX_REPORTED_ERRORS = 10000
+# Formlardaki manuel domain oluşturma ile aynı varsayılanlar
+DEFAULT_NAMESERVERS = ('ns1.example.com', 'ns2.example.com')
+DEFAULT_PACKAGE = 'Standart'
+# D1 şemasındaki incomes/expenses tablolarının Django karşılığı yoktur
+IMPORT_ORDER = ('customers', 'domains', 'hostings', 'ssls', 'invoices')
+
+TRUE_VALUES = {'1', 'true', 'evet', 'yes', 'aktif', 'active'}
+FALSE_VALUES = {'0', 'false', 'hayır', 'hayir', 'no', 'pasif', 'passive'}
+DOTTED_DATE = re.compile(r'^(\d{1,2})\.(\d{1,2})\.(\d{4})$')
+
+
+class ImportReport:
+    def __init__(self):
+        self.counts = {kind: {'created': 0, 'updated': 0, 'failed': 0} for kind in IMPORT_ORDER}
+        self.errors = []
+        self.dropped_errors = 0
+        self.touched = set()
+
+    def add(self, kind, key, count=1):
+        self.counts[kind][key] += count
+
+    def error(self, kind, line, message):
+        self.counts[kind]['failed'] += 1
+        if len(self.errors) < MAX_REPORTED_ERRORS:
+            self.errors.append((kind, line, message))
+        else:
+            self.dropped_errors += 1
+
+    @property
+    def error_count(self):
+        return len(self.errors) + self.dropped_errors
+
+    def write_csv(self, fileobj):
+        writer = csv.writer(fileobj)
+        writer.writerow(['dosya', 'satır', 'hata'])
+        writer.writerows(self.errors)
+
+
+def detect_format(filename):
+    name = (filename or '').lower()
+    if name.endswith(('.jsonl', '.ndjson')):
+        return 'jsonl'
+    if name.endswith('.json'):
+        return 'json'
+    return 'csv'
+
+
+def open_text(fileobj):
+    """İkili dosyayı (ör. yüklenen dosya) UTF-8 metin akışına çevirir; BOM atlanır."""
+    if isinstance(fileobj, io.TextIOBase):
+        return fileobj
+    return io.TextIOWrapper(fileobj, encoding='utf-8-sig', newline='')
+
+
+def read_rows(fileobj, fmt='csv'):
+    """(satır no, sözlük) çiftleri üretir; okunamayan satırlar için sözlük None'dır.
+
+    CSV ve JSON Lines satır satır okunur. JSON dizisi (ör. ``wrangler d1
+    execute --json`` çıktısı) bir kerede yüklenir.
+    """
+    if fmt == 'csv':
+        reader = csv.DictReader(fileobj)
+        for row in reader:
+            yield reader.line_num, row
+    elif fmt == 'jsonl':
+        for line, text in enumerate(fileobj, start=1):
+            if not text.strip():
+                continue
+            try:
+                row = json.loads(text)
+            except ValueError:
+                row = None
+            yield line, row if isinstance(row, dict) else None
+    elif fmt == 'json':
+        data = json.load(fileobj)
+        if isinstance(data, dict):
+            data = [data]
+        index = 0
+        for item in data:
+            # D1 çıktısı: [{"results": [...], "success": true, "meta": {...}}]
+            rows = item['results'] if isinstance(item, dict) and isinstance(item.get('results'), list) else [item]
+            for row in rows:
+                index += 1
+                yield index, row if isinstance(row, dict) else None
+    else:
+        raise ValueError(f'Desteklenmeyen biçim: {fmt}')
+
+
+def _value(value):
+    if isinstance(value, str):
+        value = value.strip()
+        return value or None
+    if isinstance(value, float):
+        return str(value)
+    return value
+
+
+def _date(value):
+    if isinstance(value, str):
+        match = DOTTED_DATE.match(value)
+        if match:
+            day, month, year = match.groups()
+            return f'{year}-{int(month):02d}-{int(day):02d}'
+        if len(value) > 10 and value[10] in 'T ':
+            return value[:10]
+    return value
+
+
+def _dates(value):
+    # D1: renewal_dates JSON dizisi olarak saklanır; düz metinde virgül/satır ile ayrılmış olabilir
+    if not value:
+        return []
+    if isinstance(value, str):
+        try:
+            value = json.loads(value)
+        except ValueError:
+            value = re.split(r'[,;\n]+', value)
+    if not isinstance(value, list):
+        value = [value]
+    dates = []
+    for item in value:
+        if not str(item).strip():
+            continue
+        try:
+            parsed = parse_date(_date(str(item).strip()))
+        except ValueError:
+            parsed = None
+        if parsed is None:
+            raise ValidationError({'renewal_dates': f'Geçersiz tarih: {item}'})
+        dates.append(parsed)
+    return sorted(set(dates))
+
+
+def _bool(value, default=True):
+    if value is None:
+        return default
+    if isinstance(value, bool):
+        return value
+    text = str(value).strip().lower()
+    if text in TRUE_VALUES:
+        return True
+    if text in FALSE_VALUES:
+        return False
+    raise ValidationError(f'Geçersiz evet/hayır değeri: {value}')
+
+
+def _message(exc):
+    if hasattr(exc, 'error_dict'):
+        return '; '.join(f'{field}: {" ".join(messages)}' for field, messages in exc.message_dict.items())
+    return '; '.join(exc.messages)
+
+
+class CustomerLookup:
+    """customer_no ve D1 kimliklerini Customer pk'sine çeviren bellek içi tablo.
+
+    Satır başına sorgu atmamak için mevcut eşlemeler bir kez yüklenir; aynı
+    çalıştırmada içe aktarılan müşteriler tabloya eklenir. D1'deki
+    ``customer_id`` (metin kimlik) yalnızca müşteri dosyası aynı çalıştırmada
+    okunduysa çözülebilir. Silinmek üzere işaretli müşterilerin numaraları
+    ayrıca tutulur: bu müşterilere ait satırlar geri getirilmez, hatayla atlanır.
+    """
+
+    def __init__(self):
+        rows = Customer._base_manager.exclude(customer_no=None).values_list('customer_no', 'pk', 'deleted_at')
+        self.by_no = {customer_no: pk for customer_no, pk, deleted_at in rows if deleted_at is None}
+        self.deleted = {customer_no for customer_no, pk, deleted_at in rows if deleted_at is not None}
+        self.by_external = {}
+
+    def number(self, customer_no):
+        """customer_no'yu sayıya çevirir; silinmek üzere işaretli müşterininse satır reddedilir."""
+        try:
+            number = int(customer_no)
+        except (TypeError, ValueError):
+            raise ValidationError({'customer_no': f'Geçersiz müşteri numarası: {customer_no}'})
+        if number in self.deleted:
+            raise ValidationError({'customer_no': f'Müşteri silinmek üzere işaretli: {number}'})
+        return number
+
+    def add(self, customer):
+        if customer.customer_no is not None:
+            self.by_no[customer.customer_no] = customer.pk
+        external_id = getattr(customer, '_external_id', None)
+        if external_id is not None:
+            self.by_external[external_id] = customer.pk
+
+    def resolve(self, data):
+        customer_no = data.get('customer_no')
+        if customer_no is not None:
+            pk = self.by_no.get(self.number(customer_no))
+            if pk is None:
+                raise ValidationError({'customer_no': f'Müşteri bulunamadı: {customer_no}'})
+            return pk
+        external_id = data.get('customer_id')
+        if external_id is not None:
+            pk = self.by_external.get(str(external_id))
+            if pk is None:
+                raise ValidationError({'customer_id': f'Müşteri bulunamadı: {external_id}'})
+            return pk
+        raise ValidationError({'customer_no': 'customer_no veya customer_id sütunu gerekli.'})
+
+
+class BaseImporter:
+    kind = None
+    model = None
+    # hedef alan -> kabul edilen sütun adları (Django alan adı ve D1 sütunu)
+    columns = {}
+    update_fields = []
+    validate_exclude = []
+
+    def __init__(self, report, lookup, batch_size=DEFAULT_BATCH_SIZE):
+        self.report = report
+        self.lookup = lookup
+        self.batch_size = batch_size
+        # Kaynağı güncellenen katlanmış anahtar alanları (FoldedKeyField)
+        self.key_fields = [
+            field for field in self.model._meta.concrete_fields
+            if isinstance(field, FoldedKeyField) and field.source in self.update_fields
+        ] if self.model else []
+
+    def extract(self, row):
+        data = {}
+        for field, names in self.columns.items():
+            for name in names:
+                if name in row:
+                    data[field] = _value(row[name])
+                    break
+            else:
+                data[field] = None
+        return data
+
+    def build(self, data):
+        raise NotImplementedError
+
+    def natural_key(self, obj):
+        """Dosyadaki tekrarları ve mevcut kayıtları eşlemek için anahtar; None ise her zaman yeni kayıt."""
+        return None
+
+    def existing(self, objs):
+        """natural_key -> mevcut kaydın pk'si; tek sorgu."""
+        return {}
+
+    def prepare(self, objs):
+        pass
+
+    def after_write(self, objs):
+        pass
+
+    def run(self, rows):
+        batch = []
+        for line, row in rows:
+            if row is None:
+                self.report.error(self.kind, line, 'Satır okunamadı.')
+                continue
+            try:
+                obj = self.build(self.extract(row))
+                obj.full_clean(exclude=self.validate_exclude, validate_unique=False, validate_constraints=False)
+            except ValidationError as exc:
+                self.report.error(self.kind, line, _message(exc))
+                continue
+            batch.append((line, obj))
+            if len(batch) >= self.batch_size:
+                self.flush(batch)
+                batch = []
+        if batch:
+            self.flush(batch)
+
+    def flush(self, batch):
+        # Aynı kayıt partide birden fazla kez geçiyorsa son satır kullanılır
+        unique = {}
+        for line, obj in batch:
+            key = self.natural_key(obj)
+            if key is None:
+                key = ('line', line)
+            elif key in unique:
+                self.report.error(self.kind, unique[key][0], f'{line}. satırdaki aynı kayıt tarafından geçersiz kılındı.')
+            unique[key] = (line, obj)
+        batch = list(unique.values())
+
+        try:
+            self.write([obj for _, obj in batch])
+        except IntegrityError:
+            # Partide veritabanının reddettiği satır var; satırları tek tek yazarak ayıkla
+            for line, obj in batch:
+                obj.pk = None
+                try:
+                    self.write([obj])
+                except IntegrityError as exc:
+                    self.report.error(self.kind, line, f'Veritabanı hatası: {exc}')
+
+    def write(self, objs):
+        with transaction.atomic():
+            self.prepare(objs)
+            existing = self.existing(objs)
+            to_create, to_update = [], []
+            for obj in objs:
+                pk = existing.get(self.natural_key(obj))
+                if pk is None:
+                    to_create.append(obj)
+                else:
+                    obj.pk = pk
+                    to_update.append(obj)
+            # bulk_update auto_now alanlarını ve katlanmış anahtarları doldurmaz
+            now = timezone.now()
+            for obj in to_update:
+                obj.updated_at = now
+                for field in self.key_fields:
+                    field.pre_save(obj, add=False)
+            self.model.objects.bulk_create(to_create)
+            self.model.objects.bulk_update(
+                to_update, [*self.update_fields, *(field.name for field in self.key_fields), 'updated_at'],
+            )
+            changes.record(self.model, [obj.pk for obj in objs])
+            self.after_write(objs)
+        self.report.add(self.kind, 'created', len(to_create))
+        self.report.add(self.kind, 'updated', len(to_update))
+        self.report.touched.add(self.model)
+
+
+class CustomerImporter(BaseImporter):
+    kind = 'customers'
+    model = Customer
+    columns = {
+        'id': ('id',),
+        'customer_no': ('customer_no',),
+        'company_name': ('company_name', 'company'),
+        'contact_name': ('contact_name',),
+        'first_name': ('first_name',),
+        'last_name': ('last_name',),
+        'email': ('email', 'email1'),
+        'email2': ('email2',),
+        'email3': ('email3',),
+        'phone': ('phone', 'phone1'),
+        'phone2': ('phone2',),
+        'address': ('address',),
+        'city': ('city',),
+        'country': ('country',),
+        'tax_office': ('tax_office',),
+        'tax_number': ('tax_number', 'tax_no'),
+        'registration_date': ('registration_date',),
+        'notes': ('notes', 'description'),
+    }
+    update_fields = [
+        'company_name', 'contact_name', 'email', 'email2', 'email3', 'phone', 'address',
+        'tax_office', 'tax_number', 'registration_date', 'notes',
+    ]
+
+    def build(self, data):
+        # customer_no tek eşleme anahtarıdır; numarasız satır her içe aktarmada yeni müşteri olurdu
+        if data['customer_no'] is None:
+            raise ValidationError({'customer_no': 'Müşteri numarası gerekli.'})
+        customer_no = self.lookup.number(data['customer_no'])
+        contact_name = data['contact_name'] or ' '.join(filter(None, [data['first_name'], data['last_name']]))
+        address = ', '.join(filter(None, [data['address'], data['city'], data['country']])) or None
+        notes = data['notes']
+        if data['phone2']:
+            notes = '\n'.join(filter(None, [notes, f"Telefon 2: {data['phone2']}"]))
+        customer = Customer(
+            customer_no=customer_no,
+            company_name=data['company_name'],
+            contact_name=contact_name,
+            email=data['email'],
+            email2=data['email2'],
+            email3=data['email3'],
+            phone=data['phone'],
+            address=address,
+            tax_office=data['tax_office'],
+            tax_number=str(data['tax_number']) if data['tax_number'] is not None else None,
+            registration_date=_date(data['registration_date']),
+            notes=notes,
+        )
+        customer._external_id = str(data['id']) if data['id'] is not None else None
+        return customer
+
+    def natural_key(self, obj):
+        return obj.customer_no
+
+    def existing(self, objs):
+        # Gizli (silinmek üzere işaretli) müşteriler de: numara unique, varsayılan yönetici görmez
+        numbers = [obj.customer_no for obj in objs]
+        return dict(Customer._base_manager.filter(customer_no__in=numbers).values_list('customer_no', 'pk'))
+
+    def after_write(self, objs):
+        for obj in objs:
+            self.lookup.add(obj)
+
+
+class DomainImporter(BaseImporter):
+    kind = 'domains'
+    model = Domain
+    columns = {
+        'customer_no': ('customer_no',),
+        'customer_id': ('customer_id',),
+        'name': ('name', 'domain_name'),
+        'registration_date': ('registration_date', 'start_date'),
+        'expiration_date': ('expiration_date', 'end_date'),
+        'is_active': ('is_active', 'status'),
+        'nameserver1': ('nameserver1', 'ns1'),
+        'nameserver2': ('nameserver2', 'ns2'),
+        'nameserver3': ('nameserver3', 'ns3'),
+        'nameserver4': ('nameserver4', 'ns4'),
+    }
+    update_fields = ['registration_date', 'expiration_date', 'is_active', 'nameserver1', 'nameserver2', 'nameserver3', 'nameserver4']
+    validate_exclude = ['customer']
+
+    def build(self, data):
+        return Domain(
+            customer_id=self.lookup.resolve(data),
+            name=(data['name'] or '').lower() or None,
+            registration_date=_date(data['registration_date']),
+            expiration_date=_date(data['expiration_date']),
+            is_active=_bool(data['is_active']),
+            nameserver1=data['nameserver1'] or DEFAULT_NAMESERVERS[0],
+            nameserver2=data['nameserver2'] or DEFAULT_NAMESERVERS[1],
+            nameserver3=data['nameserver3'],
+            nameserver4=data['nameserver4'],
+        )
+
+    def after_write(self, objs):
+        # bulk_create/bulk_update sinyal göndermez; nameserver index'i partiyle birlikte yazılır
+        nameservers.sync(objs)
+
+    def natural_key(self, obj):
+        return (obj.customer_id, obj.name)
+
+    def existing(self, objs):
+        rows = Domain.objects.filter(
+            customer_id__in={obj.customer_id for obj in objs},
+            name__in={obj.name for obj in objs},
+        ).values_list('customer_id', 'name', 'pk')
+        return {(customer_id, name): pk for customer_id, name, pk in rows}
+
+
+class DomainServiceImporter(BaseImporter):
+    """Hosting ve SSL: D1'de domain adıyla bağlanır; eksik domainler partiyle birlikte oluşturulur."""
+
+    validate_exclude = ['customer', 'domain']
+
+    def build_service(self, data, **fields):
+        obj = self.model(
+            customer_id=self.lookup.resolve(data),
+            start_date=_date(data['start_date']),
+            expiration_date=_date(data['expiration_date']),
+            **fields
+        )
+        obj._domain_name = (data['domain_name'] or '').lower()
+        if not obj._domain_name:
+            raise ValidationError({'domain_name': 'Domain adı gerekli.'})
+        return obj
+
+    def natural_key(self, obj):
+        return (obj.customer_id, obj._domain_name)
+
+    def prepare(self, objs):
+        keys = {self.natural_key(obj) for obj in objs}
+        rows = Domain.objects.filter(
+            customer_id__in={customer_id for customer_id, _ in keys},
+            name__in={name for _, name in keys},
+        ).values_list('customer_id', 'name', 'pk')
+        domains = {(customer_id, name): pk for customer_id, name, pk in rows}
+        missing = {}
+        for obj in objs:
+            key = self.natural_key(obj)
+            if key not in domains and key not in missing:
+                missing[key] = Domain(
+                    customer_id=obj.customer_id,
+                    name=obj._domain_name,
+                    registration_date=obj.start_date,
+                    expiration_date=obj.expiration_date,
+                    is_active=True,
+                    nameserver1=DEFAULT_NAMESERVERS[0],
+                    nameserver2=DEFAULT_NAMESERVERS[1],
+                )
+        if missing:
+            Domain.objects.bulk_create(missing.values())
+            changes.record(Domain, [domain.pk for domain in missing.values()])
+            nameservers.sync(missing.values())
+            self.new_domains = len(missing)
+            domains.update((key, domain.pk) for key, domain in missing.items())
+        for obj in objs:
+            obj.domain_id = domains[self.natural_key(obj)]
+
+    def write(self, objs):
+        self.new_domains = 0
+        super().write(objs)
+        if self.new_domains:
+            self.report.add('domains', 'created', self.new_domains)
+            self.report.touched.add(Domain)
+
+    def existing(self, objs):
+        by_domain = dict(
+            self.model.objects.filter(domain_id__in=[obj.domain_id for obj in objs]).values_list('domain_id', 'pk')
+        )
+        return {self.natural_key(obj): by_domain[obj.domain_id] for obj in objs if obj.domain_id in by_domain}
+
+
+class HostingImporter(DomainServiceImporter):
+    kind = 'hostings'
+    model = HostingService
+    columns = {
+        'customer_no': ('customer_no',),
+        'customer_id': ('customer_id',),
+        'domain_name': ('domain_name', 'domain'),
+        'package': ('package',),
+        'status': ('status',),
+        'start_date': ('start_date',),
+        'expiration_date': ('expiration_date', 'end_date'),
+        'renewal_count': ('renewal_count',),
+        'renewal_dates': ('renewal_dates',),
+        'notes': ('notes', 'description'),
+    }
+    update_fields = ['package', 'status', 'start_date', 'expiration_date', 'renewal_count', 'notes']
+
+    def build(self, data):
+        status = data['status']
+        if status is None or str(status) not in dict(HostingService._meta.get_field('status').choices):
+            # D1: 1 = aktif, 0 = pasif
+            status = 'active' if _bool(status) else 'suspended'
+        renewal_dates = _dates(data['renewal_dates'])
+        obj = self.build_service(
+            data,
+            package=data['package'] or DEFAULT_PACKAGE,
+            status=status,
+            renewal_count=data['renewal_count'] or len(renewal_dates),
+            notes=data['notes'],
+        )
+        obj._renewal_dates = renewal_dates
+        return obj
+
+    def after_write(self, objs):
+        # Yenileme tarihleri geçmiş tablosuna; tekrar içe aktarmada aynı satırlar atlanır
+        renewals = [
+            Renewal(
+                customer_id=obj.customer_id, service_type='hosting', object_id=obj.pk,
+                renewed_at=timezone.make_aware(datetime.combine(day, time.min)),
+            )
+            for obj in objs
+            for day in obj._renewal_dates
+        ]
+        Renewal.objects.bulk_create(renewals, ignore_conflicts=True)
+
+
+class SSLImporter(DomainServiceImporter):
+    kind = 'ssls'
+    model = SSLCertificate
+    columns = {
+        'customer_no': ('customer_no',),
+        'customer_id': ('customer_id',),
+        'domain_name': ('domain_name', 'domain'),
+        'start_date': ('start_date',),
+        'expiration_date': ('expiration_date', 'end_date'),
+        'is_active': ('is_active', 'status'),
+    }
+    update_fields = ['start_date', 'expiration_date', 'is_active']
+
+    def build(self, data):
+        return self.build_service(data, is_active=_bool(data['is_active']))
+
+
+class InvoiceImporter(BaseImporter):
+    kind = 'invoices'
+    model = Invoice
+    columns = {
+        'customer_no': ('customer_no',),
+        'customer_id': ('customer_id',),
+        'invoice_number': ('invoice_number',),
+        'description': ('description',),
+        'amount': ('amount',),
+        'issue_date': ('issue_date',),
+        'due_date': ('due_date',),
+        'payment_status': ('payment_status',),
+        'payment_date': ('payment_date',),
+        'payment_method': ('payment_method',),
+        'payment_notes': ('payment_notes',),
+        'notes': ('notes',),
+    }
+    update_fields = [
+        'customer', 'description', 'amount', 'issue_date', 'due_date', 'payment_status',
+        'payment_date', 'payment_method', 'payment_notes', 'notes',
+    ]
+    validate_exclude = ['customer']
+
+    def build(self, data):
+        return Invoice(
+            customer_id=self.lookup.resolve(data),
+            invoice_number=data['invoice_number'],
+            description=data['description'],
+            amount=data['amount'],
+            issue_date=_date(data['issue_date']),
+            due_date=_date(data['due_date']),
+            payment_status=data['payment_status'] or 'pending',
+            payment_date=_date(data['payment_date']),
+            payment_method=data['payment_method'],
+            payment_notes=data['payment_notes'],
+            notes=data['notes'],
+        )
+
+    def natural_key(self, obj):
+        return obj.invoice_number
+
+    def existing(self, objs):
+        return dict(
+            Invoice.objects.filter(invoice_number__in=[obj.invoice_number for obj in objs])
+            .values_list('invoice_number', 'pk')
+        )
+
+
+IMPORTERS = {
+    'customers': CustomerImporter,
+    'domains': DomainImporter,
+    'hostings': HostingImporter,
+    'ssls': SSLImporter,
+    'invoices': InvoiceImporter,
+}
+
+
+def import_files(sources, batch_size=DEFAULT_BATCH_SIZE, dry_run=False):
+    """Dosyaları partiler halinde doğrulayıp yazar ve bir ImportReport döner.
+
+    ``sources``: (tür, metin akışı, biçim) listesi; müşteriler önce işlenir.
+    Her parti kendi transaction'ında yazılır, hatalı satırlar rapora eklenip
+    atlanır. ``dry_run`` tüm yazmaları sonunda geri alır.
+    """
+    report = ImportReport()
+    sources = sorted(sources, key=lambda source: IMPORT_ORDER.index(source[0]))
+    with transaction.atomic() if dry_run else nullcontext():
+        lookup = CustomerLookup()
+        for kind, fileobj, fmt in sources:
+            importer = IMPORTERS[kind](report, lookup, batch_size)
+            try:
+                importer.run(read_rows(fileobj, fmt))
+            except (ValueError, csv.Error) as exc:
+                # Dosyanın tamamı okunamıyor (ör. bozuk JSON); diğer dosyalarla devam edilir
+                report.error(kind, 0, f'Dosya okunamadı: {exc}')
+        if dry_run:
+            transaction.set_rollback(True)
+    if not dry_run:
+        # bulk_create/bulk_update post_save göndermez; sayaçları tazele
+        for model in report.touched:
+            bulk_changed.send(sender=model)
+    return report
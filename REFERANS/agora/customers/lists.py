@@ -0,0 +1,104 @@
+from .models import Customer, HostingService, Domain, SSLCertificate, Invoice
+
+# Liste görünümleri ve dışa aktarma aynı arama/sıralama tanımlarını kullanır.
+# columns: (başlık, values_list yolu); choices alanları görünen adlarıyla yazılır.
+LISTS = {
+    'customers': {
+        'queryset': lambda: Customer.objects.all(),
+        'sort_fields': ('company_name', 'registration_date'),
+        'default_sort': 'company_name',
+        'search_fields': ('company_name', 'contact_name', 'email', 'phone'),
+        'title': 'Müşteriler',
+        'columns': [
+            ('ID', 'pk'),
+            ('Firma Adı', 'company_name'),
+            ('İletişim Kişisi', 'contact_name'),
+            ('E-posta', 'email'),
+            ('E-posta 2', 'email2'),
+            ('E-posta 3', 'email3'),
+            ('Telefon', 'phone'),
+            ('Adres', 'address'),
+            ('Vergi Dairesi', 'tax_office'),
+            ('Vergi Numarası', 'tax_number'),
+            ('Kayıt Tarihi', 'registration_date'),
+            ('Notlar', 'notes'),
+        ],
+    },
+    'hosting': {
+        'queryset': lambda: HostingService.objects.select_related('domain', 'customer'),
+        'sort_fields': ('domain__name', 'expiration_date'),
+        'default_sort': 'expiration_date',
+        'search_fields': ('domain__name', 'customer__company_name', 'package'),
+        'title': 'Hosting Hizmetleri',
+        'columns': [
+            ('ID', 'pk'),
+            ('Domain', 'domain__name'),
+            ('Müşteri', 'customer__company_name'),
+            ('Paket', 'package'),
+            ('Durum', 'status'),
+            ('Başlangıç Tarihi', 'start_date'),
+            ('Bitiş Tarihi', 'expiration_date'),
+            ('Yenileme Sayısı', 'renewal_count'),
+            ('Notlar', 'notes'),
+        ],
+    },
+    'domains': {
+        'queryset': lambda: Domain.objects.select_related('customer'),
+        'sort_fields': ('name', 'expiration_date'),
+        'default_sort': 'expiration_date',
+        'search_fields': ('name', 'customer__company_name'),
+        'title': 'Domainler',
+        'columns': [
+            ('ID', 'pk'),
+            ('Domain', 'name'),
+            ('Müşteri', 'customer__company_name'),
+            ('Kayıt Tarihi', 'registration_date'),
+            ('Bitiş Tarihi', 'expiration_date'),
+            ('Aktif', 'is_active'),
+            ('Nameserver 1', 'nameserver1'),
+            ('Nameserver 2', 'nameserver2'),
+            ('Nameserver 3', 'nameserver3'),
+            ('Nameserver 4', 'nameserver4'),
+        ],
+    },
+    'ssl': {
+        'queryset': lambda: SSLCertificate.objects.select_related('domain', 'customer'),
+        'sort_fields': ('domain__name', 'expiration_date'),
+        'default_sort': 'expiration_date',
+        'search_fields': ('domain__name', 'customer__company_name'),
+        'title': 'SSL Sertifikaları',
+        'columns': [
+            ('ID', 'pk'),
+            ('Domain', 'domain__name'),
+            ('Müşteri', 'customer__company_name'),
+            ('Başlangıç Tarihi', 'start_date'),
+            ('Bitiş Tarihi', 'expiration_date'),
+            ('Aktif', 'is_active'),
+        ],
+    },
+    'invoices': {
+        'queryset': lambda: Invoice.objects.select_related('customer'),
+        'sort_fields': ('customer__company_name', 'issue_date', 'due_date'),
+        'default_sort': '-issue_date',
+        'search_fields': ('invoice_number', 'customer__company_name'),
+        'title': 'Faturalar',
+        'columns': [
+            ('ID', 'pk'),
+            ('Fatura No', 'invoice_number'),
+            ('Müşteri', 'customer__company_name'),
+            ('Açıklama', 'description'),
+            ('Tutar', 'amount'),
+            ('Fatura Tarihi', 'issue_date'),
+            ('Son Ödeme Tarihi', 'due_date'),
+            ('Ödeme Durumu', 'payment_status'),
+            ('Ödeme Tarihi', 'payment_date'),
+            ('Ödeme Yöntemi', 'payment_method'),
+            ('Notlar', 'notes'),
+        ],
+    },
+}
+
+
+def paginate_options(name):
+    options = LISTS[name]
+    return {key: options[key] for key in ('sort_fields', 'default_sort', 'search_fields')}
@@ -0,0 +1,136 @@
+import asyncio
+import json
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from asgiref.sync import sync_to_async
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connections
+from django.test import AsyncClient, Client
+from django.test.utils import override_settings
+from django.urls import reverse
+
+from customers.cache import get_cache
+from customers.models import Customer
+
+# (senkron URL adı, async URL adı)
+PAIRS = {
+    'dashboard': ('customers:dashboard', 'customers:async-dashboard'),
+    'customer-detail': ('customers:customer-detail', 'customers:async-customer-detail'),
+    'customer-list': ('customers:customer-list', 'customers:async-customer-list'),
+    'hosting-list': ('customers:hosting-list', 'customers:async-hosting-list'),
+    'domain-list': ('customers:domain-list', 'customers:async-domain-list'),
+    'ssl-list': ('customers:ssl-list', 'customers:async-ssl-list'),
+    'invoice-list': ('customers:invoice-list', 'customers:async-invoice-list'),
+}
+
+
+class Command(BaseCommand):
+    help = 'Senkron ve async görünümlerin eşzamanlı yük altındaki gecikmesini karşılaştırır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--concurrency', type=int, default=16, help='Aynı anda açık istek sayısı')
+        parser.add_argument('--requests', type=int, default=200, help='Ölçüm başına istek sayısı')
+        parser.add_argument('--only', nargs='*', default=None, choices=list(PAIRS), help='Yalnızca bu sayfalar')
+        parser.add_argument('--warm', action='store_true', help='Sonuç önbelleğini boşaltma')
+        parser.add_argument('--output', help='JSON rapor dosyası')
+
+    def handle(self, *args, **options):
+        self.user = get_user_model().objects.filter(is_superuser=True, is_active=True).first()
+        if self.user is None:
+            raise CommandError('Ölçüm için aktif bir süper kullanıcı gerekli (createsuperuser).')
+        self.cold = not options['warm']
+        concurrency, count = options['concurrency'], options['requests']
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['testserver', *settings.ALLOWED_HOSTS]):
+            for name, (sync_name, async_name) in PAIRS.items():
+                if options['only'] and name not in options['only']:
+                    continue
+                sync_url, async_url = self.url(sync_name), self.url(async_name)
+                results[name] = {
+                    # WSGI: istek başına thread
+                    'sync_threads': self.threaded(sync_url, concurrency, count),
+                    # ASGI: senkron görünüm tek thread'de sırayla, async görünüm olay döngüsünde
+                    'sync_asgi': asyncio.run(self.asgi(sync_url, concurrency, count)),
+                    'async_asgi': asyncio.run(self.asgi(async_url, concurrency, count)),
+                }
+                for mode, r in results[name].items():
+                    self.stdout.write(
+                        f"{name:16} {mode:12} p50 {r['p50_ms']:8.1f} ms  p95 {r['p95_ms']:8.1f} ms  "
+                        f"{r['requests_per_s']:7.1f} istek/s  hata {r['errors']}"
+                    )
+
+        if options['output']:
+            report = {'concurrency': concurrency, 'requests': count, 'cold_cache': self.cold, 'results': results}
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(report, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor yazıldı: {options['output']}"))
+
+    def url(self, name):
+        if name.endswith('customer-detail'):
+            pk = Customer.objects.order_by('pk').values_list('pk', flat=True).first()
+            if pk is None:
+                raise CommandError('Müşteri kaydı yok (generate_fixtures).')
+            return reverse(name, args=[pk])
+        return reverse(name)
+
+    def threaded(self, url, concurrency, count):
+        def worker(n):
+            client = Client()
+            client.force_login(self.user)
+            timings, errors = [], 0
+            try:
+                for _ in range(n):
+                    if self.cold:
+                        get_cache().clear()
+                    started = time.perf_counter()
+                    if client.get(url).status_code != 200:
+                        errors += 1
+                    timings.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections.close_all()
+            return timings, errors
+
+        shares = [count // concurrency + (1 if i < count % concurrency else 0) for i in range(concurrency)]
+        started = time.perf_counter()
+        with ThreadPoolExecutor(concurrency) as pool:
+            outcomes = list(pool.map(worker, [n for n in shares if n]))
+        elapsed = time.perf_counter() - started
+        timings = [t for outcome, _ in outcomes for t in outcome]
+        return self.summary(timings, sum(errors for _, errors in outcomes), elapsed)
+
+    async def asgi(self, url, concurrency, count):
+        client = AsyncClient()
+        await client.aforce_login(self.user)
+        semaphore = asyncio.Semaphore(concurrency)
+        errors = 0
+
+        async def one():
+            nonlocal errors
+            async with semaphore:
+                if self.cold:
+                    await get_cache().aclear()
+                started = time.perf_counter()
+                response = await client.get(url)
+                if response.status_code != 200:
+                    errors += 1
+                return (time.perf_counter() - started) * 1000
+
+        started = time.perf_counter()
+        timings = await asyncio.gather(*(one() for _ in range(count)))
+        elapsed = time.perf_counter() - started
+        await sync_to_async(connections.close_all)()
+        return self.summary(timings, errors, elapsed)
+
+    def summary(self, timings, errors, elapsed):
+        timings = sorted(timings) or [0.0]
+        return {
+            'p50_ms': round(statistics.median(timings), 2),
+            'p95_ms': round(timings[max(0, int(len(timings) * 0.95) - 1)], 2),
+            'requests_per_s': round(len(timings) / elapsed, 1) if elapsed else 0.0,
+            'errors': errors,
+        }
@@ -0,0 +1,167 @@
+import json
+import random
+import statistics
+import threading
+import time
+from contextlib import contextmanager
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, OperationalError, connection, connections, transaction
+from django.db.models import F, Sum
+from django.test.utils import override_settings
+
+from customers.db import journal_mode, read_from_replica, replica_alias, set_journal_mode
+from customers.expirations import expiration_index, soon
+from customers.models import Invoice
+
+# stock: Django'nun varsayılan SQLite bağlantısı (rollback journal, DEFERRED transaction,
+# okumalar primary'den). tuned: settings'teki journal modu ve pragma'lar, IMMEDIATE ve (varsa) replica.
+# journal_mode None: CUSTOMERS_SQLITE_JOURNAL_MODE. Ölçümden sonra dosyanın eski modu geri yüklenir.
+PROFILES = {
+    'stock': {
+        'journal_mode': 'DELETE',
+        'pragmas': {'synchronous': 'FULL', 'mmap_size': 0, 'cache_size': -2000},
+        'options': {'timeout': 5},
+        'replica': False,
+    },
+    'tuned': {
+        'journal_mode': None,
+        'pragmas': None,
+        'options': None,
+        'replica': True,
+    },
+}
+
+
+class Command(BaseCommand):
+    help = 'Yazarlar çalışırken okuyucu verimini ölçer; SQLite bağlantı profillerini karşılaştırır.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--readers', type=int, default=8, help='Okuyucu thread sayısı')
+        parser.add_argument('--writers', type=int, default=2, help='Yazar thread sayısı')
+        parser.add_argument('--duration', type=float, default=5.0, help='Profil başına süre (saniye)')
+        parser.add_argument('--profiles', nargs='*', default=list(PROFILES), choices=list(PROFILES))
+        parser.add_argument('--output', help='JSON rapor dosyası')
+
+    def handle(self, *args, **options):
+        if connection.vendor != 'sqlite':
+            raise CommandError('Bu ölçüm SQLite bağlantı profilleri içindir.')
+        self.invoice_ids = list(Invoice.objects.values_list('pk', flat=True)[:1000])
+        if not self.invoice_ids:
+            raise CommandError('Yazma yükü için fatura gerekli (generate_fixtures).')
+
+        results = {}
+        for name in options['profiles']:
+            with self.profile(PROFILES[name]):
+                results[name] = self.run(options['readers'], options['writers'], options['duration'], PROFILES[name])
+            r = results[name]
+            self.stdout.write(
+                f"{name:6} okuma {r['reads_per_s']:8.1f}/s  p50 {r['read_p50_ms']:7.1f} ms  "
+                f"p95 {r['read_p95_ms']:7.1f} ms  yazma {r['writes_per_s']:7.1f}/s  "
+                f"kilit hatası {r['lock_errors']:4d}  ({r['read_alias']})"
+            )
+
+        if 'stock' in results and 'tuned' in results and results['stock']['reads_per_s']:
+            gain = results['tuned']['reads_per_s'] / results['stock']['reads_per_s']
+            self.stdout.write(self.style.SUCCESS(f'Okuyucu verimi: {gain:.1f}x'))
+        if options['output']:
+            with open(options['output'], 'w', encoding='utf-8') as fh:
+                json.dump(results, fh, indent=2)
+            self.stdout.write(self.style.SUCCESS(f"Rapor yazıldı: {options['output']}"))
+
+    @contextmanager
+    def profile(self, profile):
+        # journal_mode yalnızca başka bağlantı yokken değişebilir; her profil temiz başlar
+        connections.close_all()
+        settings_dict = connections.settings[DEFAULT_DB_ALIAS]
+        original = settings_dict['OPTIONS']
+        overrides = {}
+        if profile['options'] is not None:
+            settings_dict['OPTIONS'] = profile['options']
+        if profile['pragmas'] is not None:
+            overrides['CUSTOMERS_SQLITE_PRAGMAS'] = profile['pragmas']
+        mode = profile['journal_mode'] or getattr(settings, 'CUSTOMERS_SQLITE_JOURNAL_MODE', 'WAL')
+        previous = journal_mode(connection)
+        try:
+            with override_settings(**overrides):
+                set_journal_mode(connection, mode)
+                yield
+        finally:
+            connections.close_all()
+            settings_dict['OPTIONS'] = original
+            set_journal_mode(connection, previous)
+            connections.close_all()
+
+    def run(self, readers, writers, duration, profile):
+        deadline = time.perf_counter() + duration
+        lock = threading.Lock()
+        totals = {'read_ms': [], 'writes': 0, 'lock_errors': 0}
+
+        def reader():
+            latencies, errors = [], 0
+            end = soon()
+            try:
+                while time.perf_counter() < deadline:
+                    started = time.perf_counter()
+                    try:
+                        if profile['replica']:
+                            with read_from_replica():
+                                self.read(end)
+                        else:
+                            self.read(end)
+                    except OperationalError:
+                        errors += 1
+                        continue
+                    latencies.append((time.perf_counter() - started) * 1000)
+            finally:
+                connections.close_all()
+            with lock:
+                totals['read_ms'] += latencies
+                totals['lock_errors'] += errors
+
+        def writer():
+            writes, errors = 0, 0
+            try:
+                while time.perf_counter() < deadline:
+                    try:
+                        self.write()
+                        writes += 1
+                    except OperationalError:
+                        errors += 1
+            finally:
+                connections.close_all()
+            with lock:
+                totals['writes'] += writes
+                totals['lock_errors'] += errors
+
+        threads = [threading.Thread(target=reader) for _ in range(readers)]
+        threads += [threading.Thread(target=writer) for _ in range(writers)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        timings = sorted(totals['read_ms']) or [0.0]
+        return {
+            'read_alias': (profile['replica'] and replica_alias()) or DEFAULT_DB_ALIAS,
+            'reads': len(totals['read_ms']),
+            'reads_per_s': round(len(totals['read_ms']) / duration, 1),
+            'read_p50_ms': round(statistics.median(timings), 2),
+            'read_p95_ms': round(timings[int(len(timings) * 0.95) - 1 if len(timings) > 1 else 0], 2),
+            'writes': totals['writes'],
+            'writes_per_s': round(totals['writes'] / duration, 1),
+            'lock_errors': totals['lock_errors'],
+        }
+
+    def read(self, end):
+        # Liste ve dashboard'un tipik okumaları: bitiş index'inden bir sayfa ve bir aggregate
+        list(expiration_index(end=end)[:50])
+        Invoice.objects.filter(payment_status='pending').aggregate(total=Sum('amount'))
+
+    def write(self):
+        # Veriyi değiştirmeyen ama yazma kilidi alan transaction: oku, sonra güncelle
+        pk = random.choice(self.invoice_ids)
+        with transaction.atomic():
+            Invoice.objects.filter(pk=pk).values_list('amount', flat=True).first()
+            Invoice.objects.filter(pk=pk).update(notes=F('notes'))
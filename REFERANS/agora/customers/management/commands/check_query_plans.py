@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.query_plans import check_plans, supports_plan_check
+
+
+class Command(BaseCommand):
+    help = "Görünüm sorgularının planlarını (EXPLAIN QUERY PLAN) çıkarır ve beklenen index'leri kullandıklarını doğrular."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--verbose-plans', action='store_true', help='Her sorgunun planını yazdır.')
+
+    def handle(self, *args, **options):
+        if not supports_plan_check():
+            raise CommandError('Plan kontrolü yalnızca SQLite ve PostgreSQL için tanımlı.')
+
+        failures = 0
+        for label, ok, plan in check_plans():
+            status = self.style.SUCCESS('OK  ') if ok else self.style.ERROR('FAIL')
+            self.stdout.write(f'{status} {label}')
+            if options['verbose_plans'] or not ok:
+                for line in plan.splitlines():
+                    self.stdout.write(f'       {line}')
+            failures += not ok
+
+        if failures:
+            raise CommandError(f"{failures} sorgu beklenen index'i kullanmıyor.")
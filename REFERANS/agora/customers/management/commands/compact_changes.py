@@ -0,0 +1,14 @@
+from django.core.management.base import BaseCommand
+
+from customers.changes import compact
+
+
+class Command(BaseCommand):
+    help = (
+        'Değişiklik günlüğünde her kaydın yalnızca son olayını bırakır. İmleçler geçerli kalır; '
+        'istemciler aynı kaydın ara hallerini görmez. Ör. cron: 0 4 * * * manage.py compact_changes'
+    )
+
+    def handle(self, *args, **options):
+        removed = compact()
+        self.stdout.write(self.style.SUCCESS(f'{removed} eski olay silindi.'))
@@ -0,0 +1,187 @@
+import random
+from datetime import timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.utils import timezone
+
+from customers.models import Customer, Domain, HostingService, SSLCertificate, Invoice
+from customers import changes, nameservers
+from customers.signals import bulk_changed
+
+COMPANY_WORDS = [
+    'Anadolu', 'Ege', 'Marmara', 'Toros', 'Kuzey', 'Güney', 'Yıldız', 'Işık', 'Çınar', 'Doğa',
+    'Atlas', 'Başkent', 'Deniz', 'Gökyüzü', 'İnci', 'Kartal', 'Lale', 'Mavi', 'Pınar', 'Şafak',
+]
+COMPANY_SUFFIXES = ['Yazılım', 'Bilişim', 'Tekstil', 'Gıda', 'İnşaat', 'Lojistik', 'Turizm', 'Danışmanlık', 'Medya', 'Otomotiv']
+COMPANY_TYPES = ['A.Ş.', 'Ltd. Şti.']
+FIRST_NAMES = ['Ahmet', 'Ayşe', 'Mehmet', 'Fatma', 'Emre', 'Zeynep', 'Can', 'Elif', 'Burak', 'Şule', 'İsmail', 'Özge']
+LAST_NAMES = ['Yılmaz', 'Kaya', 'Demir', 'Şahin', 'Çelik', 'Öztürk', 'Aydın', 'Arslan', 'Doğan', 'Kılıç']
+TAX_OFFICES = ['Kadıköy', 'Beşiktaş', 'Çankaya', 'Konak', 'Nilüfer', 'Muratpaşa']
+TLDS = ['.com', '.com.tr', '.net', '.org', '.net.tr', '.io']
+PACKAGES = ['Başlangıç', 'Standart', 'Profesyonel', 'Kurumsal']
+NAMESERVERS = [
+    ('ns1.compeople.com.tr', 'ns2.compeople.com.tr'),
+    ('ns1.cloudflare.com', 'ns2.cloudflare.com'),
+    ('ns1.natro.com', 'ns2.natro.com'),
+]
+ASCII_MAP = str.maketrans('çğıöşüÇĞİÖŞÜ', 'cgiosuCGIOSU')
+
+
+class Command(BaseCommand):
+    help = 'Performans ölçümleri için gerçekçi sentetik müşteri, domain, hosting, SSL ve fatura verisi üretir.'
+
+    def add_arguments(self, parser):
+        parser.add_argument('--customers', type=int, default=1000)
+        parser.add_argument('--domains-per-customer', type=int, default=3)
+        parser.add_argument('--hosting-ratio', type=float, default=0.6, help='Hosting hizmeti olan domain oranı')
+        parser.add_argument('--ssl-ratio', type=float, default=0.5, help='SSL sertifikası olan domain oranı')
+        parser.add_argument('--invoices', type=int, default=10000, help='Toplam fatura sayısı')
+        parser.add_argument('--batch-size', type=int, default=1000, help='Her partide oluşturulacak müşteri sayısı')
+        parser.add_argument('--seed', type=int, default=42)
+
+    def handle(self, *args, **options):
+        rng = random.Random(options['seed'])
+        total_customers = options['customers']
+        batch_size = options['batch_size']
+        invoices_per_customer = options['invoices'] / max(total_customers, 1)
+        # Fatura numaraları önceki çalıştırmalarla çakışmasın
+        last_number = (
+            Invoice.objects.filter(invoice_number__startswith='GEN')
+            .order_by('-invoice_number').values_list('invoice_number', flat=True).first()
+        )
+        invoice_seq = int(last_number[3:]) if last_number and last_number[3:].isdigit() else 0
+        today = timezone.localdate()
+        created = dict.fromkeys(['customers', 'domains', 'hostings', 'ssls', 'invoices'], 0)
+
+        for start in range(0, total_customers, batch_size):
+            size = min(batch_size, total_customers - start)
+            with transaction.atomic():
+                customers = Customer.objects.bulk_create(
+                    [self.make_customer(rng, start + i, today) for i in range(size)],
+                    batch_size=batch_size,
+                )
+                domains = Domain.objects.bulk_create(
+                    [
+                        self.make_domain(rng, customer, n, today)
+                        for customer in customers
+                        for n in range(options['domains_per_customer'])
+                    ],
+                    batch_size=batch_size,
+                )
+                hostings = HostingService.objects.bulk_create(
+                    [self.make_hosting(rng, domain, today) for domain in domains if rng.random() < options['hosting_ratio']],
+                    batch_size=batch_size,
+                )
+                ssls = SSLCertificate.objects.bulk_create(
+                    [self.make_ssl(rng, domain) for domain in domains if rng.random() < options['ssl_ratio']],
+                    batch_size=batch_size,
+                )
+                invoices = []
+                for customer in customers:
+                    count = int(invoices_per_customer) + (rng.random() < invoices_per_customer % 1)
+                    for _ in range(count):
+                        invoice_seq += 1
+                        invoices.append(self.make_invoice(rng, customer, invoice_seq, today))
+                Invoice.objects.bulk_create(invoices, batch_size=batch_size)
+                for model, objs in ((Customer, customers), (Domain, domains), (HostingService, hostings),
+                                    (SSLCertificate, ssls), (Invoice, invoices)):
+                    changes.record(model, [obj.pk for obj in objs])
+                nameservers.sync(domains)
+
+            created['customers'] += len(customers)
+            created['domains'] += len(domains)
+            created['hostings'] += len(hostings)
+            created['ssls'] += len(ssls)
+            created['invoices'] += len(invoices)
+            self.stdout.write(f"{created['customers']}/{total_customers} müşteri oluşturuldu")
+
+        # bulk_create post_save göndermez; sayaçları tazele
+        for model in (Customer, Domain, HostingService, SSLCertificate, Invoice):
+            bulk_changed.send(sender=model)
+
+        self.stdout.write(self.style.SUCCESS(
+            'Oluşturuldu: ' + ', '.join(f'{count} {name}' for name, count in created.items())
+        ))
+
+    def make_customer(self, rng, n, today):
+        first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+        company = f'{rng.choice(COMPANY_WORDS)} {rng.choice(COMPANY_SUFFIXES)} {n} {rng.choice(COMPANY_TYPES)}'
+        slug = company.split()[0].translate(ASCII_MAP).lower()
+        registered = today - timedelta(days=rng.randint(0, 3650))
+        return Customer(
+            company_name=company,
+            contact_name=f'{first} {last}',
+            email=f'info@{slug}{n}.com',
+            email2=f'{first.translate(ASCII_MAP).lower()}@{slug}{n}.com' if rng.random() < 0.4 else None,
+            email3=None,
+            phone=f'05{rng.randint(30, 59)}{rng.randint(1000000, 9999999)}',
+            address=f'{rng.choice(TAX_OFFICES)} / Türkiye',
+            tax_office=rng.choice(TAX_OFFICES),
+            tax_number=str(rng.randint(1000000000, 9999999999)),
+            registration_date=registered,
+            created_at=timezone.now() - timedelta(days=(today - registered).days),
+        )
+
+    def make_domain(self, rng, customer, n, today):
+        slug = customer.email.split('@')[1].split('.')[0]
+        registered = today - timedelta(days=rng.randint(0, 2000))
+        ns1, ns2 = rng.choice(NAMESERVERS)
+        return Domain(
+            customer=customer,
+            name=f'{slug}{n or ""}{rng.choice(TLDS)}',
+            registration_date=registered,
+            # Çoğu ileri tarihli, bir kısmı süresi geçmiş
+            expiration_date=today + timedelta(days=rng.randint(-60, 365)),
+            is_active=rng.random() < 0.9,
+            nameserver1=ns1,
+            nameserver2=ns2,
+        )
+
+    def make_hosting(self, rng, domain, today):
+        status = rng.choices(['active', 'suspended', 'cancelled'], weights=[85, 10, 5])[0]
+        # Süresi geçmiş aktif hosting sweep_statuses'un bırakacağı gibi expired olur
+        if status == 'active' and domain.expiration_date < today:
+            status = 'expired'
+        return HostingService(
+            customer=domain.customer,
+            domain=domain,
+            package=rng.choice(PACKAGES),
+            status=status,
+            start_date=domain.registration_date,
+            expiration_date=domain.expiration_date,
+            renewal_count=rng.randint(0, 5),
+        )
+
+    def make_ssl(self, rng, domain):
+        return SSLCertificate(
+            customer=domain.customer,
+            domain=domain,
+            start_date=domain.expiration_date - timedelta(days=365),
+            expiration_date=domain.expiration_date,
+            is_active=domain.is_active,
+        )
+
+    def make_invoice(self, rng, customer, seq, today):
+        issue_date = today - timedelta(days=rng.randint(0, 1095))
+        due_date = issue_date + timedelta(days=30)
+        # Ödenmemişlerin durumu vadeden türetilir (sweep_statuses ile aynı): vadesi geçen overdue,
+        # gelmeyen pending. Bağımsız seçilirse vadesi geçmiş pending ve vadesi gelmemiş overdue
+        # faturalar gecikme ve yaşlandırma raporlarını çarpıtır.
+        paid = rng.random() < 0.75
+        if paid:
+            status = 'paid'
+        else:
+            status = 'overdue' if due_date < today else 'pending'
+        return Invoice(
+            customer=customer,
+            invoice_number=f'GEN{seq:09d}',
+            description=rng.choice(['Hosting yenileme', 'Domain yenileme', 'SSL sertifikası', 'Kurulum hizmeti']),
+            amount=Decimal(rng.randint(150, 15000)) + Decimal(rng.randint(0, 99)) / 100,
+            issue_date=issue_date,
+            due_date=due_date,
+            payment_status=status,
+            payment_date=min(issue_date + timedelta(days=rng.randint(0, 45)), today) if paid else None,
+            payment_method=rng.choice(['bank_transfer', 'credit_card', 'other']) if paid else None,
+        )
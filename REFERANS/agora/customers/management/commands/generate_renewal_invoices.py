@@ -0,0 +1,46 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from customers.expirations import expiring_soon_days
+from customers.renewals import generate_renewal_invoices
+
+
+class Command(BaseCommand):
+    help = (
+        'Aralıkta bitecek aktif hosting, domain ve SSL hizmetleri için yenileme faturalarını toplu keser. '
+        'Aynı hizmet dönemi için daha önce kesilmiş fatura tekrar kesilmez.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Bugünden itibaren kaç gün (varsayılan: CUSTOMERS_EXPIRING_SOON_DAYS)')
+        parser.add_argument('--start', help='Başlangıç tarihi (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Bitiş tarihi (YYYY-MM-DD)')
+        parser.add_argument('--issue-date', help='Fatura tarihi (YYYY-MM-DD, varsayılan: bugün)')
+        parser.add_argument('--dry-run', action='store_true', help='Yazmadan kesilecek faturaları listele.')
+
+    def handle(self, *args, **options):
+        try:
+            issue_date = parse_date(options['issue_date']) if options['issue_date'] else timezone.localdate()
+            start = parse_date(options['start']) if options['start'] else issue_date
+            end = parse_date(options['end']) if options['end'] else None
+        except ValueError as exc:
+            raise CommandError(f'Geçersiz tarih: {exc}')
+        if issue_date is None or start is None or (options['end'] and end is None):
+            raise CommandError('Tarihler YYYY-MM-DD biçiminde olmalı.')
+        if end is None:
+            end = start + timedelta(days=options['days'] if options['days'] is not None else expiring_soon_days())
+
+        result = generate_renewal_invoices(start, end, issue_date=issue_date, dry_run=options['dry_run'])
+        if options['dry_run']:
+            for invoice in result.invoices:
+                self.stdout.write(f'{invoice.invoice_number}  {invoice.amount:>10} TL  {invoice.description}')
+        for service_type, pk in result.unpriced:
+            self.stderr.write(f'{service_type} #{pk}: fiyat tanımlı değil (CUSTOMERS_RENEWAL_PRICES), atlandı.')
+        verb = 'kesilecek' if options['dry_run'] else 'kesildi'
+        self.stdout.write(self.style.SUCCESS(
+            f'{start} - {end}: {result.created} fatura {verb} ({result.total} TL), '
+            f'{result.existing} hizmet zaten faturalanmış.'
+        ))
@@ -0,0 +1,60 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.importers import DEFAULT_BATCH_SIZE, IMPORT_ORDER, detect_format, import_files
+
+
+class Command(BaseCommand):
+    help = (
+        'Müşteri, domain, hosting, SSL ve fatura kayıtlarını CSV, JSON veya JSON Lines '
+        'dosyalarından (ör. Cloudflare D1 dışa aktarımı) partiler halinde içe aktarır.'
+    )
+
+    def add_arguments(self, parser):
+        for kind in IMPORT_ORDER:
+            parser.add_argument(f'--{kind}', metavar='DOSYA', help=f'{kind} dosyası')
+        parser.add_argument(
+            '--format', choices=['csv', 'json', 'jsonl'],
+            help='Dosya biçimi; verilmezse uzantıdan anlaşılır.',
+        )
+        parser.add_argument('--batch-size', type=int, default=DEFAULT_BATCH_SIZE)
+        parser.add_argument('--dry-run', action='store_true', help='Doğrula ama hiçbir şeyi kaydetme.')
+        parser.add_argument('--report', metavar='DOSYA', help='Hatalı satırları bu CSV dosyasına yaz.')
+
+    def handle(self, *args, **options):
+        paths = [(kind, options[kind]) for kind in IMPORT_ORDER if options[kind]]
+        if not paths:
+            raise CommandError('En az bir dosya verin: ' + ', '.join(f'--{kind}' for kind in IMPORT_ORDER))
+
+        files = []
+        try:
+            for kind, path in paths:
+                try:
+                    files.append((kind, open(path, encoding='utf-8-sig', newline=''), options['format'] or detect_format(path)))
+                except OSError as exc:
+                    raise CommandError(f'{path} açılamadı: {exc}')
+            report = import_files(files, batch_size=options['batch_size'], dry_run=options['dry_run'])
+        finally:
+            for _, fileobj, _ in files:
+                fileobj.close()
+
+        for kind, _ in paths:
+            counts = report.counts[kind]
+            self.stdout.write(f"{kind}: {counts['created']} yeni, {counts['updated']} güncellendi, {counts['failed']} hatalı")
+        if report.counts['domains']['created'] and not options['domains']:
+            self.stdout.write(f"domains: {report.counts['domains']['created']} yeni (hosting/SSL için oluşturuldu)")
+
+        if options['report']:
+            with open(options['report'], 'w', encoding='utf-8', newline='') as fileobj:
+                report.write_csv(fileobj)
+        elif report.errors:
+            for kind, line, message in report.errors[:20]:
+                self.stderr.write(f'{kind}:{line}: {message}')
+            if report.error_count > 20:
+                self.stderr.write(f'... {report.error_count - 20} hata daha; tamamı için --report kullanın.')
+
+        if options['dry_run']:
+            self.stdout.write(self.style.WARNING('Deneme çalıştırması: değişiklikler geri alındı.'))
+        elif report.error_count:
+            self.stdout.write(self.style.WARNING(f'İçe aktarma tamamlandı, {report.error_count} satır atlandı.'))
+        else:
+            self.stdout.write(self.style.SUCCESS('İçe aktarma tamamlandı.'))
@@ -0,0 +1,40 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.purge import BATCH_SIZE, open_jobs, purge
+
+
+class Command(BaseCommand):
+    help = (
+        'Silinen müşterilerin hosting, domain, SSL ve faturalarını partiler halinde temizler. '
+        'Yarıda kalan işler kaldığı yerden sürer. Tek süreç olarak sık çalıştırılmalı, '
+        'ör. cron: */5 * * * * manage.py purge_customers'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batch-size', type=int, default=BATCH_SIZE, help='Parti başına en fazla kayıt')
+        parser.add_argument('--job', type=int, action='append', help='Yalnızca bu iş(ler)')
+
+    def handle(self, *args, **options):
+        if options['batch_size'] < 1:
+            raise CommandError('--batch-size en az 1 olmalı.')
+        self.verbosity = options['verbosity']
+        jobs = open_jobs()
+        if options['job']:
+            jobs = jobs.filter(pk__in=options['job'])
+
+        failed = 0
+        for job in jobs:
+            self.stdout.write(f'{job}: başlıyor ({job.deleted_rows} kayıt önceden silinmiş)')
+            try:
+                purge(job, batch_size=options['batch_size'], progress=self.progress)
+            except Exception as exc:
+                failed += 1
+                self.stderr.write(self.style.ERROR(f'{job}: {exc}'))
+                continue
+            self.stdout.write(self.style.SUCCESS(f'{job}: {job.deleted_rows} ilişkili kayıt ve müşteri silindi.'))
+        if failed:
+            raise CommandError(f'{failed} iş tamamlanamadı; tekrar çalıştırıldığında kaldığı yerden sürer.')
+
+    def progress(self, job):
+        if self.verbosity >= 2:
+            self.stdout.write(f'  {job}: {job.deleted_rows}/{job.total_rows}')
@@ -0,0 +1,37 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from customers import revenue
+from customers.stats import find_drift, rebuild_counters
+
+
+class Command(BaseCommand):
+    help = 'Dashboard sayaçlarını ve gelir özetlerini canlı tablolardan yeniden hesaplar veya sapmaları raporlar.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--check', action='store_true',
+            help='Sayaçları değiştirmeden kayıtlı değerleri canlı değerlerle karşılaştır.',
+        )
+
+    def handle(self, *args, **options):
+        if options['check']:
+            drift = find_drift()
+            drift.update({
+                ' '.join(str(part) for part in key if part): values
+                for key, values in revenue.find_drift().items()
+            })
+            if not drift:
+                self.stdout.write(self.style.SUCCESS('Sayaçlar canlı verilerle uyumlu.'))
+                return
+            for name, (stored, live) in sorted(drift.items()):
+                self.stdout.write(
+                    f'{name}: kayıtlı adet={stored[0]} tutar={stored[1]} / '
+                    f'canlı adet={live[0]} tutar={live[1]}'
+                )
+            raise CommandError(f'{len(drift)} sayaçta sapma bulundu.')
+
+        counters = rebuild_counters()
+        rollups = revenue.rebuild()
+        self.stdout.write(self.style.SUCCESS(
+            f'{len(counters)} sayaç ve {len(rollups)} gelir özeti yeniden hesaplandı.'
+        ))
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from customers.nameservers import normalize, replace
+
+
+class Command(BaseCommand):
+    help = (
+        'Bir nameserver\'ı kullanan tüm domainlerde (ya da yalnızca bir müşterininkilerde) '
+        'yenisiyle değiştirir; tek transaction. Ör. manage.py replace_nameserver ns1.eski.com ns1.yeni.com'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('old', help='Değiştirilecek nameserver')
+        parser.add_argument('new', help='Yeni nameserver')
+        parser.add_argument('--customer', type=int, help='Yalnızca bu müşterinin (id) domainleri')
+
+    def handle(self, *args, **options):
+        old, new = normalize(options['old']), normalize(options['new'])
+        if not old or not new or old == new:
+            raise CommandError('Eski ve yeni nameserver dolu ve birbirinden farklı olmalı.')
+        count = replace(old, new, customer_id=options['customer'])
+        self.stdout.write(self.style.SUCCESS(f'{count} domainde {old} -> {new} olarak değiştirildi.'))
@@ -0,0 +1,190 @@
+import itertools
+import json
+import platform
+import statistics
+import time
+import tracemalloc
+from urllib.parse import urlencode
+
+import django
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext, override_settings
+from django.urls import URLPattern, reverse
+
+from customers import urls as customer_urls
+from customers.api import API_RESOURCES
+from customers.autocomplete import RESOURCES as AUTOCOMPLETE_RESOURCES
+from customers.cache import get_cache
+from customers.management.commands.generate_fixtures import NAMESERVERS
+from customers.lists import LISTS
+from customers.models import Customer, Domain, HostingService, SSLCertificate, Invoice
+
+# <int:pk> içeren URL'ler için hangi modelden kayıt seçileceği (URL adı önekine göre)
+PK_MODELS = {
+    'customer': Customer,
+    'hosting': HostingService,
+    'domain': Domain,
+    'ssl': SSLCertificate,
+    'invoice': Invoice,
+}
+# pk dışındaki yol parametreleri: URL adı -> parametre -> örnek değerler. Her değer ayrı ölçülür
+# ve sonuçta "ad[değer]" olarak görünür; örneği tanımlı olmayan parametreli URL'ler stderr'e yazılır.
+SAMPLE_VALUES = {
+    'api-autocomplete': {'resource': list(AUTOCOMPLETE_RESOURCES)},
+    'api-list': {'resource': list(API_RESOURCES)},
+    'api-detail': {'resource': list(API_RESOURCES)},
+    'export': {'name': list(LISTS)},
+}
+# Parametresiz 400 dönen ya da boş sonuç üreten uç noktalar için sorgu dizesi (fixture verisine uygun)
+SAMPLE_QUERIES = {
+    'api-search': {'q': 'a'},
+    'api-autocomplete': {'q': 'a'},
+    'api-nameserver-domains': {'host': NAMESERVERS[0][0]},
+}
+
+
+class Command(BaseCommand):
+    help = "customers/urls.py içindeki her URL'yi test istemcisiyle ölçer ve JSON rapor yazar."
+
+    def add_arguments(self, parser):
+        parser.add_argument('--repeat', type=int, default=5, help='URL başına istek sayısı')
+        parser.add_argument('--output', default='bench_output.json', help='Rapor dosyası')
+        parser.add_argument('--compare', help='Karşılaştırılacak önceki rapor')
+        parser.add_argument('--only', nargs='*', default=None, help='Yalnızca bu URL adlarını ölç')
+        parser.add_argument('--cold', action='store_true', help='Her istekten önce sonuç önbelleğini boşalt')
+
+    def handle(self, *args, **options):
+        client = Client()
+        client.force_login(self.benchmark_user())
+
+        results = {}
+        with override_settings(ALLOWED_HOSTS=['testserver', *settings.ALLOWED_HOSTS]):
+            for name, url in self.urls():
+                if options['only'] and name not in options['only'] and name.split('[')[0] not in options['only']:
+                    continue
+                results[name] = self.measure(client, url, options['repeat'], options['cold'])
+                r = results[name]
+                self.stdout.write(
+                    f"{name:40} {r['status']}  medyan {r['median_ms']:8.1f} ms  "
+                    f"{r['queries']:4d} sorgu  {r['peak_memory_kb']:9.1f} KB"
+                )
+
+        report = {
+            'created_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'environment': {
+                'python': platform.python_version(),
+                'django': django.get_version(),
+                'database': connection.vendor,
+                'repeat': options['repeat'],
+                'cold_cache': options['cold'],
+            },
+            'row_counts': {
+                model.__name__: model.objects.count()
+                for model in (Customer, Domain, HostingService, SSLCertificate, Invoice)
+            },
+            'results': results,
+        }
+        with open(options['output'], 'w', encoding='utf-8') as fh:
+            json.dump(report, fh, indent=2, ensure_ascii=False)
+        self.stdout.write(self.style.SUCCESS(f"Rapor yazıldı: {options['output']}"))
+
+        if options['compare']:
+            self.compare(options['compare'], report)
+
+    def benchmark_user(self):
+        User = get_user_model()
+        user = User.objects.filter(is_superuser=True, is_active=True).first()
+        if user is None:
+            raise CommandError('Ölçüm için aktif bir süper kullanıcı gerekli (createsuperuser).')
+        return user
+
+    def urls(self):
+        for pattern in customer_urls.urlpatterns:
+            if not isinstance(pattern, URLPattern) or not pattern.name:
+                continue
+            name = f'{customer_urls.app_name}:{pattern.name}'
+            samples = SAMPLE_VALUES.get(pattern.name, {})
+            params = [param for param in pattern.pattern.converters if param != 'pk']
+            missing = [param for param in params if param not in samples]
+            if missing:
+                self.stderr.write(f"{name}: {', '.join(missing)} için örnek değer yok, atlandı")
+                continue
+            for values in itertools.product(*(samples[param] for param in params)):
+                kwargs = dict(zip(params, values))
+                label = f"{name}[{','.join(values)}]" if values else name
+                if 'pk' in pattern.pattern.converters:
+                    if 'resource' in kwargs:
+                        model = API_RESOURCES[kwargs['resource']]['model']
+                    else:
+                        model = PK_MODELS.get(pattern.name.removeprefix('async-').split('-')[0])
+                    if model is None:
+                        self.stderr.write(f'{label}: pk için model bilinmiyor, atlandı')
+                        continue
+                    pk = model._base_manager.order_by('pk').values_list('pk', flat=True).first()
+                    if pk is None:
+                        self.stderr.write(f'{label}: kayıt bulunamadı, atlandı')
+                        continue
+                    kwargs['pk'] = pk
+                url = reverse(name, kwargs=kwargs)
+                if pattern.name in SAMPLE_QUERIES:
+                    url = f'{url}?{urlencode(SAMPLE_QUERIES[pattern.name])}'
+                yield label, url
+
+    def measure(self, client, url, repeat, cold=False):
+        # Süre, sorgu sayısı ve SQL süresi her tekrarda ayrı ölçülür; raporda medyanları yer alır
+        # (soğuk/sıcak karışımında son tekrar yanıltıcı olurdu). Bellek: tüm tekrarların tepesi.
+        timings, query_counts, sql_timings, status = [], [], [], None
+        client.get(url)  # ısınma (şablon ve bağlantı önbellekleri)
+        tracemalloc.start()
+        try:
+            for _ in range(repeat):
+                if cold:
+                    get_cache().clear()
+                with CaptureQueriesContext(connection) as queries:
+                    started = time.perf_counter()
+                    response = client.get(url)
+                    # Akışlı yanıtlar (dışa aktarma) gövde tüketilirken üretilir; süreye dahil
+                    body = b''.join(response.streaming_content) if response.streaming else response.content
+                    timings.append((time.perf_counter() - started) * 1000)
+                query_counts.append(len(queries))
+                sql_timings.append(sum(float(q['time']) for q in queries.captured_queries) * 1000)
+                status = response.status_code
+            peak = tracemalloc.get_traced_memory()[1]
+        finally:
+            tracemalloc.stop()
+        return {
+            'url': url,
+            'status': status,
+            'queries': int(statistics.median_low(query_counts)),
+            'queries_min': min(query_counts),
+            'queries_max': max(query_counts),
+            'sql_ms': round(statistics.median(sql_timings), 2),
+            'median_ms': round(statistics.median(timings), 2),
+            'min_ms': round(min(timings), 2),
+            'max_ms': round(max(timings), 2),
+            'response_bytes': len(body),
+            'peak_memory_kb': round(peak / 1024, 1),
+        }
+
+    def compare(self, path, report):
+        try:
+            with open(path, encoding='utf-8') as fh:
+                previous = json.load(fh)['results']
+        except (OSError, ValueError, KeyError) as exc:
+            raise CommandError(f'Önceki rapor okunamadı: {exc}')
+
+        self.stdout.write(f'\nKarşılaştırma: {path}')
+        for name, current in report['results'].items():
+            before = previous.get(name)
+            if before is None:
+                self.stdout.write(f'{name:40} (yeni)')
+                continue
+            change = (current['median_ms'] - before['median_ms']) / before['median_ms'] * 100 if before['median_ms'] else 0
+            self.stdout.write(
+                f"{name:40} {before['median_ms']:8.1f} -> {current['median_ms']:8.1f} ms ({change:+.1f}%)  "
+                f"sorgu {before['queries']} -> {current['queries']}"
+            )
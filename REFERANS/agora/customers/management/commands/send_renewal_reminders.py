@@ -0,0 +1,52 @@
+from datetime import timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from customers.expirations import expiring_soon_days
+from customers.reminders import pending_digests, send_digests
+
+
+class Command(BaseCommand):
+    help = (
+        'Yakında bitecek hosting, domain ve SSL hizmetleri için müşteri başına tek özet e-posta gönderir. '
+        'Daha önce hatırlatılan hizmetler tekrar gönderilmez.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, help='Bugünden itibaren kaç gün (varsayılan: CUSTOMERS_EXPIRING_SOON_DAYS)')
+        parser.add_argument('--start', help='Başlangıç tarihi (YYYY-MM-DD)')
+        parser.add_argument('--end', help='Bitiş tarihi (YYYY-MM-DD)')
+        parser.add_argument('--workers', type=int, help='Eşzamanlı SMTP bağlantısı sayısı (varsayılan: CUSTOMERS_REMINDER_WORKERS)')
+        parser.add_argument('--dry-run', action='store_true', help='Göndermeden kimlere gideceğini listele.')
+
+    def handle(self, *args, **options):
+        try:
+            start = parse_date(options['start']) if options['start'] else timezone.localdate()
+            end = parse_date(options['end']) if options['end'] else None
+        except ValueError as exc:
+            raise CommandError(f'Geçersiz tarih: {exc}')
+        if start is None or (options['end'] and end is None):
+            raise CommandError('Tarihler YYYY-MM-DD biçiminde olmalı.')
+        if end is None:
+            end = start + timedelta(days=options['days'] if options['days'] is not None else expiring_soon_days())
+
+        digests = pending_digests(start, end)
+        self.stdout.write(
+            f'{start} - {end}: {len(digests)} müşteri, '
+            f'{sum(len(digest.items) for digest in digests)} hizmet hatırlatılacak.'
+        )
+        if options['dry_run']:
+            for digest in digests:
+                recipients = ', '.join(digest.recipients) or '(e-posta yok)'
+                self.stdout.write(f'{digest.customer.company_name} <{recipients}>: {len(digest.items)} hizmet')
+            return
+
+        result = send_digests(digests, workers=options['workers'])
+        for customer in result.skipped:
+            self.stderr.write(f'{customer.company_name}: e-posta adresi yok, atlandı.')
+        for customer, exc in result.failed:
+            self.stderr.write(f'{customer.company_name}: gönderilemedi ({exc})')
+        style = self.style.SUCCESS if not result.failed else self.style.WARNING
+        self.stdout.write(style(f'{result.sent} e-posta gönderildi, {len(result.failed)} başarısız.'))
@@ -0,0 +1,30 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import DEFAULT_DB_ALIAS, connections
+
+from customers.db import journal_mode, set_journal_mode
+
+DEFAULT_MODE = 'WAL'
+MODES = ('DELETE', 'TRUNCATE', 'PERSIST', 'MEMORY', 'WAL', 'OFF')
+
+
+class Command(BaseCommand):
+    help = (
+        'SQLite veritabanı dosyasının journal modunu ayarlar (varsayılan CUSTOMERS_SQLITE_JOURNAL_MODE). '
+        'Mod dosyaya yazılır; kurulumda bir kez, site dururken çalıştırılır.'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--mode', type=str.upper, choices=MODES, help='Journal modu')
+        parser.add_argument('--database', default=DEFAULT_DB_ALIAS, help='Bağlantı adı')
+
+    def handle(self, *args, **options):
+        connection = connections[options['database']]
+        if connection.vendor != 'sqlite':
+            raise CommandError('journal_mode yalnızca SQLite içindir.')
+        mode = options['mode'] or getattr(settings, 'CUSTOMERS_SQLITE_JOURNAL_MODE', DEFAULT_MODE)
+        previous = journal_mode(connection)
+        current = set_journal_mode(connection, mode)
+        if current.lower() != mode.lower():
+            raise CommandError(f'journal_mode {mode} yapılamadı (şu an {current}); veritabanını kullanan süreçleri durdurun.')
+        self.stdout.write(self.style.SUCCESS(f'journal_mode: {previous} -> {current}'))
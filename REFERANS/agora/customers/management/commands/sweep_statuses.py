@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.utils.dateparse import parse_date
+
+from customers.sweeper import last_sweep, sweep
+
+
+class Command(BaseCommand):
+    help = (
+        'Vadesi geçen faturaları "overdue", süresi dolan hostingleri "expired" durumuna taşır '
+        '(küme UPDATE). Günlük çalıştırılmalı, ör. cron: 5 0 * * * manage.py sweep_statuses'
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument('--date', help='Hangi güne göre (YYYY-MM-DD, varsayılan: bugün)')
+        parser.add_argument('--dry-run', action='store_true', help='Güncellemeden kaç kaydın değişeceğini göster.')
+
+    def handle(self, *args, **options):
+        try:
+            today = parse_date(options['date']) if options['date'] else None
+        except ValueError as exc:
+            raise CommandError(f'Geçersiz tarih: {exc}')
+        if options['date'] and today is None:
+            raise CommandError('Tarih YYYY-MM-DD biçiminde olmalı.')
+
+        previous = last_sweep()
+        if previous:
+            self.stdout.write(f'Son tarama: {previous.ran_at:%d.%m.%Y %H:%M} ({previous.as_of})')
+        run = sweep(today, dry_run=options['dry_run'])
+        verb = 'değişecek' if options['dry_run'] else 'güncellendi'
+        self.stdout.write(self.style.SUCCESS(
+            f'{run.as_of}: {run.overdue_invoices} fatura gecikmiş; '
+            f'{run.expired_hosting} hosting süresi doldu, {run.reactivated_hosting} hosting yeniden aktif ({verb}).'
+        ))
@@ -0,0 +1,224 @@
+import threading
+import time
+from bisect import bisect_left
+from contextlib import ExitStack
+from contextvars import ContextVar
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+from django.template.backends.django import DjangoTemplates
+
+# Milisaniye cinsinden histogram sınırları (Prometheus "le" değerleri)
+DURATION_BUCKETS = (1, 2.5, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+QUERY_COUNT_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+QUANTILES = (0.5, 0.95, 0.99)
+SLOW_SQL_MAX_LENGTH = 500
+
+_current = ContextVar('customers_request_metrics', default=None)
+
+
+class Histogram:
+    def __init__(self, bounds):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)  # son kova: +Inf
+        self.count = 0
+        self.sum = 0.0
+
+    def observe(self, value):
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.sum += value
+
+    def quantile(self, q):
+        """Kova sınırları arasında doğrusal enterpolasyonla tahmini yüzdelik."""
+        if not self.count:
+            return None
+        rank = q * self.count
+        seen = 0
+        for i, bucket_count in enumerate(self.counts):
+            if seen + bucket_count >= rank and bucket_count:
+                lower = self.bounds[i - 1] if i else 0
+                upper = self.bounds[i] if i < len(self.bounds) else self.bounds[-1]
+                return lower + (upper - lower) * (rank - seen) / bucket_count
+            seen += bucket_count
+        return self.bounds[-1]
+
+    def cumulative(self):
+        total = 0
+        for bound, bucket_count in zip(list(self.bounds) + ['+Inf'], self.counts):
+            total += bucket_count
+            yield bound, total
+
+
+class ViewMetrics:
+    def __init__(self):
+        self.request_ms = Histogram(DURATION_BUCKETS)
+        self.sql_ms = Histogram(DURATION_BUCKETS)
+        self.template_ms = Histogram(DURATION_BUCKETS)
+        self.queries = Histogram(QUERY_COUNT_BUCKETS)
+        self.slowest_sql = None
+        self.slowest_sql_ms = 0.0
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.views = {}
+
+    def record(self, view, request_ms, sample):
+        with self._lock:
+            metrics = self.views.get(view)
+            if metrics is None:
+                metrics = self.views[view] = ViewMetrics()
+            metrics.request_ms.observe(request_ms)
+            metrics.sql_ms.observe(sample.sql_ms)
+            metrics.template_ms.observe(sample.template_ms)
+            metrics.queries.observe(sample.queries)
+            if sample.slowest_sql_ms > metrics.slowest_sql_ms:
+                metrics.slowest_sql_ms = sample.slowest_sql_ms
+                metrics.slowest_sql = sample.slowest_sql
+
+    def reset(self):
+        with self._lock:
+            self.views = {}
+
+    def snapshot(self):
+        with self._lock:
+            return {
+                view: {
+                    'requests': m.request_ms.count,
+                    'request_ms': _summary(m.request_ms),
+                    'sql_ms': _summary(m.sql_ms),
+                    'template_ms': _summary(m.template_ms),
+                    'queries': _summary(m.queries),
+                    'slowest_sql_ms': round(m.slowest_sql_ms, 3),
+                    'slowest_sql': m.slowest_sql,
+                }
+                for view, m in sorted(self.views.items())
+            }
+
+    def prometheus(self):
+        lines = []
+        with self._lock:
+            items = sorted(self.views.items())
+            for metric, attr, help_text in (
+                ('agora_request_duration_ms', 'request_ms', 'İstek süresi (ms)'),
+                ('agora_sql_duration_ms', 'sql_ms', 'İstek başına toplam SQL süresi (ms)'),
+                ('agora_template_duration_ms', 'template_ms', 'İstek başına şablon render süresi (ms)'),
+                ('agora_sql_queries', 'queries', 'İstek başına SQL sorgu sayısı'),
+            ):
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for view, m in items:
+                    hist = getattr(m, attr)
+                    label = _label(view)
+                    for bound, total in hist.cumulative():
+                        lines.append(f'{metric}_bucket{{view="{label}",le="{bound}"}} {total}')
+                    lines.append(f'{metric}_sum{{view="{label}"}} {hist.sum:.3f}')
+                    lines.append(f'{metric}_count{{view="{label}"}} {hist.count}')
+            lines.append('# HELP agora_slowest_sql_ms En yavaş tekil SQL ifadesi (ms)')
+            lines.append('# TYPE agora_slowest_sql_ms gauge')
+            for view, m in items:
+                lines.append(f'agora_slowest_sql_ms{{view="{_label(view)}"}} {m.slowest_sql_ms:.3f}')
+        return '\n'.join(lines) + '\n'
+
+
+def _summary(hist):
+    summary = {f'p{int(q * 100)}': _round(hist.quantile(q)) for q in QUANTILES}
+    summary['avg'] = _round(hist.sum / hist.count) if hist.count else None
+    return summary
+
+
+def _round(value):
+    return None if value is None else round(value, 3)
+
+
+def _label(value):
+    return value.replace('\\', '\\\\').replace('"', '\\"')
+
+
+registry = MetricsRegistry()
+
+
+class RequestSample:
+    """Tek bir isteğin SQL ve şablon ölçümleri."""
+
+    def __init__(self):
+        self.queries = 0
+        self.sql_ms = 0.0
+        self.template_ms = 0.0
+        self.slowest_sql = None
+        self.slowest_sql_ms = 0.0
+
+    def __call__(self, execute, sql, params, many, context):
+        # connection.execute_wrapper kancası; DEBUG gerektirmez
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = (time.perf_counter() - started) * 1000
+            self.queries += 1
+            self.sql_ms += elapsed
+            if elapsed > self.slowest_sql_ms:
+                self.slowest_sql_ms = elapsed
+                self.slowest_sql = sql[:SLOW_SQL_MAX_LENGTH]
+
+
+class RequestMetricsMiddleware:
+    """Görünüm adına göre istek, SQL ve şablon sürelerini toplar.
+
+    ``CUSTOMERS_METRICS_ENABLED = True`` ile açılır; kapalıyken middleware
+    zincirden tamamen çıkar.
+    """
+
+    def __init__(self, get_response):
+        if not getattr(settings, 'CUSTOMERS_METRICS_ENABLED', False):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+
+    def __call__(self, request):
+        sample = RequestSample()
+        token = _current.set(sample)
+        started = time.perf_counter()
+        try:
+            with ExitStack() as stack:
+                for connection in connections.all():
+                    stack.enter_context(connection.execute_wrapper(sample))
+                response = self.get_response(request)
+        finally:
+            _current.reset(token)
+        elapsed = (time.perf_counter() - started) * 1000
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match else 'unresolved'
+        registry.record(view, elapsed, sample)
+        return response
+
+
+class _TimedTemplate:
+    def __init__(self, template):
+        self.template = template
+
+    def __getattr__(self, name):
+        return getattr(self.template, name)
+
+    def render(self, context=None, request=None):
+        sample = _current.get()
+        if sample is None:
+            return self.template.render(context, request)
+        started = time.perf_counter()
+        try:
+            return self.template.render(context, request)
+        finally:
+            sample.template_ms += (time.perf_counter() - started) * 1000
+
+
+class InstrumentedDjangoTemplates(DjangoTemplates):
+    """Render süresini ölçen DjangoTemplates; ölçüm yalnızca middleware açıkken yapılır."""
+
+    def from_string(self, template_code):
+        return _TimedTemplate(super().from_string(template_code))
+
+    def get_template(self, template_name):
+        return _TimedTemplate(super().get_template(template_name))
@@ -0,0 +1,27 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:23
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0002_customer_created_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='DashboardCounter',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('name', models.CharField(max_length=100, unique=True, verbose_name='Sayaç')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Adet')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Tutar')),
+                ('updated_at', models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')),
+            ],
+            options={
+                'verbose_name': 'Dashboard Sayacı',
+                'verbose_name_plural': 'Dashboard Sayaçları',
+            },
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:25
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0003_dashboardcounter'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['company_name'], name='customer_company_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['created_at'], name='customer_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='domain',
+            index=models.Index(fields=['is_active', 'expiration_date'], name='domain_active_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='domain',
+            index=models.Index(fields=['expiration_date'], name='domain_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='domain',
+            index=models.Index(fields=['name'], name='domain_name_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hostingservice',
+            index=models.Index(fields=['status', 'expiration_date'], name='hosting_status_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='hostingservice',
+            index=models.Index(fields=['expiration_date'], name='hosting_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['payment_status', 'due_date'], name='invoice_status_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(condition=models.Q(('payment_status', 'pending')), fields=['due_date'], name='invoice_pending_due_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['issue_date'], name='invoice_issue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='invoice',
+            index=models.Index(fields=['customer', 'issue_date'], name='invoice_customer_issue_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sslcertificate',
+            index=models.Index(fields=['is_active', 'expiration_date'], name='ssl_active_exp_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='sslcertificate',
+            index=models.Index(fields=['expiration_date'], name='ssl_exp_idx'),
+        ),
+    ]
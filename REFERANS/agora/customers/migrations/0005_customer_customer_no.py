@@ -0,0 +1,18 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0004_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='customer_no',
+            field=models.PositiveIntegerField(blank=True, null=True, unique=True, verbose_name='Müşteri No'),
+        ),
+    ]
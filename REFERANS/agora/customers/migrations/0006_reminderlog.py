@@ -0,0 +1,34 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:40
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0005_customer_customer_no'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ReminderLog',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service_type', models.CharField(choices=[('hosting', 'Hosting'), ('domain', 'Domain'), ('ssl', 'SSL')], max_length=10, verbose_name='Hizmet Türü')),
+                ('object_id', models.BigIntegerField(verbose_name='Kayıt No')),
+                ('expiration_date', models.DateField(verbose_name='Bitiş Tarihi')),
+                ('recipients', models.TextField(verbose_name='Alıcılar')),
+                ('sent_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Gönderilme Tarihi')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='customers.customer', verbose_name='Müşteri')),
+            ],
+            options={
+                'verbose_name': 'Hatırlatma Kaydı',
+                'verbose_name_plural': 'Hatırlatma Kayıtları',
+                'ordering': ['-sent_at'],
+                'indexes': [models.Index(fields=['expiration_date'], name='reminder_exp_idx')],
+                'constraints': [models.UniqueConstraint(fields=('service_type', 'object_id', 'expiration_date'), name='reminder_unique_service_exp')],
+            },
+        ),
+    ]
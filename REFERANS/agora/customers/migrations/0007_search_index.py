@@ -0,0 +1,90 @@
+import unicodedata
+
+from django.db import migrations
+
+# customers.search tarafından kullanılan tam metin index tablosu.
+# SQLite: FTS5 sanal tablosu; PostgreSQL: tsvector sütunu + GIN index.
+# Diğer veritabanlarında tablo oluşturulmaz, arama icontains'e düşer.
+
+
+def create_index_table(apps, schema_editor):
+    vendor = schema_editor.connection.vendor
+    if vendor == 'sqlite':
+        schema_editor.execute(
+            'CREATE VIRTUAL TABLE customers_search USING fts5('
+            'kind UNINDEXED, object_id UNINDEXED, customer_id UNINDEXED, title UNINDEXED, body, '
+            "tokenize = 'unicode61 remove_diacritics 2', prefix = '2 3')"
+        )
+    elif vendor == 'postgresql':
+        schema_editor.execute(
+            'CREATE TABLE customers_search ('
+            'id bigint PRIMARY KEY, kind varchar(10) NOT NULL, object_id bigint NOT NULL, '
+            'customer_id bigint, title text NOT NULL, body text NOT NULL, '
+            "document tsvector GENERATED ALWAYS AS (to_tsvector('simple', body)) STORED)"
+        )
+        schema_editor.execute('CREATE INDEX customers_search_document_idx ON customers_search USING gin (document)')
+    else:
+        return
+    populate(apps, schema_editor)
+
+
+# customers.search'in bu migration anındaki satır biçimi: id = object_id * STRIDE + tür kodu
+STRIDE = 4
+BATCH_SIZE = 2000
+_ASCII = str.maketrans('çğıöşü', 'cgiosu')
+
+
+def fold(text):
+    if not text:
+        return ''
+    text = str(text).replace('İ', 'i').replace('I', 'ı').lower().translate(_ASCII)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def _documents(apps):
+    # (tür kodu, tür, model, satır -> (başlık, parçalar, müşteri))
+    yield 0, 'customer', apps.get_model('customers', 'Customer'), lambda obj: (
+        obj.company_name,
+        [obj.company_name, obj.contact_name, obj.email, obj.email2, obj.email3, obj.tax_number, obj.customer_no],
+        obj.pk,
+    )
+    yield 1, 'domain', apps.get_model('customers', 'Domain'), lambda obj: (obj.name, [obj.name], obj.customer_id)
+    yield 2, 'invoice', apps.get_model('customers', 'Invoice'), lambda obj: (
+        obj.invoice_number, [obj.invoice_number, obj.description], obj.customer_id,
+    )
+
+
+def populate(apps, schema_editor):
+    connection = schema_editor.connection
+    key = 'rowid' if connection.vendor == 'sqlite' else 'id'
+    sql = f'INSERT INTO customers_search ({key}, kind, object_id, customer_id, title, body) VALUES (%s, %s, %s, %s, %s, %s)'
+    for code, kind, model, document in _documents(apps):
+        rows = []
+        for obj in model._base_manager.using(connection.alias).order_by().iterator(chunk_size=BATCH_SIZE):
+            title, parts, customer_id = document(obj)
+            body = ' '.join(fold(part) for part in parts if part not in (None, ''))
+            rows.append((obj.pk * STRIDE + code, kind, obj.pk, customer_id, title, body))
+            if len(rows) >= BATCH_SIZE:
+                with connection.cursor() as cursor:
+                    cursor.executemany(sql, rows)
+                rows = []
+        if rows:
+            with connection.cursor() as cursor:
+                cursor.executemany(sql, rows)
+
+
+def drop_index_table(apps, schema_editor):
+    if schema_editor.connection.vendor in ('sqlite', 'postgresql'):
+        schema_editor.execute('DROP TABLE IF EXISTS customers_search')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0006_reminderlog'),
+    ]
+
+    operations = [
+        migrations.RunPython(create_index_table, drop_index_table),
+    ]
@@ -0,0 +1,44 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:56
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0007_search_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='InvoiceSequence',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('prefix', models.CharField(max_length=30, unique=True, verbose_name='Önek')),
+                ('last_value', models.BigIntegerField(default=0, verbose_name='Son Numara')),
+            ],
+            options={
+                'verbose_name': 'Fatura Numarası Sayacı',
+                'verbose_name_plural': 'Fatura Numarası Sayaçları',
+            },
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='service_expiration',
+            field=models.DateField(blank=True, null=True, verbose_name='Hizmet Bitiş Tarihi'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='service_id',
+            field=models.BigIntegerField(blank=True, null=True, verbose_name='Hizmet No'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='service_type',
+            field=models.CharField(blank=True, choices=[('hosting', 'Hosting'), ('domain', 'Domain'), ('ssl', 'SSL')], max_length=10, null=True, verbose_name='Hizmet Türü'),
+        ),
+        migrations.AddConstraint(
+            model_name='invoice',
+            constraint=models.UniqueConstraint(condition=models.Q(('service_type__isnull', False)), fields=('service_type', 'service_id', 'service_expiration'), name='invoice_unique_renewal'),
+        ),
+    ]
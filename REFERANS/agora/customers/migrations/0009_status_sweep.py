@@ -0,0 +1,37 @@
+# Generated by Django 5.1.4 on 2026-10-18 12:58
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0008_renewal_invoices'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='hostingservice',
+            name='status',
+            field=models.CharField(choices=[('active', 'Aktif'), ('suspended', 'Askıya Alındı'), ('cancelled', 'İptal Edildi'), ('expired', 'Süresi Doldu')], max_length=20, verbose_name='Durum'),
+        ),
+        migrations.CreateModel(
+            name='SweepRun',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('ran_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Çalışma Zamanı')),
+                ('as_of', models.DateField(verbose_name='Tarih')),
+                ('overdue_invoices', models.IntegerField(default=0, verbose_name='Gecikmiş Faturalar')),
+                ('reopened_invoices', models.IntegerField(default=0, verbose_name='Beklemeye Dönen Faturalar')),
+                ('expired_hosting', models.IntegerField(default=0, verbose_name='Süresi Dolan Hostingler')),
+                ('reactivated_hosting', models.IntegerField(default=0, verbose_name='Yeniden Aktif Hostingler')),
+            ],
+            options={
+                'verbose_name': 'Durum Taraması',
+                'verbose_name_plural': 'Durum Taramaları',
+                'ordering': ['-ran_at'],
+                'indexes': [models.Index(fields=['ran_at'], name='sweep_ran_at_idx')],
+            },
+        ),
+    ]
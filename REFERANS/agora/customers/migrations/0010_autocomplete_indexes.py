@@ -0,0 +1,22 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:02
+
+import django.db.models.functions.text
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0009_status_sweep'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(django.db.models.functions.text.Lower('company_name'), name='customer_company_lower_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='domain',
+            index=models.Index(django.db.models.functions.text.Lower('name'), name='domain_name_lower_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:06
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0010_autocomplete_indexes'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='hostingservice',
+            index=models.Index(fields=['start_date'], name='hosting_start_idx'),
+        ),
+    ]
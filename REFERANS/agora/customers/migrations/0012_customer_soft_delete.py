@@ -0,0 +1,51 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:09
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0011_hosting_start_index'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='PurgeJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('customer_id', models.PositiveIntegerField(verbose_name='Müşteri ID')),
+                ('company_name', models.CharField(max_length=200, verbose_name='Firma Adı')),
+                ('status', models.CharField(choices=[('pending', 'Bekliyor'), ('running', 'Çalışıyor'), ('done', 'Tamamlandı'), ('failed', 'Hata')], default='pending', max_length=20, verbose_name='Durum')),
+                ('requested_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='İstenme Zamanı')),
+                ('started_at', models.DateTimeField(blank=True, null=True, verbose_name='Başlama Zamanı')),
+                ('finished_at', models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Zamanı')),
+                ('total_rows', models.IntegerField(blank=True, null=True, verbose_name='Toplam Kayıt')),
+                ('deleted_ssl', models.IntegerField(default=0, verbose_name='Silinen SSL')),
+                ('deleted_hosting', models.IntegerField(default=0, verbose_name='Silinen Hosting')),
+                ('deleted_reminders', models.IntegerField(default=0, verbose_name='Silinen Hatırlatmalar')),
+                ('deleted_invoices', models.IntegerField(default=0, verbose_name='Silinen Faturalar')),
+                ('deleted_domains', models.IntegerField(default=0, verbose_name='Silinen Domainler')),
+                ('last_error', models.TextField(blank=True, verbose_name='Son Hata')),
+            ],
+            options={
+                'verbose_name': 'Silme İşi',
+                'verbose_name_plural': 'Silme İşleri',
+                'ordering': ['-requested_at'],
+            },
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='deleted_at',
+            field=models.DateTimeField(blank=True, editable=False, null=True, verbose_name='Silinme Zamanı'),
+        ),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(condition=models.Q(('deleted_at__isnull', False)), fields=['deleted_at'], name='customer_deleted_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='purgejob',
+            index=models.Index(fields=['status', 'requested_at'], name='purge_status_idx'),
+        ),
+    ]
@@ -0,0 +1,79 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:15
+
+import django.utils.timezone
+from django.db import migrations, models
+
+
+def seed_events(apps, schema_editor):
+    # Mevcut her kayıt için bir olay: since=0 tam bir başlangıç kopyası verir.
+    # Tablo başına tek INSERT ... SELECT; kaynak adları api/<kaynak>/ ile aynıdır.
+    connection = schema_editor.connection
+    quote = connection.ops.quote_name
+    changed_at = connection.ops.adapt_datetimefield_value(django.utils.timezone.now())
+    table = quote(apps.get_model('customers', 'ChangeEvent')._meta.db_table)
+    sources = {
+        'customers': ('Customer', 'WHERE deleted_at IS NULL'),
+        'domains': ('Domain', ''),
+        'hosting': ('HostingService', ''),
+        'ssl': ('SSLCertificate', ''),
+        'invoices': ('Invoice', ''),
+    }
+    with connection.cursor() as cursor:
+        for resource, (name, where) in sources.items():
+            source = quote(apps.get_model('customers', name)._meta.db_table)
+            cursor.execute(
+                f'INSERT INTO {table} (resource, object_id, deleted, changed_at) '
+                f'SELECT %s, id, %s, %s FROM {source} {where} ORDER BY id',
+                [resource, False, changed_at],
+            )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0012_customer_soft_delete'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='customer',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı'),
+        ),
+        migrations.AddField(
+            model_name='domain',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı'),
+        ),
+        migrations.AddField(
+            model_name='hostingservice',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı'),
+        ),
+        migrations.AddField(
+            model_name='invoice',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı'),
+        ),
+        migrations.AddField(
+            model_name='sslcertificate',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı'),
+        ),
+        migrations.CreateModel(
+            name='ChangeEvent',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('resource', models.CharField(max_length=20, verbose_name='Kaynak')),
+                ('object_id', models.PositiveIntegerField(verbose_name='Kayıt No')),
+                ('deleted', models.BooleanField(default=False, verbose_name='Silindi mi?')),
+                ('changed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Değişiklik Zamanı')),
+            ],
+            options={
+                'verbose_name': 'Değişiklik',
+                'verbose_name_plural': 'Değişiklikler',
+                'indexes': [models.Index(fields=['resource', 'object_id'], name='change_object_idx')],
+            },
+        ),
+        migrations.RunPython(seed_events, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,59 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:18
+
+from decimal import Decimal
+
+from django.db import migrations, models
+from django.db.models import Count, F, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+
+
+def populate(apps, schema_editor):
+    # Özetler faturalardan bir kez hesaplanır (customers.revenue.compute_rollups ile aynı gruplar)
+    db = schema_editor.connection.alias
+    invoices = apps.get_model('customers', 'Invoice').objects.using(db)
+    RevenueRollup = apps.get_model('customers', 'RevenueRollup')
+    queries = {
+        'billed': invoices.annotate(period=TruncMonth('issue_date'), method=Value('')),
+        'collected': invoices.filter(payment_status='paid').annotate(
+            paid_on=Coalesce('payment_date', 'issue_date'),
+            period=TruncMonth('paid_on'),
+            method=Coalesce('payment_method', Value('')),
+        ),
+        'open': invoices.exclude(payment_status='paid').annotate(period=F('due_date'), method=Value('')),
+    }
+    rollups = []
+    for kind, queryset in queries.items():
+        rows = queryset.values('period', 'method').annotate(count=Count('id'), amount=Sum('amount')).order_by()
+        for row in rows:
+            rollups.append(RevenueRollup(
+                kind=kind, period=row['period'], payment_method=row['method'], count=row['count'],
+                amount=(row['amount'] or Decimal('0')).quantize(Decimal('0.01')),
+            ))
+    RevenueRollup.objects.using(db).bulk_create(rollups, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0013_change_feed'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='RevenueRollup',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('kind', models.CharField(choices=[('billed', 'Faturalanan'), ('collected', 'Tahsil Edilen'), ('open', 'Açık Alacak')], max_length=10, verbose_name='Tür')),
+                ('period', models.DateField(verbose_name='Dönem')),
+                ('payment_method', models.CharField(blank=True, default='', max_length=20, verbose_name='Ödeme Yöntemi')),
+                ('count', models.BigIntegerField(default=0, verbose_name='Adet')),
+                ('amount', models.DecimalField(decimal_places=2, default=0, max_digits=14, verbose_name='Tutar')),
+            ],
+            options={
+                'verbose_name': 'Gelir Özeti',
+                'verbose_name_plural': 'Gelir Özetleri',
+                'constraints': [models.UniqueConstraint(fields=('kind', 'period', 'payment_method'), name='revenue_rollup_unique')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,38 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:21
+
+import django.db.models.deletion
+import django.utils.timezone
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0014_revenue_rollup'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='purgejob',
+            name='deleted_renewals',
+            field=models.IntegerField(default=0, verbose_name='Silinen Yenileme Kayıtları'),
+        ),
+        migrations.CreateModel(
+            name='Renewal',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('service_type', models.CharField(choices=[('hosting', 'Hosting'), ('domain', 'Domain'), ('ssl', 'SSL')], max_length=10, verbose_name='Hizmet Türü')),
+                ('object_id', models.BigIntegerField(verbose_name='Kayıt No')),
+                ('previous_expiration', models.DateField(blank=True, null=True, verbose_name='Önceki Bitiş Tarihi')),
+                ('new_expiration', models.DateField(blank=True, null=True, verbose_name='Yeni Bitiş Tarihi')),
+                ('renewed_at', models.DateTimeField(default=django.utils.timezone.now, verbose_name='Yenilenme Zamanı')),
+                ('customer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, to='customers.customer', verbose_name='Müşteri')),
+            ],
+            options={
+                'verbose_name': 'Yenileme',
+                'verbose_name_plural': 'Yenilemeler',
+                'ordering': ['-renewed_at'],
+                'constraints': [models.UniqueConstraint(fields=('service_type', 'object_id', 'renewed_at'), name='renewal_unique_service_time')],
+            },
+        ),
+    ]
@@ -0,0 +1,74 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:25
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+BATCH_SIZE = 500
+FIELDS = ('nameserver1', 'nameserver2', 'nameserver3', 'nameserver4')
+
+
+def populate(apps, schema_editor):
+    # nameserver1-4 alanlarından bağlantılar (customers.nameservers.normalize ile aynı biçim)
+    db = schema_editor.connection.alias
+    Domain = apps.get_model('customers', 'Domain')
+    Nameserver = apps.get_model('customers', 'Nameserver')
+    DomainNameserver = apps.get_model('customers', 'DomainNameserver')
+    last = 0
+    while True:
+        rows = list(Domain.objects.using(db).filter(pk__gt=last).order_by('pk').values_list('pk', *FIELDS)[:BATCH_SIZE])
+        if not rows:
+            break
+        pairs = [
+            (row[0], position, name)
+            for row in rows
+            for position, name in enumerate(((value or '').strip().lower().rstrip('.') for value in row[1:]), start=1)
+            if name
+        ]
+        names = {name for _, _, name in pairs}
+        Nameserver.objects.using(db).bulk_create(
+            [Nameserver(hostname=name) for name in names], ignore_conflicts=True, batch_size=BATCH_SIZE,
+        )
+        ids = dict(Nameserver.objects.using(db).filter(hostname__in=names).values_list('hostname', 'pk'))
+        DomainNameserver.objects.using(db).bulk_create(
+            [DomainNameserver(domain_id=pk, nameserver_id=ids[name], position=position) for pk, position, name in pairs],
+            batch_size=BATCH_SIZE,
+        )
+        last = rows[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0015_renewal_history'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Nameserver',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('hostname', models.CharField(max_length=200, unique=True, verbose_name='Nameserver')),
+            ],
+            options={
+                'verbose_name': 'Nameserver',
+                'verbose_name_plural': 'Nameserverlar',
+            },
+        ),
+        migrations.CreateModel(
+            name='DomainNameserver',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('position', models.PositiveSmallIntegerField(verbose_name='Sıra')),
+                ('domain', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='nameserver_links', to='customers.domain', verbose_name='Domain')),
+                ('nameserver', models.ForeignKey(db_index=False, on_delete=django.db.models.deletion.CASCADE, related_name='domain_links', to='customers.nameserver', verbose_name='Nameserver')),
+            ],
+            options={
+                'verbose_name': 'Domain Nameserver',
+                'verbose_name_plural': 'Domain Nameserverları',
+                'indexes': [models.Index(fields=['nameserver', 'domain'], name='nameserver_domain_idx')],
+                'constraints': [models.UniqueConstraint(fields=('domain', 'position'), name='domain_nameserver_unique_position')],
+            },
+        ),
+        migrations.RunPython(populate, migrations.RunPython.noop),
+    ]
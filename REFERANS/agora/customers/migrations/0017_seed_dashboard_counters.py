@@ -0,0 +1,61 @@
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Q, Sum
+
+
+def seed(apps, schema_editor):
+    # Dashboard isteği sayaç yazmaz; eksik sayaçlar burada bir kez canlı verilerden doldurulur.
+    # Var olan satırlara dokunulmaz (artımlı güncellenmişlerdir), yalnızca eksik adlar eklenir.
+    # Hesap stats.compute_counters ile aynıdır (silinmiş müşterilerin kayıtları sayılmaz), ancak
+    # tarihsel modellerle ve burada tutulur.
+    db = schema_editor.connection.alias
+    DashboardCounter = apps.get_model('customers', 'DashboardCounter')
+    zero, cent = Decimal('0'), Decimal('0.01')
+    live_owner = Q(customer__deleted_at__isnull=True)
+    counters = {
+        'customer.total': (
+            apps.get_model('customers', 'Customer').objects.using(db).filter(deleted_at__isnull=True).count(), zero,
+        ),
+    }
+
+    hosting_total = 0
+    rows = apps.get_model('customers', 'HostingService').objects.using(db).filter(live_owner)
+    for row in rows.values('status').annotate(count=Count('id')).order_by():
+        counters[f"hosting.status.{row['status']}"] = (row['count'], zero)
+        hosting_total += row['count']
+    counters['hosting.total'] = (hosting_total, zero)
+
+    for prefix, name in (('domain', 'Domain'), ('ssl', 'SSLCertificate')):
+        row = apps.get_model('customers', name).objects.using(db).filter(live_owner).aggregate(
+            total=Count('id'), active=Count('id', filter=Q(is_active=True)),
+        )
+        counters[f'{prefix}.total'] = (row['total'], zero)
+        counters[f'{prefix}.active'] = (row['active'], zero)
+
+    invoice_count, invoice_amount = 0, zero
+    rows = apps.get_model('customers', 'Invoice').objects.using(db).filter(live_owner)
+    for row in rows.values('payment_status').annotate(count=Count('id'), amount=Sum('amount')).order_by():
+        amount = (row['amount'] or zero).quantize(cent)
+        counters[f"invoice.status.{row['payment_status']}"] = (row['count'], amount)
+        invoice_count += row['count']
+        invoice_amount += amount
+    counters['invoice.total'] = (invoice_count, invoice_amount)
+
+    existing = set(DashboardCounter.objects.using(db).values_list('name', flat=True))
+    DashboardCounter.objects.using(db).bulk_create([
+        DashboardCounter(name=name, count=count, amount=amount)
+        for name, (count, amount) in counters.items()
+        if name not in existing
+    ])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0016_nameserver_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(seed, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,71 @@
+# Generated by Django 5.1.4 on 2026-10-18 13:51
+
+import unicodedata
+
+import customers.models
+from django.db import migrations, models
+
+BATCH_SIZE = 2000
+_ASCII = str.maketrans('çğıöşü', 'cgiosu')
+
+
+def fold(text):
+    # customers.text.fold'un bu migration anındaki kopyası
+    if not text:
+        return ''
+    text = str(text).replace('İ', 'i').replace('I', 'ı').lower().translate(_ASCII)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
+
+
+def fill_keys(apps, schema_editor):
+    db = schema_editor.connection.alias
+    for name, source, key in (('Customer', 'company_name', 'company_name_key'), ('Domain', 'name', 'name_key')):
+        model = apps.get_model('customers', name)
+        rows = model._base_manager.using(db).order_by('pk').values_list('pk', source)
+        last = 0
+        while True:
+            batch = list(rows.filter(pk__gt=last)[:BATCH_SIZE])
+            if not batch:
+                break
+            model._base_manager.using(db).bulk_update(
+                [model(pk=pk, **{key: fold(value)}) for pk, value in batch], [key],
+            )
+            last = batch[-1][0]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0017_seed_dashboard_counters'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='customer',
+            name='customer_company_lower_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='domain',
+            name='domain_name_lower_idx',
+        ),
+        migrations.AddField(
+            model_name='customer',
+            name='company_name_key',
+            field=customers.models.FoldedKeyField(default='', editable=False, max_length=200, source='company_name', verbose_name='Firma Adı (arama)'),
+        ),
+        migrations.AddField(
+            model_name='domain',
+            name='name_key',
+            field=customers.models.FoldedKeyField(default='', editable=False, max_length=200, source='name', verbose_name='Domain Adı (arama)'),
+        ),
+        migrations.RunPython(fill_keys, migrations.RunPython.noop),
+        migrations.AddIndex(
+            model_name='customer',
+            index=models.Index(fields=['company_name_key'], name='customer_company_key_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='domain',
+            index=models.Index(fields=['name_key'], name='domain_name_key_idx'),
+        ),
+    ]
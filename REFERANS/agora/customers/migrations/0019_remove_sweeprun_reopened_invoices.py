@@ -0,0 +1,17 @@
+# Generated by Django 5.1.4 on 2026-10-18 14:28
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('customers', '0018_folded_name_keys'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='sweeprun',
+            name='reopened_invoices',
+        ),
+    ]
@@ -1,8 +1,51 @@
 from django.db import models
 from django.utils import timezone
 
+from .text import fold
+
+# Yenileme hatırlatmaları ve yenileme faturalarının bağlı olduğu hizmet türleri
+SERVICE_TYPES = [
+    ('hosting', 'Hosting'),
+    ('domain', 'Domain'),
+    ('ssl', 'SSL'),
+]
+
+class FoldedKeyField(models.CharField):
+    """``source`` alanının Türkçe katlanmış hali (``text.fold``); otomatik tamamlama bu sütunda aranır.
+
+    SQLite ``lower()`` yalnızca ASCII harfleri küçültür; katlama Python'da yapılıp saklanır.
+    Değer ``save()`` ve ``bulk_create`` sırasında hesaplanır; ``bulk_update`` ve
+    ``QuerySet.update`` ile kaynak alanı değiştiren kod bu alanı da yazmalıdır.
+    """
+
+    def __init__(self, *args, source=None, **kwargs):
+        self.source = source
+        kwargs.setdefault('max_length', 200)
+        kwargs.setdefault('editable', False)
+        kwargs.setdefault('default', '')
+        super().__init__(*args, **kwargs)
+
+    def deconstruct(self):
+        name, path, args, kwargs = super().deconstruct()
+        kwargs['source'] = self.source
+        return name, path, args, kwargs
+
+    def pre_save(self, model_instance, add):
+        value = fold(getattr(model_instance, self.source))
+        setattr(model_instance, self.attname, value)
+        return value
+
+
+class CustomerManager(models.Manager):
+    # Silinmek üzere işaretlenen müşteriler (deleted_at dolu) gizlenir; tümü için Customer.all_objects
+    def get_queryset(self):
+        return super().get_queryset().filter(deleted_at__isnull=True)
+
+
 class Customer(models.Model):
+    customer_no = models.PositiveIntegerField(unique=True, blank=True, null=True, verbose_name='Müşteri No')
     company_name = models.CharField(max_length=200, verbose_name='Firma Adı')
+    company_name_key = FoldedKeyField(source='company_name', verbose_name='Firma Adı (arama)')
     contact_name = models.CharField(max_length=200, verbose_name='İletişim Kişisi')
     email = models.EmailField(verbose_name='E-posta')
     email2 = models.EmailField(verbose_name='E-posta 2', blank=True, null=True)
@@ -14,17 +57,32 @@ class Customer(models.Model):
     registration_date = models.DateField(verbose_name='Kayıt Tarihi')
     notes = models.TextField(blank=True, null=True, verbose_name='Notlar')
     created_at = models.DateTimeField(default=timezone.now, verbose_name='Oluşturulma Tarihi')
-    
+    # Doluysa müşteri silinmiştir; ilişkili kayıtları PurgeJob arka planda temizler
+    deleted_at = models.DateTimeField(blank=True, null=True, editable=False, verbose_name='Silinme Zamanı')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı')
+
+    objects = CustomerManager()
+    all_objects = models.Manager()
+
     def __str__(self):
         return self.company_name
 
     class Meta:
         verbose_name = 'Müşteri'
         verbose_name_plural = 'Müşteriler'
+        indexes = [
+            models.Index(fields=['company_name'], name='customer_company_idx'),
+            # Otomatik tamamlama: katlanmış ad üzerinde önek aralığı
+            models.Index(fields=['company_name_key'], name='customer_company_key_idx'),
+            models.Index(fields=['created_at'], name='customer_created_idx'),
+            # Yalnızca silinmiş satırlar; temizlenmeyi bekleyen müşteriler
+            models.Index(fields=['deleted_at'], name='customer_deleted_idx', condition=models.Q(deleted_at__isnull=False)),
+        ]
 
 class Domain(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, verbose_name='Müşteri')
     name = models.CharField(max_length=200, verbose_name='Domain Adı')
+    name_key = FoldedKeyField(source='name', verbose_name='Domain Adı (arama)')
     registration_date = models.DateField(verbose_name='Kayıt Tarihi')
     expiration_date = models.DateField(verbose_name='Bitiş Tarihi')
     is_active = models.BooleanField(default=True, verbose_name='Aktif mi?')
@@ -32,6 +90,7 @@ class Domain(models.Model):
     nameserver2 = models.CharField(max_length=200, verbose_name='Nameserver 2')
     nameserver3 = models.CharField(max_length=200, blank=True, null=True, verbose_name='Nameserver 3')
     nameserver4 = models.CharField(max_length=200, blank=True, null=True, verbose_name='Nameserver 4')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı')
 
     def __str__(self):
         return self.name
@@ -39,6 +98,49 @@ class Domain(models.Model):
     class Meta:
         verbose_name = 'Domain'
         verbose_name_plural = 'Domainler'
+        indexes = [
+            models.Index(fields=['is_active', 'expiration_date'], name='domain_active_exp_idx'),
+            models.Index(fields=['expiration_date'], name='domain_exp_idx'),
+            models.Index(fields=['name'], name='domain_name_idx'),
+            models.Index(fields=['name_key'], name='domain_name_key_idx'),
+        ]
+
+class Nameserver(models.Model):
+    # nameserver1-4 alanlarındaki adların normalize edilmiş hali (küçük harf, sondaki nokta yok)
+    hostname = models.CharField(max_length=200, unique=True, verbose_name='Nameserver')
+
+    def __str__(self):
+        return self.hostname
+
+    class Meta:
+        verbose_name = 'Nameserver'
+        verbose_name_plural = 'Nameserverlar'
+
+class DomainNameserver(models.Model):
+    # Domain -> nameserver bağlantısı (customers.nameservers ile nameserver1-4 alanlarından eşitlenir);
+    # ters arama (nameserver, domain) index'inde bir aralık okumasıdır
+    # Tek sütunlu index'ler gerekmez: unique (domain, position) ve (nameserver, domain) önde bu sütunları taşır
+    domain = models.ForeignKey(
+        Domain, on_delete=models.CASCADE, related_name='nameserver_links', db_index=False, verbose_name='Domain',
+    )
+    nameserver = models.ForeignKey(
+        Nameserver, on_delete=models.CASCADE, related_name='domain_links', db_index=False,
+        verbose_name='Nameserver',
+    )
+    position = models.PositiveSmallIntegerField(verbose_name='Sıra')
+
+    def __str__(self):
+        return f"{self.domain_id} #{self.position}: {self.nameserver_id}"
+
+    class Meta:
+        verbose_name = 'Domain Nameserver'
+        verbose_name_plural = 'Domain Nameserverları'
+        constraints = [
+            models.UniqueConstraint(fields=['domain', 'position'], name='domain_nameserver_unique_position'),
+        ]
+        indexes = [
+            models.Index(fields=['nameserver', 'domain'], name='nameserver_domain_idx'),
+        ]
 
 class HostingService(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, verbose_name='Müşteri')
@@ -47,12 +149,14 @@ class HostingService(models.Model):
     status = models.CharField(max_length=20, choices=[
         ('active', 'Aktif'),
         ('suspended', 'Askıya Alındı'),
-        ('cancelled', 'İptal Edildi')
+        ('cancelled', 'İptal Edildi'),
+        ('expired', 'Süresi Doldu'),
     ], verbose_name='Durum')
     start_date = models.DateField(verbose_name='Başlangıç Tarihi')
     expiration_date = models.DateField(verbose_name='Bitiş Tarihi')
     renewal_count = models.IntegerField(default=0, verbose_name='Yenileme Sayısı')
     notes = models.TextField(blank=True, null=True, verbose_name='Notlar')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı')
 
     def __str__(self):
         return f"{self.domain.name} - {self.customer.company_name}"
@@ -60,6 +164,12 @@ class HostingService(models.Model):
     class Meta:
         verbose_name = 'Hosting Hizmeti'
         verbose_name_plural = 'Hosting Hizmetleri'
+        indexes = [
+            models.Index(fields=['status', 'expiration_date'], name='hosting_status_exp_idx'),
+            models.Index(fields=['expiration_date'], name='hosting_exp_idx'),
+            # admin date_hierarchy
+            models.Index(fields=['start_date'], name='hosting_start_idx'),
+        ]
 
 class SSLCertificate(models.Model):
     customer = models.ForeignKey(Customer, on_delete=models.CASCADE, verbose_name='Müşteri')
@@ -67,6 +177,7 @@ class SSLCertificate(models.Model):
     start_date = models.DateField(verbose_name='Başlangıç Tarihi')
     expiration_date = models.DateField(verbose_name='Bitiş Tarihi')
     is_active = models.BooleanField(default=True, verbose_name='Aktif mi?')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı')
 
     def __str__(self):
         return f"{self.domain.name} SSL"
@@ -74,6 +185,10 @@ class SSLCertificate(models.Model):
     class Meta:
         verbose_name = 'SSL Sertifikası'
         verbose_name_plural = 'SSL Sertifikaları'
+        indexes = [
+            models.Index(fields=['is_active', 'expiration_date'], name='ssl_active_exp_idx'),
+            models.Index(fields=['expiration_date'], name='ssl_exp_idx'),
+        ]
 
 class Invoice(models.Model):
     PAYMENT_STATUS = [
@@ -99,6 +214,11 @@ class Invoice(models.Model):
     payment_method = models.CharField(max_length=20, choices=PAYMENT_METHODS, null=True, blank=True, verbose_name='Ödeme Yöntemi')
     payment_notes = models.TextField(blank=True, null=True, verbose_name='Ödeme Notları')
     notes = models.TextField(blank=True, null=True, verbose_name='Notlar')
+    # Yenileme faturası ise faturalanan hizmet ve o dönemin bitiş tarihi (elle girilenlerde boş)
+    service_type = models.CharField(max_length=10, choices=SERVICE_TYPES, null=True, blank=True, verbose_name='Hizmet Türü')
+    service_id = models.BigIntegerField(null=True, blank=True, verbose_name='Hizmet No')
+    service_expiration = models.DateField(null=True, blank=True, verbose_name='Hizmet Bitiş Tarihi')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Zamanı')
 
     def __str__(self):
         return f"{self.invoice_number} - {self.customer.company_name}"
@@ -106,3 +226,202 @@ class Invoice(models.Model):
     class Meta:
         verbose_name = 'Fatura'
         verbose_name_plural = 'Faturalar'
+        indexes = [
+            models.Index(fields=['payment_status', 'due_date'], name='invoice_status_due_idx'),
+            models.Index(
+                fields=['due_date'], name='invoice_pending_due_idx',
+                condition=models.Q(payment_status='pending'),
+            ),
+            models.Index(fields=['issue_date'], name='invoice_issue_idx'),
+            models.Index(fields=['customer', 'issue_date'], name='invoice_customer_issue_idx'),
+        ]
+        constraints = [
+            # Bir hizmetin bir dönemi için tek yenileme faturası; toplu iş tekrar çalışınca çift kesilmez
+            models.UniqueConstraint(
+                fields=['service_type', 'service_id', 'service_expiration'], name='invoice_unique_renewal',
+                condition=models.Q(service_type__isnull=False),
+            ),
+        ]
+
+class InvoiceSequence(models.Model):
+    # Fatura numarası sayaçları (önek başına bir satır). Numaralar blok halinde, tek UPDATE ile ayrılır
+    prefix = models.CharField(max_length=30, unique=True, verbose_name='Önek')
+    last_value = models.BigIntegerField(default=0, verbose_name='Son Numara')
+
+    def __str__(self):
+        return f"{self.prefix}{self.last_value}"
+
+    class Meta:
+        verbose_name = 'Fatura Numarası Sayacı'
+        verbose_name_plural = 'Fatura Numarası Sayaçları'
+
+class DashboardCounter(models.Model):
+    # Dashboard sayaçlarının önceden hesaplanmış hali; sinyallerle artımlı güncellenir
+    name = models.CharField(max_length=100, unique=True, verbose_name='Sayaç')
+    count = models.BigIntegerField(default=0, verbose_name='Adet')
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Tutar')
+    updated_at = models.DateTimeField(auto_now=True, verbose_name='Güncellenme Tarihi')
+
+    def __str__(self):
+        return f"{self.name}: {self.count}"
+
+    class Meta:
+        verbose_name = 'Dashboard Sayacı'
+        verbose_name_plural = 'Dashboard Sayaçları'
+
+class RevenueRollup(models.Model):
+    # Gelir raporlarının önceden toplanmış hali (customers.revenue); sinyallerle artımlı güncellenir.
+    # billed: fatura tarihinin ayı, collected: ödeme tarihinin ayı, open: ödenmemişlerin vade günü
+    KINDS = [
+        ('billed', 'Faturalanan'),
+        ('collected', 'Tahsil Edilen'),
+        ('open', 'Açık Alacak'),
+    ]
+
+    kind = models.CharField(max_length=10, choices=KINDS, verbose_name='Tür')
+    period = models.DateField(verbose_name='Dönem')
+    payment_method = models.CharField(max_length=20, blank=True, default='', verbose_name='Ödeme Yöntemi')
+    count = models.BigIntegerField(default=0, verbose_name='Adet')
+    amount = models.DecimalField(max_digits=14, decimal_places=2, default=0, verbose_name='Tutar')
+
+    def __str__(self):
+        return f"{self.kind} {self.period:%Y-%m-%d} {self.payment_method}: {self.amount}"
+
+    class Meta:
+        verbose_name = 'Gelir Özeti'
+        verbose_name_plural = 'Gelir Özetleri'
+        constraints = [
+            models.UniqueConstraint(fields=['kind', 'period', 'payment_method'], name='revenue_rollup_unique'),
+        ]
+
+class SweepRun(models.Model):
+    # Durum taramasının (sweep_statuses) her çalıştırması; son kayıt taramanın ne zaman yapıldığını gösterir
+    ran_at = models.DateTimeField(default=timezone.now, verbose_name='Çalışma Zamanı')
+    as_of = models.DateField(verbose_name='Tarih')
+    overdue_invoices = models.IntegerField(default=0, verbose_name='Gecikmiş Faturalar')
+    expired_hosting = models.IntegerField(default=0, verbose_name='Süresi Dolan Hostingler')
+    reactivated_hosting = models.IntegerField(default=0, verbose_name='Yeniden Aktif Hostingler')
+
+    def __str__(self):
+        return f"{self.as_of} ({self.ran_at:%d.%m.%Y %H:%M})"
+
+    class Meta:
+        verbose_name = 'Durum Taraması'
+        verbose_name_plural = 'Durum Taramaları'
+        ordering = ['-ran_at']
+        indexes = [
+            models.Index(fields=['ran_at'], name='sweep_ran_at_idx'),
+        ]
+
+class PurgeJob(models.Model):
+    # Silinen bir müşterinin ilişkili kayıtlarının toplu temizliği (purge_customers komutu).
+    # Her parti sayacıyla birlikte commit edilir; yarıda kalan iş kaldığı yerden devam eder.
+    STATUS_CHOICES = [
+        ('pending', 'Bekliyor'),
+        ('running', 'Çalışıyor'),
+        ('done', 'Tamamlandı'),
+        ('failed', 'Hata'),
+    ]
+
+    customer_id = models.PositiveIntegerField(verbose_name='Müşteri ID')
+    company_name = models.CharField(max_length=200, verbose_name='Firma Adı')
+    status = models.CharField(max_length=20, choices=STATUS_CHOICES, default='pending', verbose_name='Durum')
+    requested_at = models.DateTimeField(default=timezone.now, verbose_name='İstenme Zamanı')
+    started_at = models.DateTimeField(blank=True, null=True, verbose_name='Başlama Zamanı')
+    finished_at = models.DateTimeField(blank=True, null=True, verbose_name='Bitiş Zamanı')
+    total_rows = models.IntegerField(blank=True, null=True, verbose_name='Toplam Kayıt')
+    deleted_ssl = models.IntegerField(default=0, verbose_name='Silinen SSL')
+    deleted_hosting = models.IntegerField(default=0, verbose_name='Silinen Hosting')
+    deleted_reminders = models.IntegerField(default=0, verbose_name='Silinen Hatırlatmalar')
+    deleted_renewals = models.IntegerField(default=0, verbose_name='Silinen Yenileme Kayıtları')
+    deleted_invoices = models.IntegerField(default=0, verbose_name='Silinen Faturalar')
+    deleted_domains = models.IntegerField(default=0, verbose_name='Silinen Domainler')
+    last_error = models.TextField(blank=True, verbose_name='Son Hata')
+
+    def __str__(self):
+        return f"{self.company_name} (#{self.customer_id})"
+
+    @property
+    def deleted_rows(self):
+        return (
+            self.deleted_ssl + self.deleted_hosting + self.deleted_reminders + self.deleted_renewals
+            + self.deleted_invoices + self.deleted_domains
+        )
+
+    class Meta:
+        verbose_name = 'Silme İşi'
+        verbose_name_plural = 'Silme İşleri'
+        ordering = ['-requested_at']
+        indexes = [
+            models.Index(fields=['status', 'requested_at'], name='purge_status_idx'),
+        ]
+
+class ChangeEvent(models.Model):
+    # Değişiklik günlüğü (api/changes/): kaydın eklendiği/güncellendiği ya da silindiği (tombstone).
+    # id imleçtir; SQLite AUTOINCREMENT ile artar ve silinen id'ler yeniden kullanılmaz.
+    resource = models.CharField(max_length=20, verbose_name='Kaynak')
+    object_id = models.PositiveIntegerField(verbose_name='Kayıt No')
+    deleted = models.BooleanField(default=False, verbose_name='Silindi mi?')
+    changed_at = models.DateTimeField(default=timezone.now, verbose_name='Değişiklik Zamanı')
+
+    def __str__(self):
+        return f"#{self.pk} {self.resource}:{self.object_id}{' (silindi)' if self.deleted else ''}"
+
+    class Meta:
+        verbose_name = 'Değişiklik'
+        verbose_name_plural = 'Değişiklikler'
+        indexes = [
+            models.Index(fields=['resource', 'object_id'], name='change_object_idx'),
+        ]
+
+class Renewal(models.Model):
+    # Hizmet yenileme geçmişi: toplu yenileme (renewals.bulk_renew) ve içe aktarılan renewal_dates
+    SERVICE_TYPES = SERVICE_TYPES
+
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, verbose_name='Müşteri')
+    service_type = models.CharField(max_length=10, choices=SERVICE_TYPES, verbose_name='Hizmet Türü')
+    object_id = models.BigIntegerField(verbose_name='Kayıt No')
+    previous_expiration = models.DateField(null=True, blank=True, verbose_name='Önceki Bitiş Tarihi')
+    new_expiration = models.DateField(null=True, blank=True, verbose_name='Yeni Bitiş Tarihi')
+    renewed_at = models.DateTimeField(default=timezone.now, verbose_name='Yenilenme Zamanı')
+
+    def __str__(self):
+        return f"{self.get_service_type_display()} #{self.object_id} - {self.new_expiration or self.renewed_at:%d.%m.%Y}"
+
+    class Meta:
+        verbose_name = 'Yenileme'
+        verbose_name_plural = 'Yenilemeler'
+        ordering = ['-renewed_at']
+        constraints = [
+            # Hizmetin geçmişi bu index'ten sıralı okunur; içe aktarma aynı kaydı ikinci kez eklemez
+            models.UniqueConstraint(
+                fields=['service_type', 'object_id', 'renewed_at'], name='renewal_unique_service_time',
+            ),
+        ]
+
+class ReminderLog(models.Model):
+    # Gönderilen yenileme hatırlatmaları; aynı bitiş tarihi için ikinci kez gönderilmez
+    SERVICE_TYPES = SERVICE_TYPES
+
+    customer = models.ForeignKey(Customer, on_delete=models.CASCADE, verbose_name='Müşteri')
+    service_type = models.CharField(max_length=10, choices=SERVICE_TYPES, verbose_name='Hizmet Türü')
+    object_id = models.BigIntegerField(verbose_name='Kayıt No')
+    expiration_date = models.DateField(verbose_name='Bitiş Tarihi')
+    recipients = models.TextField(verbose_name='Alıcılar')
+    sent_at = models.DateTimeField(default=timezone.now, verbose_name='Gönderilme Tarihi')
+
+    def __str__(self):
+        return f"{self.get_service_type_display()} #{self.object_id} - {self.expiration_date}"
+
+    class Meta:
+        verbose_name = 'Hatırlatma Kaydı'
+        verbose_name_plural = 'Hatırlatma Kayıtları'
+        ordering = ['-sent_at']
+        constraints = [
+            models.UniqueConstraint(
+                fields=['service_type', 'object_id', 'expiration_date'], name='reminder_unique_service_exp',
+            ),
+        ]
+        indexes = [
+            models.Index(fields=['expiration_date'], name='reminder_exp_idx'),
+        ]
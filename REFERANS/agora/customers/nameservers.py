@@ -0,0 +1,163 @@
+from django.db import transaction
+from django.db.models import Min
+from django.utils import timezone
+
+from .models import Domain, DomainNameserver, Nameserver
+from . import changes, signals
+
+FIELDS = ('nameserver1', 'nameserver2', 'nameserver3', 'nameserver4')
+BATCH_SIZE = 500
+DEFAULT_LIMIT = 100
+MAX_LIMIT = 1000
+
+# Nameserver index'i. Domain.nameserver1-4 alanları asıl kayıttır (formlar, API, dışa aktarma
+# onları kullanır); DomainNameserver bu alanların normalize edilmiş kopyasıdır. Tekil kayıtta
+# signals, toplu yazmalarda yazan kod sync() çağırır; replace() her ikisini birlikte günceller.
+
+
+def normalize(hostname):
+    return (hostname or '').strip().lower().rstrip('.')
+
+
+def _pairs(values):
+    # nameserver1-4 değerleri -> (sıra, ad) çiftleri; boş alanlar atlanır
+    names = [(position, normalize(value)) for position, value in enumerate(values, start=1)]
+    return [(position, name) for position, name in names if name]
+
+
+def hostnames(domain):
+    """Domain'in (sıra, nameserver) çiftleri."""
+    return _pairs(getattr(domain, field) for field in FIELDS)
+
+
+def _resolve(names):
+    # Ad -> id; eksik adlar tek INSERT ile eklenir
+    names = set(names)
+    if not names:
+        return {}
+    Nameserver.objects.bulk_create(
+        [Nameserver(hostname=name) for name in names], ignore_conflicts=True, batch_size=BATCH_SIZE,
+    )
+    return dict(Nameserver.objects.filter(hostname__in=names).values_list('hostname', 'pk'))
+
+
+def _link(rows):
+    # rows: [(domain id, [(sıra, ad), ...])]; domainlerin eski bağlantıları silinip yenileri yazılır
+    for start in range(0, len(rows), BATCH_SIZE):
+        batch = rows[start:start + BATCH_SIZE]
+        ids = _resolve(name for _, pairs in batch for _, name in pairs)
+        DomainNameserver.objects.filter(domain_id__in=[domain_id for domain_id, _ in batch]).delete()
+        DomainNameserver.objects.bulk_create(
+            [
+                DomainNameserver(domain_id=domain_id, nameserver_id=ids[name], position=position)
+                for domain_id, pairs in batch
+                for position, name in pairs
+            ],
+            batch_size=BATCH_SIZE,
+        )
+
+
+def sync(domains):
+    """Verilen (kaydedilmiş) domainlerin bağlantılarını nameserver1-4 alanlarından yeniler."""
+    with transaction.atomic():
+        _link([(domain.pk, hostnames(domain)) for domain in domains])
+
+
+def unlink(domain_ids):
+    # Ham DELETE ile silinecek domainlerin bağlantıları (purge)
+    DomainNameserver.objects.filter(domain_id__in=domain_ids).delete()
+
+
+def rebuild():
+    """Tüm bağlantıları nameserver1-4 alanlarından baştan kurar."""
+    with transaction.atomic():
+        DomainNameserver.objects.all().delete()
+        last = 0
+        while True:
+            rows = list(
+                Domain.objects.filter(pk__gt=last).order_by('pk').values_list('pk', *FIELDS)[:BATCH_SIZE]
+            )
+            if not rows:
+                break
+            _link([(row[0], _pairs(row[1:])) for row in rows])
+            last = rows[-1][0]
+
+
+def domains_using(hostname, after=0, limit=DEFAULT_LIMIT):
+    """``hostname``'i kullanan domainler (id sırasıyla); (satırlar, devamı var mı) döner."""
+    limit = max(1, min(limit, MAX_LIMIT))
+    # Aynı nameserver bir domainde iki sırada olabilir (elle girilmiş); domain başına tek satır,
+    # ilk sırası. Böylece sayfa sınırı bir domainin bağlantılarını bölmez.
+    rows = list(
+        DomainNameserver.objects.filter(nameserver__hostname=normalize(hostname), domain_id__gt=after)
+        .values('domain_id', 'domain__name', 'domain__customer_id')
+        .annotate(position=Min('position'))
+        .order_by('domain_id')[:limit + 1]
+    )
+    items = [
+        {
+            'id': row['domain_id'],
+            'name': row['domain__name'],
+            'customer_id': row['domain__customer_id'],
+            'position': row['position'],
+        }
+        for row in rows[:limit]
+    ]
+    return items, len(rows) > limit
+
+
+def _compact(domain, removed):
+    # ``removed`` ve tekrarlanan adlar çıkarılır, kalanlar nameserver1'den başlayarak yazılır
+    names = list(dict.fromkeys(name for _, name in hostnames(domain) if name != removed))
+    for index, field in enumerate(FIELDS):
+        if index < len(names):
+            setattr(domain, field, names[index])
+        else:
+            # nameserver1-2 boş bırakılamaz (NOT NULL), 3-4 NULL olur
+            setattr(domain, field, '' if index < 2 else None)
+
+
+def replace(old, new, customer_id=None):
+    """``old`` nameserver'ını kullanan domainlerde ``new`` yazar; değişen domain sayısını döner.
+
+    Tek transaction: etkilenen domainler bağlantı index'inden alt sorguyla seçilir, her
+    sıra için tek UPDATE (en fazla dört) ve bağlantılar tek UPDATE ile yeni nameserver'a taşınır.
+    ``new``'i zaten başka bir sırada kullanan domainlerde ``old`` silinir ve sonraki
+    nameserver'lar öne kayar; aynı nameserver iki sırada yer almaz.
+    """
+    old, new = normalize(old), normalize(new)
+    if not old or not new or old == new:
+        return 0
+    with transaction.atomic():
+        old_id = Nameserver.objects.filter(hostname=old).values_list('pk', flat=True).first()
+        if old_id is None:
+            return 0
+        # Silinmiş müşterilerin domainleri temizlenene kadar değiştirilmez
+        links = DomainNameserver.objects.filter(nameserver_id=old_id, domain__customer__deleted_at__isnull=True)
+        if customer_id is not None:
+            links = links.filter(domain__customer_id=customer_id)
+        count = links.values('domain_id').distinct().count()
+        if not count:
+            return 0
+        changes.record_queryset(Domain.objects.filter(pk__in=links.values('domain_id')))
+        now = timezone.now()
+        new_id = _resolve([new])[new]
+        duplicated = list(
+            Domain.objects.filter(pk__in=links.values('domain_id'), nameserver_links__nameserver_id=new_id).distinct()
+        )
+        if duplicated:
+            for domain in duplicated:
+                _compact(domain, old)
+                domain.updated_at = now
+            Domain.objects.bulk_update(duplicated, [*FIELDS, 'updated_at'], batch_size=BATCH_SIZE)
+            _link([(domain.pk, hostnames(domain)) for domain in duplicated])
+            links = links.exclude(domain_id__in=[domain.pk for domain in duplicated])
+        for position, field in enumerate(FIELDS, start=1):
+            Domain.objects.filter(pk__in=links.filter(position=position).values('domain_id')).update(
+                **{field: new, 'updated_at': now}
+            )
+        links.update(nameserver_id=new_id)
+
+    # QuerySet.update post_save göndermez; sayaçlar ve önbellek tazelenir (nameserver'lar aranmaz)
+    signals.bulk_changed.send(sender=Domain, fields=[*FIELDS, 'updated_at'])
+    return count
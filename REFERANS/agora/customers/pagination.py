@@ -0,0 +1,203 @@
+import base64
+import binascii
+import json
+from functools import reduce
+from operator import or_
+
+from django.conf import settings
+from django.core.exceptions import ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db.models import Q
+
+from .models import FoldedKeyField
+from .text import fold
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 500
+PAGE_SIZE_CHOICES = (25, 50, 100, 200)
+
+
+def get_page_size(request):
+    default = getattr(settings, 'CUSTOMERS_PAGE_SIZE', DEFAULT_PAGE_SIZE)
+    maximum = getattr(settings, 'CUSTOMERS_MAX_PAGE_SIZE', MAX_PAGE_SIZE)
+    try:
+        size = int(request.GET.get('page_size', default))
+    except (TypeError, ValueError):
+        size = default
+    return max(1, min(size, maximum))
+
+
+def _folded_path(model, path):
+    """``path``'in katlanmış anahtar karşılığı (ör. customer__company_name -> customer__company_name_key)."""
+    *relations, name = path.split('__')
+    for relation in relations:
+        model = model._meta.get_field(relation).related_model
+    for field in model._meta.concrete_fields:
+        if isinstance(field, FoldedKeyField) and field.source == name:
+            return '__'.join([*relations, field.name])
+    return None
+
+
+def search(queryset, query, fields):
+    """Arama kutusundaki her kelime, alanlardan en az birinde geçmeli.
+
+    SQLite LIKE Türkçe harflerde büyük/küçük ayırır ("ŞAHİN" "şahin"i bulmaz); katlanmış
+    anahtarı (FoldedKeyField) olan alanlarda katlanmış terim anahtar sütunda aranır.
+    """
+    lookups = []
+    for field in fields:
+        key = _folded_path(queryset.model, field)
+        lookups.append((f'{key}__contains', True) if key else (f'{field}__icontains', False))
+    for term in (query or '').split():
+        folded = fold(term)
+        queryset = queryset.filter(reduce(or_, (
+            Q(**{lookup: folded if use_key else term}) for lookup, use_key in lookups
+        )))
+    return queryset
+
+
+def get_sort(request, sort_fields, default_sort):
+    sort = request.GET.get('sort') or default_sort
+    if sort.lstrip('-') not in sort_fields:
+        sort = default_sort
+    return sort
+
+
+def ordering_for(sort):
+    # Eşit değerlerde sıranın kararlı olması için pk eklenir
+    prefix = '-' if sort.startswith('-') else ''
+    return [sort, f'{prefix}pk']
+
+
+def encode_cursor(sort, values):
+    raw = json.dumps({'s': sort, 'v': values}, cls=DjangoJSONEncoder, separators=(',', ':'))
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_cursor(cursor, sort):
+    if not cursor:
+        return None
+    try:
+        padded = cursor + '=' * (-len(cursor) % 4)
+        data = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, ValueError, UnicodeDecodeError):
+        return None
+    # Sıralama değiştiyse eski imleç geçersizdir; ilk sayfaya dönülür
+    if not isinstance(data, dict) or data.get('s') != sort or not isinstance(data.get('v'), list):
+        return None
+    return data['v']
+
+
+def _resolve(obj, path):
+    # .values() satırlarında ilişki yolu tek anahtardır ('domain__name')
+    if isinstance(obj, dict) and path in obj:
+        return obj[path]
+    for attr in path.split('__'):
+        obj = obj[attr] if isinstance(obj, dict) else getattr(obj, attr)
+    return obj
+
+
+def _seek_filter(keys, values, backwards):
+    # (a, b, pk) > (va, vb, vpk) karşılaştırmasının Q karşılığı
+    conditions = []
+    for i, (path, descending) in enumerate(keys):
+        op = 'lt' if descending != backwards else 'gt'
+        condition = Q(**{f'{path}__{op}': values[i]})
+        for j, (prev_path, _) in enumerate(keys[:i]):
+            condition &= Q(**{prev_path: values[j]})
+        conditions.append(condition)
+    return reduce(or_, conditions)
+
+
+class KeysetPage:
+    def __init__(self, object_list, sort, page_size, has_next, has_previous, next_cursor, previous_cursor, query):
+        self.object_list = object_list
+        self.sort = sort
+        self.page_size = page_size
+        self.has_next = has_next
+        self.has_previous = has_previous
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+        self.query = query
+        self.size_choices = sorted(set(PAGE_SIZE_CHOICES) | {page_size})
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __bool__(self):
+        return bool(self.object_list)
+
+
+def _keyset_query(request, queryset, sort_fields, default_sort, search_fields=()):
+    # Sayfanın sorgusu (page_size + 1 satır) ve sayfayı kurmak için gereken durum
+    query = request.GET.get('q', '').strip()
+    queryset = search(queryset, query, search_fields)
+
+    sort = get_sort(request, sort_fields, default_sort)
+    descending = sort.startswith('-')
+    keys = [(sort.lstrip('-'), descending), ('pk', descending)]
+
+    page_size = get_page_size(request)
+    after = decode_cursor(request.GET.get('after'), sort)
+    before = None if after is not None else decode_cursor(request.GET.get('before'), sort)
+    backwards = before is not None
+    cursor = before if backwards else after
+    if cursor is not None and len(cursor) != len(keys):
+        cursor, backwards = None, False
+
+    if cursor is not None:
+        try:
+            queryset = queryset.filter(_seek_filter(keys, cursor, backwards))
+        except (ValidationError, ValueError, TypeError):
+            cursor, backwards = None, False
+    ordering = [('-' if desc != backwards else '') + path for path, desc in keys]
+    state = {
+        'query': query, 'sort': sort, 'keys': keys, 'page_size': page_size,
+        'cursor': cursor, 'backwards': backwards,
+    }
+    return queryset.order_by(*ordering)[:page_size + 1], state
+
+
+def _keyset_page(rows, state):
+    sort, keys, page_size = state['sort'], state['keys'], state['page_size']
+    has_more = len(rows) > page_size
+    rows = rows[:page_size]
+    if state['backwards']:
+        rows.reverse()
+        has_next, has_previous = True, has_more
+    else:
+        has_next, has_previous = has_more, state['cursor'] is not None
+
+    def cursor_for(obj):
+        return encode_cursor(sort, [_resolve(obj, path) for path, _ in keys])
+
+    return KeysetPage(
+        object_list=rows,
+        sort=sort,
+        page_size=page_size,
+        has_next=bool(rows) and has_next,
+        has_previous=bool(rows) and has_previous,
+        next_cursor=cursor_for(rows[-1]) if rows else None,
+        previous_cursor=cursor_for(rows[0]) if rows else None,
+        query=state['query'],
+    )
+
+
+def keyset_paginate(request, queryset, sort_fields, default_sort, search_fields=()):
+    """Sunucu tarafında arama, sıralama ve imleçli (keyset) sayfalama.
+
+    ``sort_fields`` izin verilen sıralama alanlarıdır; ``?sort=-alan`` azalan
+    sıralar. Sıralamaya her zaman ``pk`` eklenir, böylece imleç tek bir satırı
+    gösterir ve OFFSET kullanmadan bir sonraki sayfaya index üzerinden atlanır.
+    """
+    queryset, state = _keyset_query(request, queryset, sort_fields, default_sort, search_fields)
+    return _keyset_page(list(queryset), state)
+
+
+async def akeyset_paginate(request, queryset, sort_fields, default_sort, search_fields=()):
+    """keyset_paginate'in async karşılığı; satırlar async iterasyonla okunur."""
+    queryset, state = _keyset_query(request, queryset, sort_fields, default_sort, search_fields)
+    return _keyset_page([row async for row in queryset], state)
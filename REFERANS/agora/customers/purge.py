@@ -0,0 +1,109 @@
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Customer, Domain, HostingService, Invoice, PurgeJob, ReminderLog, Renewal, SSLCertificate
+from . import changes, nameservers, revenue, search, signals, stats
+
+BATCH_SIZE = 1000
+# Tamamlanmamış işler; "running" kalmış iş yarıda kesilmiştir
+OPEN_STATUSES = ('pending', 'running', 'failed')
+
+
+def soft_delete_enabled():
+    return getattr(settings, 'CUSTOMERS_SOFT_DELETE', True)
+
+
+def _related(customer_id):
+    # İş sayacı -> (model, koşul). Domaine bağlı satırlar domainlerden önce silinir; başka
+    # müşteriye ait olsa da bu müşterinin domainine bağlı hosting/SSL de silinir (CASCADE gibi).
+    via_domain = Q(customer_id=customer_id) | Q(domain__customer_id=customer_id)
+    return {
+        'deleted_ssl': (SSLCertificate, via_domain),
+        'deleted_hosting': (HostingService, via_domain),
+        'deleted_reminders': (ReminderLog, Q(customer_id=customer_id)),
+        'deleted_renewals': (Renewal, Q(customer_id=customer_id)),
+        'deleted_invoices': (Invoice, Q(customer_id=customer_id)),
+        'deleted_domains': (Domain, Q(customer_id=customer_id)),
+    }
+
+
+def _delete_rows(model, ids):
+    table = connection.ops.quote_name(model._meta.db_table)
+    pk = connection.ops.quote_name(model._meta.pk.column)
+    with connection.cursor() as cursor:
+        cursor.execute(f'DELETE FROM {table} WHERE {pk} IN ({", ".join(["%s"] * len(ids))})', ids)
+
+
+def soft_delete(customer):
+    """Müşteriyi tek UPDATE ile gizler ve ilişkili kayıtlar için bir temizlik işi açar."""
+    with transaction.atomic():
+        customer.deleted_at = timezone.now()
+        customer.save(update_fields=['deleted_at', 'updated_at'])
+        # Kayıtları temizlenene kadar dashboard sayaçlarına katılmaz (pencere sorguları da süzer)
+        stats.discount_owner(customer.pk)
+        return PurgeJob.objects.create(customer_id=customer.pk, company_name=customer.company_name)
+
+
+def open_jobs():
+    return PurgeJob.objects.filter(status__in=OPEN_STATUSES).order_by('requested_at')
+
+
+def purge(job, batch_size=BATCH_SIZE, progress=None):
+    """Silme işini tamamlar; yarıda kalırsa yeniden çağrılması kaldığı yerden sürdürür.
+
+    Her parti tek transaction'dır: en fazla ``batch_size`` id seçilir, tek DELETE ile
+    silinir, arama index'inden çıkarılır ve işin sayacı artırılır. Yazma kilidi yalnızca
+    bir parti boyunca tutulur. ``progress(job)`` her partiden sonra çağrılır.
+    """
+    steps = _related(job.customer_id)
+    changed = set()
+    # Silinen faturaların gelir özeti satırları; yalnızca bunlar yeniden hesaplanır
+    periods = set()
+    try:
+        if Customer.all_objects.filter(pk=job.customer_id, deleted_at__isnull=True).exists():
+            raise ValueError(f'Müşteri #{job.customer_id} silinmiş olarak işaretli değil.')
+        if job.total_rows is None:
+            job.total_rows = sum(model._base_manager.filter(condition).count() for model, condition in steps.values())
+        job.status, job.last_error = 'running', ''
+        job.started_at = job.started_at or timezone.now()
+        job.save(update_fields=['status', 'started_at', 'total_rows', 'last_error'])
+
+        for field, (model, condition) in steps.items():
+            while True:
+                with transaction.atomic():
+                    ids = list(
+                        model._base_manager.filter(condition).order_by().values_list('pk', flat=True)[:batch_size]
+                    )
+                    if not ids:
+                        break
+                    if model is Domain:
+                        nameservers.unlink(ids)
+                    if model is Invoice:
+                        periods |= revenue.period_keys(Invoice._base_manager.filter(pk__in=ids))
+                    _delete_rows(model, ids)
+                    if model in search.MODEL_KINDS:
+                        search.remove_ids(search.MODEL_KINDS[model], ids)
+                    changes.record(model, ids, deleted=True)
+                    PurgeJob.objects.filter(pk=job.pk).update(**{field: F(field) + len(ids)})
+                setattr(job, field, getattr(job, field) + len(ids))
+                changed.add(model)
+                if progress:
+                    progress(job)
+
+        with transaction.atomic():
+            _delete_rows(Customer, [job.customer_id])
+            search.remove_ids('customer', [job.customer_id])
+            job.status, job.finished_at = 'done', timezone.now()
+            job.save(update_fields=['status', 'finished_at'])
+        changed.add(Customer)
+    except Exception as exc:
+        job.status, job.last_error = 'failed', str(exc)
+        PurgeJob.objects.filter(pk=job.pk).update(status=job.status, last_error=job.last_error)
+        raise
+    finally:
+        # Ham DELETE sinyal göndermez; sayaçlar ve önbellek tazelenir (arama satırları yukarıda silindi)
+        for model in changed:
+            signals.bulk_changed.send(sender=model, deleted=True, periods=periods if model is Invoice else None)
+    return job
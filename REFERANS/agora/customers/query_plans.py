@@ -0,0 +1,121 @@
+from django.db import connection
+from django.utils import timezone
+
+from .autocomplete import suggest_queryset
+from .expirations import TYPES, expiration_index, expiring, soon
+from .lists import LISTS
+from .models import Customer, HostingService, Invoice
+from .pagination import DEFAULT_PAGE_SIZE, ordering_for
+from .stats import _window_queries
+from .sweeper import unpaid_q
+
+# Görünümlerin çalıştırdığı sorgular ve kullanmaları beklenen index'ler.
+# Her kayıt: (etiket, queryset üreten fonksiyon, kabul edilen index adları). Sorgular
+# görünümlerin kullandığı tanımlardan kurulur (LISTS, expiration_index, dashboard pencereleri);
+# elle yazılmış kopyalar görünüm değiştiğinde sessizce eskirdi.
+
+# Tür -> tarih index'leri (aktiflik koşulu olan ve olmayan)
+EXPIRATION_INDEXES = {
+    'hosting': ['hosting_exp_idx', 'hosting_status_exp_idx'],
+    'domain': ['domain_exp_idx', 'domain_active_exp_idx'],
+    'ssl': ['ssl_exp_idx', 'ssl_active_exp_idx'],
+}
+# Liste -> varsayılan sıralamanın index'i
+LIST_INDEXES = {
+    'customers': ['customer_company_idx'],
+    'hosting': ['hosting_exp_idx'],
+    'domains': ['domain_exp_idx'],
+    'ssl': ['ssl_exp_idx'],
+    'invoices': ['invoice_issue_idx'],
+}
+# Dashboard tarih pencereleri (stats._window_queries) -> index'ler
+WINDOW_INDEXES = {
+    'new_customers': ['customer_created_idx'],
+    'hosting_expiring': ['hosting_status_exp_idx'],
+    'domain': EXPIRATION_INDEXES['domain'],
+    'ssl': EXPIRATION_INDEXES['ssl'],
+    'late_pending': ['invoice_pending_due_idx', 'invoice_status_due_idx'],
+}
+
+
+def _today():
+    return timezone.localdate()
+
+
+def _soon():
+    return soon(_today())
+
+
+def _window(name):
+    return lambda: _window_queries()[name][0]
+
+
+def _list_page(name):
+    # Liste görünümünün ilk sayfası: varsayılan sıralama, keyset sayfalama (page_size + 1 satır)
+    options = LISTS[name]
+    return lambda: options['queryset']().order_by(*ordering_for(options['default_sort']))[:DEFAULT_PAGE_SIZE + 1]
+
+
+PLAN_CHECKS = [
+    *[(f'dashboard: {name}', _window(name), indexes) for name, indexes in WINDOW_INDEXES.items()],
+    ('dashboard: son eklenen müşteriler',
+     lambda: Customer.objects.order_by('-created_at')[:5],
+     ['customer_created_idx']),
+    *[
+        (f'dashboard: yakında bitecek {service_type}',
+         lambda service_type=service_type: expiring(service_type, end=_soon()).order_by('expiration_date')[:5],
+         indexes)
+        for service_type, indexes in EXPIRATION_INDEXES.items()
+    ],
+    ('dashboard: ödenmemiş faturalar',
+     lambda: Invoice.objects.filter(unpaid_q()).select_related('customer').order_by('due_date')[:5],
+     ['invoice_pending_due_idx', 'invoice_status_due_idx']),
+    # durum taraması (sweep_statuses); fatura koşulu dashboard'daki late_pending ile aynı
+    ('sweep: süresi dolan hostingler',
+     lambda: HostingService.objects.filter(status='active', expiration_date__lt=_today()),
+     ['hosting_status_exp_idx']),
+    # liste görünümleri
+    *[(f'list: {name}', _list_page(name), indexes) for name, indexes in LIST_INDEXES.items()],
+    # bitiş takvimi: her tür kendi dalında kendi tarih index'ini kullanmalı
+    *[
+        (f'expirations: {service_type}',
+         lambda service_type=service_type: expiration_index(_today(), _soon(), types=(service_type,))[:51],
+         EXPIRATION_INDEXES[service_type])
+        for service_type in TYPES
+    ],
+    ('expirations: yalnızca aktif',
+     lambda: expiration_index(_today(), _soon(), types=('hosting',), active_only=True)[:51],
+     ['hosting_status_exp_idx', 'hosting_exp_idx']),
+    # form seçenekleri (api/autocomplete/): önek aralığı katlanmış anahtar index'inde
+    ('autocomplete: müşteriler',
+     lambda: suggest_queryset('customers', 'an')[:21],
+     ['customer_company_key_idx']),
+    ('autocomplete: domainler',
+     lambda: suggest_queryset('domains', 'al')[:21],
+     ['domain_name_key_idx']),
+    # admin date_hierarchy: dönem başına ORDER BY ... LIMIT 1 araması
+    ('admin: fatura tarih hiyerarşisi',
+     lambda: Invoice.objects.filter(issue_date__gte=_today()).order_by('issue_date')[:1],
+     ['invoice_issue_idx']),
+    ('admin: hosting tarih hiyerarşisi',
+     lambda: HostingService.objects.filter(start_date__gte=_today()).order_by('start_date')[:1],
+     ['hosting_start_idx']),
+    # detay görünümleri
+    ('customer_detail: faturalar',
+     lambda: Invoice.objects.filter(customer_id=1).order_by('-issue_date'),
+     ['invoice_customer_issue_idx']),
+]
+
+
+def check_plans(checks=None):
+    """Her sorgunun planını çıkarır; (etiket, başarılı mı, plan) listesi döner."""
+    results = []
+    for label, build, indexes in (checks or PLAN_CHECKS):
+        plan = build().explain()
+        ok = any(index in plan for index in indexes)
+        results.append((label, ok, plan))
+    return results
+
+
+def supports_plan_check():
+    return connection.vendor in ('sqlite', 'postgresql')
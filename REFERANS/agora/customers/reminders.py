@@ -0,0 +1,161 @@
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from queue import Queue
+
+from django.conf import settings
+from django.core.mail import EmailMessage, get_connection
+from django.template.loader import render_to_string
+from django.utils import timezone
+
+from .expirations import expiration_index, soon
+from .models import Customer, ReminderLog
+
+DEFAULT_WORKERS = 4
+SERVICE_LABELS = dict(ReminderLog.SERVICE_TYPES)
+RENEWAL_LINKS = {
+    'hosting': 'https://www.compeople.com.tr/product/hosting-hizmeti/',
+    'domain': 'https://www.compeople.com.tr/product/domain-adi-tescili/',
+    'ssl': 'https://www.compeople.com.tr/product/ssl-hizmeti/',
+}
+
+
+class Digest:
+    """Bir müşterinin yakında bitecek tüm hizmetleri için tek e-posta."""
+
+    def __init__(self, customer, items):
+        self.customer = customer
+        self.items = items
+
+    @property
+    def recipients(self):
+        seen, recipients = set(), []
+        for email in (self.customer.email, self.customer.email2, self.customer.email3):
+            if email and email.lower() not in seen:
+                seen.add(email.lower())
+                recipients.append(email)
+        return recipients
+
+    def subject(self):
+        if len(self.items) == 1:
+            item = self.items[0]
+            return f"{SERVICE_LABELS[item['type']]} Yenileme Hatırlatması - {item['domain_name']}"
+        return f'Yenileme Hatırlatması - {len(self.items)} hizmet'
+
+    def message(self, from_email=None):
+        types = {item['type'] for item in self.items}
+        body = render_to_string('customers/emails/renewal_digest.txt', {
+            'customer': self.customer,
+            'items': [{**item, 'label': SERVICE_LABELS[item['type']]} for item in self.items],
+            'links': [RENEWAL_LINKS[t] for t in RENEWAL_LINKS if t in types],
+            'has_domain': 'domain' in types,
+        })
+        return EmailMessage(self.subject(), body, from_email, self.recipients)
+
+    def log_entries(self):
+        recipients = ', '.join(self.recipients)
+        return [
+            ReminderLog(
+                customer_id=self.customer.pk,
+                service_type=item['type'],
+                object_id=item['id'],
+                expiration_date=item['expiration_date'],
+                recipients=recipients,
+            )
+            for item in self.items
+        ]
+
+
+def pending_digests(start=None, end=None):
+    """Hatırlatması gönderilmemiş, [start, end] aralığında bitecek aktif hizmetleri müşteri bazında gruplar.
+
+    Üç sorgu: hizmetler (tek UNION ALL), aralıktaki gönderim kayıtları ve müşteriler.
+    """
+    start = start or timezone.localdate()
+    end = end or soon(start)
+    sent = set(
+        ReminderLog.objects.filter(expiration_date__range=(start, end))
+        .values_list('service_type', 'object_id', 'expiration_date')
+    )
+    grouped = defaultdict(list)
+    for row in expiration_index(start, end, active_only=True):
+        if (row['type'], row['id'], row['expiration_date']) not in sent:
+            grouped[row['customer_id']].append(row)
+    if not grouped:
+        return []
+    customers = Customer.objects.only(
+        'contact_name', 'company_name', 'email', 'email2', 'email3',
+    ).in_bulk(list(grouped))
+    return [Digest(customers[pk], items) for pk, items in grouped.items() if pk in customers]
+
+
+class ConnectionPool:
+    """Sabit sayıda e-posta bağlantısı; her gönderim boştaki bir bağlantıyı ödünç alır.
+
+    Bağlantılar ilk kullanımda açılır ve havuz kapanana kadar açık kalır;
+    hata veren bağlantı kapatılır ve bir sonraki kullanımda yeniden açılır.
+    """
+
+    def __init__(self, size, backend=None):
+        self.connections = [get_connection(backend) for _ in range(size)]
+        self._idle = Queue()
+        for connection in self.connections:
+            self._idle.put(connection)
+
+    def send(self, message):
+        connection = self._idle.get()
+        try:
+            connection.open()
+            return connection.send_messages([message])
+        except Exception:
+            connection.close()
+            raise
+        finally:
+            self._idle.put(connection)
+
+    def close(self):
+        for connection in self.connections:
+            connection.close()
+
+
+class DispatchResult:
+    def __init__(self):
+        self.sent = 0
+        self.failed = []  # (müşteri, hata)
+        self.skipped = []  # e-posta adresi olmayan müşteriler
+
+
+def send_digests(digests, workers=None, from_email=None, backend=None):
+    """Özetleri sınırlı bir bağlantı havuzu üzerinden eşzamanlı gönderir.
+
+    Veritabanına yalnızca ana iş parçacığı yazar: her özetin kayıtları gönderim
+    başarılı olur olmaz tek INSERT ile ReminderLog'a eklenir. Süreç öldürülse de
+    (SIGKILL, OOM) tekrar çalıştırma gönderilmiş özetleri atlar; en fazla o an
+    gönderilip kaydı yazılamamış özetler ikinci kez gider.
+    """
+    result = DispatchResult()
+    workers = workers or getattr(settings, 'CUSTOMERS_REMINDER_WORKERS', DEFAULT_WORKERS)
+    messages = []
+    for digest in digests:
+        if digest.recipients:
+            messages.append((digest, digest.message(from_email)))
+        else:
+            result.skipped.append(digest.customer)
+    if not messages:
+        return result
+
+    pool = ConnectionPool(min(workers, len(messages)), backend)
+    try:
+        with ThreadPoolExecutor(max_workers=len(pool.connections)) as executor:
+            futures = {executor.submit(pool.send, message): digest for digest, message in messages}
+            for future in as_completed(futures):
+                digest = futures[future]
+                try:
+                    future.result()
+                except Exception as exc:
+                    result.failed.append((digest.customer, exc))
+                    continue
+                result.sent += 1
+                ReminderLog.objects.bulk_create(digest.log_entries(), ignore_conflicts=True)
+    finally:
+        pool.close()
+    return result
@@ -0,0 +1,271 @@
+import calendar
+import re
+from collections import defaultdict
+from datetime import date
+from decimal import Decimal
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Case, DateField, F, Value, When
+from django.utils import timezone
+
+from .expirations import expiration_index, soon
+from .models import Domain, HostingService, Invoice, InvoiceSequence, Renewal, SSLCertificate, SERVICE_TYPES
+from .signals import bulk_changed
+from . import cache, changes, revenue, search, stats
+
+BATCH_SIZE = 1000
+# Toplu yenilemede tek UPDATE'in CASE'ine giren en fazla farklı bitiş tarihi
+UPDATE_BATCH_SIZE = 500
+CENT = Decimal('0.01')
+DEFAULT_PREFIX = 'YNL-{year}-'
+NUMBER_WIDTH = 6
+SERVICE_LABELS = dict(SERVICE_TYPES)
+# Toplu yenilenebilen hizmetler: tür -> model
+SERVICE_MODELS = {'hosting': HostingService, 'domain': Domain, 'ssl': SSLCertificate}
+
+
+def invoice_prefix(issue_date):
+    return getattr(settings, 'CUSTOMERS_INVOICE_PREFIX', DEFAULT_PREFIX).format(year=issue_date.year)
+
+
+def _highest_used(prefix):
+    # Sayaç ilk kez açılırken bu önekle elle girilmiş numaraların üstünden başlanır
+    pattern = re.compile(rf'^{re.escape(prefix)}(\d+)$')
+    highest = 0
+    for number in Invoice.objects.filter(invoice_number__startswith=prefix).values_list('invoice_number', flat=True):
+        match = pattern.match(number)
+        if match:
+            highest = max(highest, int(match.group(1)))
+    return highest
+
+
+def _sequence(prefix):
+    sequence, _ = InvoiceSequence.objects.select_for_update().get_or_create(
+        prefix=prefix, defaults={'last_value': lambda: _highest_used(prefix)},
+    )
+    return sequence
+
+
+def allocate_numbers(prefix, count):
+    """``count`` adet ardışık fatura numarası ayırır ve ``range`` olarak döner.
+
+    Blok tek bir ``UPDATE ... SET last_value = last_value + count`` ile alınır;
+    satır kilidi yalnızca çağıranın transaction'ı boyunca tutulur. Transaction
+    geri alınırsa numaralar da geri alınır, boşluk oluşmaz.
+    """
+    if count <= 0:
+        return range(0)
+    sequence = _sequence(prefix)
+    InvoiceSequence.objects.filter(pk=sequence.pk).update(last_value=F('last_value') + count)
+    last = InvoiceSequence.objects.filter(pk=sequence.pk).values_list('last_value', flat=True).get()
+    return range(last - count + 1, last + 1)
+
+
+def peek_numbers(prefix, count):
+    # Deneme çalıştırması için: ayırmadan, sıradaki numaralar
+    last = InvoiceSequence.objects.filter(prefix=prefix).values_list('last_value', flat=True).first()
+    if last is None:
+        last = _highest_used(prefix)
+    return range(last + 1, last + count + 1)
+
+
+def format_number(prefix, value):
+    return f'{prefix}{value:0{NUMBER_WIDTH}d}'
+
+
+def _prices():
+    prices = getattr(settings, 'CUSTOMERS_RENEWAL_PRICES', {})
+    packages = getattr(settings, 'CUSTOMERS_RENEWAL_PACKAGE_PRICES', {})
+    return (
+        {name: Decimal(str(value)).quantize(CENT) for name, value in prices.items()},
+        {name: Decimal(str(value)).quantize(CENT) for name, value in packages.items()},
+    )
+
+
+class RenewalResult:
+    def __init__(self):
+        self.invoices = []
+        self.existing = 0
+        # Fiyatı tanımlı olmayan hizmetler: (tür, id)
+        self.unpriced = []
+
+    @property
+    def created(self):
+        return len(self.invoices)
+
+    @property
+    def total(self):
+        return sum((invoice.amount for invoice in self.invoices), Decimal('0'))
+
+
+def _pending(start, end):
+    # Aralıkta biten aktif hizmetler (tek UNION ALL) ve aynı dönem için zaten kesilmiş faturalar
+    invoiced = set(
+        Invoice.objects.filter(service_type__isnull=False, service_expiration__range=(start, end))
+        .values_list('service_type', 'service_id', 'service_expiration')
+    )
+    services = []
+    existing = 0
+    for row in expiration_index(start, end, active_only=True):
+        if (row['type'], row['id'], row['expiration_date']) in invoiced:
+            existing += 1
+        else:
+            services.append(row)
+    return services, existing
+
+
+def generate_renewal_invoices(start=None, end=None, issue_date=None, dry_run=False, batch_size=BATCH_SIZE):
+    """[start, end] aralığında biten aktif hizmetler için yenileme faturaları keser.
+
+    Tek transaction: hizmetler, mevcut yenileme faturaları ve (gerekirse)
+    hosting paketleri okunur, numaralar tek blok olarak ayrılır ve faturalar
+    ``bulk_create`` ile yazılır. Aynı hizmet dönemi için ikinci fatura kesilmez
+    (``invoice_unique_renewal``); iş her gece güvenle tekrar çalıştırılabilir.
+    """
+    issue_date = issue_date or timezone.localdate()
+    start = start or issue_date
+    end = end or soon(start)
+    prices, package_prices = _prices()
+    result = RenewalResult()
+
+    prefix = invoice_prefix(issue_date)
+
+    with transaction.atomic():
+        if not dry_run:
+            # Sayaç satırı baştan kilitlenir: eşzamanlı iki çalıştırma aynı hizmetleri görmez
+            _sequence(prefix)
+        services, result.existing = _pending(start, end)
+        packages = {}
+        if package_prices and any(row['type'] == 'hosting' for row in services):
+            packages = dict(
+                HostingService.objects.filter(status='active', expiration_date__range=(start, end))
+                .values_list('pk', 'package')
+            )
+
+        billable = []
+        for row in services:
+            price = package_prices.get(packages.get(row['id'])) if row['type'] == 'hosting' else None
+            price = price if price is not None else prices.get(row['type'])
+            if price is None:
+                result.unpriced.append((row['type'], row['id']))
+            else:
+                billable.append((row, price))
+
+        allocate = peek_numbers if dry_run else allocate_numbers
+        numbers = allocate(prefix, len(billable))
+        result.invoices = [
+            Invoice(
+                customer_id=row['customer_id'],
+                invoice_number=format_number(prefix, number),
+                description=(
+                    f"{row['domain_name']} {SERVICE_LABELS[row['type']]} yenileme "
+                    f"(bitiş {row['expiration_date']:%d.%m.%Y})"
+                ),
+                amount=price,
+                issue_date=issue_date,
+                due_date=max(row['expiration_date'], issue_date),
+                service_type=row['type'],
+                service_id=row['id'],
+                service_expiration=row['expiration_date'],
+            )
+            for (row, price), number in zip(billable, numbers)
+        ]
+        if not dry_run and result.invoices:
+            Invoice.objects.bulk_create(result.invoices, batch_size=batch_size)
+            changes.record(Invoice, [invoice.pk for invoice in result.invoices])
+            # bulk_create post_save göndermez; sayaçlar, gelir özetleri ve arama index'i yalnızca
+            # yeni faturaların katkısıyla güncellenir (tüm faturalar yeniden okunmaz)
+            stats.apply_deltas(stats.sum_contributions(result.invoices))
+            revenue.apply_deltas(stats.sum_contributions(result.invoices, revenue.contributions))
+            search.index_objects(result.invoices)
+
+    if not dry_run and result.invoices:
+        cache.invalidate(Invoice)
+    return result
+
+
+def add_months(value, months):
+    # Ayın son günleri kısalan aya göre kırpılır (31 Ocak + 1 ay = 28/29 Şubat)
+    index = value.year * 12 + value.month - 1 + months
+    year, month = index // 12, index % 12 + 1
+    return date(year, month, min(value.day, calendar.monthrange(year, month)[1]))
+
+
+def bulk_renew(service_type, ids, months=12, renewed_at=None):
+    """Seçilen hizmetlerin bitiş tarihini ``months`` ay uzatır ve yenileme geçmişine yazar.
+
+    Tek transaction: hizmetler tek sorguyla okunur, yeni tarihler
+    ``CASE expiration_date WHEN ...`` ile ``UPDATE_BATCH_SIZE`` farklı bitiş tarihi
+    başına tek ``UPDATE``'te yazılır (yüzlerce hizmet için bir iki UPDATE), hosting'in
+    yenileme sayısı aynı UPDATE'te artırılır (süresi dolmuş hosting yeniden aktif olur) ve
+    yalnızca güncellenen hizmetler için geçmiş satırları ``bulk_create`` ile eklenir.
+    Oluşturulan Renewal kayıtlarını döner.
+    """
+    model = SERVICE_MODELS[service_type]
+    renewed_at = renewed_at or timezone.now()
+    today = timezone.localdate(renewed_at)
+    reopened = False
+    with transaction.atomic():
+        # Silinmiş müşterilerin hizmetleri yenilenmez
+        rows = list(
+            model.objects.filter(pk__in=ids, customer__deleted_at__isnull=True)
+            .values_list('pk', 'customer_id', 'expiration_date')
+        )
+        by_expiration = defaultdict(list)
+        for pk, _, expiration_date in rows:
+            by_expiration[expiration_date].append(pk)
+        new_dates = {expiration_date: add_months(expiration_date, months) for expiration_date in by_expiration}
+        expirations = list(by_expiration)
+        updated = set()
+        for start in range(0, len(expirations), UPDATE_BATCH_SIZE):
+            batch = expirations[start:start + UPDATE_BATCH_SIZE]
+            batch_ids = [pk for old in batch for pk in by_expiration[old]]
+            values = {
+                'expiration_date': Case(
+                    *[When(expiration_date=old, then=Value(new_dates[old])) for old in batch],
+                    output_field=DateField(),
+                ),
+                'updated_at': renewed_at,
+            }
+            if model is HostingService:
+                values['renewal_count'] = F('renewal_count') + 1
+                # Süresi dolmuş hosting, yeni bitişi bugün ya da sonrasındaysa aynı UPDATE'te açılır
+                current = [old for old in batch if new_dates[old] >= today]
+                if current:
+                    values['status'] = Case(
+                        When(status='expired', expiration_date__in=current, then=Value('active')),
+                        default=F('status'),
+                    )
+                    reopened = True
+            # Bitiş tarihi okunduktan sonra değişen hizmet ikinci kez uzatılmaz
+            count = model.objects.filter(pk__in=batch_ids, expiration_date__in=batch).update(**values)
+            if count == len(batch_ids):
+                updated.update(batch_ids)
+            else:
+                # Atlanan satır geçmişe yazılmaz; güncellenenler bu UPDATE'in zaman damgasını taşır
+                updated.update(
+                    model.objects.filter(pk__in=batch_ids, updated_at=renewed_at).values_list('pk', flat=True)
+                )
+        rows = [row for row in rows if row[0] in updated]
+        renewals = Renewal.objects.bulk_create(
+            [
+                Renewal(
+                    customer_id=customer_id, service_type=service_type, object_id=pk,
+                    previous_expiration=expiration_date, new_expiration=new_dates[expiration_date],
+                    renewed_at=renewed_at,
+                )
+                for pk, customer_id, expiration_date in rows
+            ],
+            batch_size=BATCH_SIZE,
+        )
+        changes.record(model, [pk for pk, _, _ in rows])
+
+    if rows:
+        # QuerySet.update post_save göndermez; sayaçlar ve önbellek tazelenir
+        fields = ['expiration_date', 'updated_at'] + (['renewal_count'] if model is HostingService else [])
+        if reopened:
+            fields.append('status')
+        bulk_changed.send(sender=model, fields=fields)
+    return renewals
+
@@ -0,0 +1,260 @@
+from collections import defaultdict
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum, Value
+from django.db.models.functions import Coalesce, TruncMonth
+from django.utils import timezone
+from django.utils.dateparse import parse_date
+
+from .models import Invoice, RevenueRollup
+
+CENT = Decimal('0.01')
+# Özetlere giren alanlar; yalnızca başka alanları değiştiren toplu yazmalar özetlere dokunmaz
+ROLLUP_FIELDS = {'amount', 'issue_date', 'due_date', 'payment_status', 'payment_date', 'payment_method'}
+GRAINS = ('month', 'quarter')
+# Vadesi geçen gün sayısına göre alacak yaşlandırma: ad -> (en az, en çok) gün; None: sınırsız
+AGING_BUCKETS = {
+    'current': (None, -1),
+    '0_30': (0, 30),
+    '31_60': (31, 60),
+    '61_90': (61, 90),
+    '90_plus': (91, None),
+}
+
+# Gelir özetleri (RevenueRollup)
+#
+# Her fatura üç satırdan birine ya da ikisine katkı verir: fatura ayının "billed"
+# satırı ve ödendiyse ödeme ayının/yönteminin "collected" satırı, ödenmediyse vade
+# gününün "open" satırı. Tekil kayıt/silmede yalnızca etkilenen dönem satırları
+# artırılır (stats.contributions ile aynı yol); toplu yazmalardan sonra yalnızca
+# yazanın bildirdiği (tür, dönem) satırları GROUP BY ile yeniden hesaplanır (bildirmezse
+# hepsi). Raporlar yıllarca veri için birkaç yüz satır okur.
+
+
+def month_start(value):
+    return value.replace(day=1)
+
+
+def add_months(value, months):
+    # Ayın ilk günü, ``months`` ay ileri/geri
+    index = value.year * 12 + value.month - 1 + months
+    return date(index // 12, index % 12 + 1, 1)
+
+
+def quarter_start(value):
+    return date(value.year, 3 * ((value.month - 1) // 3) + 1, 1)
+
+
+def _date(value):
+    # Kaydedilen örnekte tarih metin olarak verilmiş olabilir
+    return parse_date(value) if isinstance(value, str) else value
+
+
+def contributions(invoice):
+    """Bir faturanın özetlere katkısı: {(tür, dönem, ödeme yöntemi): (adet, tutar)}"""
+    amount = Decimal(invoice.amount or 0)
+    issue_date = _date(invoice.issue_date)
+    result = {('billed', month_start(issue_date), ''): (1, amount)}
+    if invoice.payment_status == 'paid':
+        paid_on = _date(invoice.payment_date) or issue_date
+        result[('collected', month_start(paid_on), invoice.payment_method or '')] = (1, amount)
+    else:
+        result[('open', _date(invoice.due_date), '')] = (1, amount)
+    return result
+
+
+def apply_deltas(deltas):
+    if not deltas:
+        return
+    with transaction.atomic():
+        for (kind, period, method), (count, amount) in deltas.items():
+            key = {'kind': kind, 'period': period, 'payment_method': method}
+            updated = RevenueRollup.objects.filter(**key).update(count=F('count') + count, amount=F('amount') + amount)
+            if not updated:
+                RevenueRollup.objects.create(**key, count=count, amount=amount)
+
+
+def affects_rollups(fields):
+    """``fields`` güncellemesi özetleri değiştirebilir mi? (None: her şey değişmiş olabilir)"""
+    return fields is None or bool(set(fields) & ROLLUP_FIELDS)
+
+
+def period_keys(queryset):
+    """Sorgudaki faturaların katkı verdiği (tür, dönem) çiftleri.
+
+    Toplu yazmalar bunu yazmadan önce (ve gerekirse sonra) hesaplayıp
+    ``bulk_changed``'e ``periods=`` olarak verir; yalnızca bu satırlar yeniden hesaplanır.
+    """
+    keys = set()
+    rows = queryset.order_by().values_list('issue_date', 'payment_status', 'payment_date', 'due_date').distinct()
+    for issue_date, status, payment_date, due_date in rows:
+        keys.add(('billed', month_start(issue_date)))
+        if status == 'paid':
+            keys.add(('collected', month_start(payment_date or issue_date)))
+        else:
+            keys.add(('open', due_date))
+    return keys
+
+
+def _in_months(field, months):
+    condition = Q()
+    for month in months:
+        condition |= Q(**{f'{field}__gte': month, f'{field}__lt': add_months(month, 1)})
+    return condition
+
+
+def compute_rollups(periods=None):
+    """Özetleri faturalardan baştan hesaplar (tür başına bir GROUP BY sorgusu).
+
+    ``periods`` ({tür: dönemler}) verilirse yalnızca o türlerin o dönemleri hesaplanır.
+    """
+    invoices = Invoice.objects
+    queries = {
+        'billed': invoices.annotate(period=TruncMonth('issue_date'), method=Value('')),
+        'collected': invoices.filter(payment_status='paid').annotate(
+            paid_on=Coalesce('payment_date', 'issue_date'),
+            period=TruncMonth('paid_on'),
+            method=Coalesce('payment_method', Value('')),
+        ),
+        'open': invoices.exclude(payment_status='paid').annotate(period=F('due_date'), method=Value('')),
+    }
+    if periods is not None:
+        filters = {
+            'billed': lambda months: _in_months('issue_date', months),
+            'collected': lambda months: _in_months('paid_on', months),
+            'open': lambda days: Q(due_date__in=days),
+        }
+        queries = {
+            kind: queryset.filter(filters[kind](periods[kind]))
+            for kind, queryset in queries.items() if periods.get(kind)
+        }
+    rollups = {}
+    for kind, queryset in queries.items():
+        rows = queryset.values('period', 'method').annotate(count=Count('id'), amount=Sum('amount')).order_by()
+        for row in rows:
+            # SQLite SUM ondalıkları float olarak toplar; kuruşa yuvarla
+            rollups[(kind, row['period'], row['method'])] = (row['count'], (row['amount'] or Decimal('0')).quantize(CENT))
+    return rollups
+
+
+def rebuild():
+    rollups = compute_rollups()
+    with transaction.atomic():
+        RevenueRollup.objects.all().delete()
+        RevenueRollup.objects.bulk_create(
+            [
+                RevenueRollup(kind=kind, period=period, payment_method=method, count=count, amount=amount)
+                for (kind, period, method), (count, amount) in rollups.items()
+            ],
+            batch_size=1000,
+        )
+    return rollups
+
+
+def refresh(keys):
+    """Yalnızca verilen (tür, dönem) satırlarını faturalardan yeniden hesaplar."""
+    periods = defaultdict(set)
+    for kind, period in keys:
+        periods[kind].add(period)
+    if not periods:
+        return {}
+    rollups = compute_rollups(periods=periods)
+    condition = Q()
+    for kind, values in periods.items():
+        condition |= Q(kind=kind, period__in=values)
+    with transaction.atomic():
+        RevenueRollup.objects.filter(condition).delete()
+        RevenueRollup.objects.bulk_create(
+            [
+                RevenueRollup(kind=kind, period=period, payment_method=method, count=count, amount=amount)
+                for (kind, period, method), (count, amount) in rollups.items()
+            ],
+            batch_size=1000,
+        )
+    return rollups
+
+
+def stored_rollups():
+    return {
+        (kind, period, method): (count, amount)
+        for kind, period, method, count, amount in RevenueRollup.objects.exclude(count=0).values_list(
+            'kind', 'period', 'payment_method', 'count', 'amount',
+        )
+    }
+
+
+def find_drift():
+    """Kayıtlı ve canlı özetler arasındaki farklar: {anahtar: (kayıtlı, canlı)}"""
+    stored, live = stored_rollups(), compute_rollups()
+    empty = (0, Decimal('0'))
+    return {
+        key: (stored.get(key, empty), live.get(key, empty))
+        for key in set(stored) | set(live)
+        if stored.get(key, empty) != live.get(key, empty)
+    }
+
+
+def _periods(start, end, grain):
+    step = 3 if grain == 'quarter' else 1
+    current = quarter_start(start) if grain == 'quarter' else month_start(start)
+    while current <= end:
+        yield current
+        current = add_months(current, step)
+
+
+def _label(period, grain):
+    if grain == 'quarter':
+        return f'{period.year}-Q{(period.month - 1) // 3 + 1}'
+    return f'{period:%Y-%m}'
+
+
+def series(start, end, grain='month'):
+    """[start, end] aralığındaki aylar/çeyrekler için faturalanan ve tahsil edilen tutarlar.
+
+    Çeyrekler aylık satırlardan toplanır; tek sorgu, dönem ve ödeme yöntemi başına bir satır.
+    """
+    bucket = quarter_start if grain == 'quarter' else month_start
+    periods = {
+        period: {
+            'period': _label(period, grain),
+            'start': period,
+            'billed': {'count': 0, 'amount': Decimal('0')},
+            'collected': {'count': 0, 'amount': Decimal('0'), 'by_method': {}},
+        }
+        for period in _periods(start, end, grain)
+    }
+    rows = RevenueRollup.objects.filter(
+        kind__in=('billed', 'collected'), period__gte=month_start(start), period__lte=end,
+    ).values_list('kind', 'period', 'payment_method', 'count', 'amount')
+    for kind, period, method, count, amount in rows:
+        item = periods[bucket(period)][kind]
+        item['count'] += count
+        item['amount'] += amount
+        if kind == 'collected':
+            item['by_method'][method or 'unknown'] = item['by_method'].get(method or 'unknown', Decimal('0')) + amount
+    return list(periods.values())
+
+
+def aging(today=None):
+    """Ödenmemiş faturaların vadeden bu yana geçen güne göre dağılımı; tek aggregate sorgusu."""
+    today = today or timezone.localdate()
+    aggregates = {}
+    for name, (low, high) in AGING_BUCKETS.items():
+        # Gün aralığı vade tarihi aralığına çevrilir: geçen gün = bugün - vade
+        condition = Q()
+        if low is not None:
+            condition &= Q(period__lte=today - timedelta(days=low))
+        if high is not None:
+            condition &= Q(period__gte=today - timedelta(days=high))
+        aggregates[f'{name}_count'] = Sum('count', filter=condition)
+        aggregates[f'{name}_amount'] = Sum('amount', filter=condition)
+    row = RevenueRollup.objects.filter(kind='open').aggregate(**aggregates)
+    return {
+        name: {
+            'count': row[f'{name}_count'] or 0,
+            'amount': Decimal(row[f'{name}_amount'] or 0).quantize(CENT),
+        }
+        for name in AGING_BUCKETS
+    }
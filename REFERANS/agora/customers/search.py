@@ -0,0 +1,205 @@
+import re
+
+from django.db import connection, connections, router
+from django.db.models.expressions import RawSQL
+from django.urls import reverse
+
+from .models import Customer, Domain, Invoice
+from .pagination import search as icontains_search
+from .text import fold
+
+TABLE = 'customers_search'
+BATCH_SIZE = 2000
+MAX_RESULTS = 100
+
+# Her kaydın index satırı: id = object_id * STRIDE + tür kodu. Böylece güncelleme
+# ve silme FTS5'te de rowid üzerinden (tam tarama olmadan) yapılır.
+KINDS = {
+    'customer': (0, Customer, 'customers:customer-detail'),
+    'domain': (1, Domain, 'customers:domain-detail'),
+    'invoice': (2, Invoice, 'customers:invoice-detail'),
+}
+MODEL_KINDS = {model: kind for kind, (_, model, _) in KINDS.items()}
+# Index'e giren alanlar; yalnızca başka alanları değiştiren toplu yazmalar index'i yeniden kurmaz
+INDEXED_FIELDS = {
+    'customer': {'company_name', 'contact_name', 'email', 'email2', 'email3', 'tax_number', 'customer_no'},
+    'domain': {'name', 'customer', 'customer_id'},
+    'invoice': {'invoice_number', 'description', 'customer', 'customer_id'},
+}
+STRIDE = 4
+
+_TOKEN = re.compile(r'\w+')
+
+
+def supports_fts():
+    return connection.vendor in ('sqlite', 'postgresql')
+
+
+def _document(kind, obj):
+    # (başlık, aranan metin, müşteri id)
+    if kind == 'customer':
+        parts = [obj.company_name, obj.contact_name, obj.email, obj.email2, obj.email3, obj.tax_number, obj.customer_no]
+        return obj.company_name, parts, obj.pk
+    if kind == 'domain':
+        return obj.name, [obj.name], obj.customer_id
+    return obj.invoice_number, [obj.invoice_number, obj.description], obj.customer_id
+
+
+def _row(kind, obj):
+    code = KINDS[kind][0]
+    title, parts, customer_id = _document(kind, obj)
+    body = ' '.join(fold(part) for part in parts if part not in (None, ''))
+    return (obj.pk * STRIDE + code, kind, obj.pk, customer_id, title, body)
+
+
+def _write(rows):
+    if not rows:
+        return
+    with connection.cursor() as cursor:
+        if connection.vendor == 'sqlite':
+            cursor.executemany(f'DELETE FROM {TABLE} WHERE rowid = %s', [(row[0],) for row in rows])
+            cursor.executemany(
+                f'INSERT INTO {TABLE} (rowid, kind, object_id, customer_id, title, body) VALUES (%s, %s, %s, %s, %s, %s)',
+                rows,
+            )
+        else:
+            cursor.executemany(
+                f'INSERT INTO {TABLE} (id, kind, object_id, customer_id, title, body) VALUES (%s, %s, %s, %s, %s, %s) '
+                'ON CONFLICT (id) DO UPDATE SET customer_id = EXCLUDED.customer_id, '
+                'title = EXCLUDED.title, body = EXCLUDED.body',
+                rows,
+            )
+
+
+def index_object(obj):
+    if getattr(obj, 'deleted_at', None):
+        # Silinmiş müşteri aramada görünmez
+        remove_object(obj)
+    elif supports_fts():
+        _write([_row(MODEL_KINDS[type(obj)], obj)])
+
+
+def index_objects(objects):
+    """Toplu eklenen kayıtların index satırlarını yazar; türün tamamı yeniden kurulmaz."""
+    if not supports_fts():
+        return
+    for start in range(0, len(objects), BATCH_SIZE):
+        _write([_row(MODEL_KINDS[type(obj)], obj) for obj in objects[start:start + BATCH_SIZE]])
+
+
+def remove_ids(kind, ids):
+    if not supports_fts() or not ids:
+        return
+    key = 'rowid' if connection.vendor == 'sqlite' else 'id'
+    with connection.cursor() as cursor:
+        cursor.executemany(f'DELETE FROM {TABLE} WHERE {key} = %s', [(pk * STRIDE + KINDS[kind][0],) for pk in ids])
+
+
+def remove_object(obj):
+    remove_ids(MODEL_KINDS[type(obj)], [obj.pk])
+
+
+def rebuild(kinds=None):
+    """Verilen türlerin index satırlarını baştan yazar; toplu yazmalardan sonra çağrılır."""
+    if not supports_fts():
+        return 0
+    total = 0
+    for kind in (kinds or KINDS):
+        model = KINDS[kind][1]
+        with connection.cursor() as cursor:
+            cursor.execute(f'DELETE FROM {TABLE} WHERE kind = %s', [kind])
+        batch = []
+        for obj in model.objects.order_by().iterator(chunk_size=BATCH_SIZE):
+            batch.append(_row(kind, obj))
+            if len(batch) >= BATCH_SIZE:
+                _write(batch)
+                total += len(batch)
+                batch = []
+        _write(batch)
+        total += len(batch)
+    return total
+
+
+def _terms(query):
+    return _TOKEN.findall(fold(query))
+
+
+def _match(terms):
+    # Her terim önek olarak aranır ve hepsi geçmeli; tırnak FTS sözdizimini etkisiz kılar
+    if connection.vendor == 'sqlite':
+        return ' '.join(f'"{term}"*' for term in terms)
+    return ' & '.join(f"'{term}':*" for term in terms)
+
+
+def search(query, kinds=None, limit=20):
+    """Sıralı sonuçlar: [{'type', 'id', 'title', 'customer_id', 'url', 'rank'}]."""
+    terms = _terms(query)
+    kinds = [kind for kind in (kinds or KINDS) if kind in KINDS]
+    if not terms or not kinds:
+        return []
+    limit = max(1, min(limit, MAX_RESULTS))
+    if supports_fts():
+        rows = _search_index(terms, kinds, limit)
+    else:
+        rows = _search_fallback(query, kinds, limit)
+    return [
+        {
+            'type': kind,
+            'id': object_id,
+            'title': title,
+            'customer_id': customer_id,
+            'url': reverse(KINDS[kind][2], args=[object_id]),
+            'rank': round(rank, 4),
+        }
+        for kind, object_id, customer_id, title, rank in rows
+    ]
+
+
+def _search_index(terms, kinds, limit):
+    placeholders = ', '.join(['%s'] * len(kinds))
+    if connection.vendor == 'sqlite':
+        # bm25 negatiftir; küçük olan daha iyi eşleşmedir
+        sql = (
+            f'SELECT kind, object_id, customer_id, title, -bm25({TABLE}) FROM {TABLE} '
+            f'WHERE {TABLE} MATCH %s AND kind IN ({placeholders}) ORDER BY rank LIMIT %s'
+        )
+    else:
+        sql = (
+            f"SELECT kind, object_id, customer_id, title, ts_rank(document, to_tsquery('simple', %s)) AS score "
+            f"FROM {TABLE} WHERE document @@ to_tsquery('simple', %s) AND kind IN ({placeholders}) "
+            'ORDER BY score DESC LIMIT %s'
+        )
+    match = _match(terms)
+    params = [match] if connection.vendor == 'sqlite' else [match, match]
+    # Ham sorgu yönlendiriciden geçmez; okuma bağlantısı (replica_reads içinde replica) elle seçilir
+    with connections[router.db_for_read(Customer)].cursor() as cursor:
+        cursor.execute(sql, [*params, *kinds, limit])
+        return cursor.fetchall()
+
+
+def _search_fallback(query, kinds, limit):
+    # FTS olmayan veritabanları: alan bazlı icontains (index kullanmaz)
+    fields = {
+        'customer': ('company_name', 'contact_name', 'email', 'email2', 'email3', 'tax_number'),
+        'domain': ('name',),
+        'invoice': ('invoice_number', 'description'),
+    }
+    rows = []
+    for kind in kinds:
+        model = KINDS[kind][1]
+        for obj in icontains_search(model.objects.all(), query, fields[kind])[:limit]:
+            title, _, customer_id = _document(kind, obj)
+            rows.append((kind, obj.pk, customer_id, title, 0.0))
+    return rows[:limit]
+
+
+def matching_ids(kind, query):
+    """Admin aramaları için: eşleşen kayıtların pk'lerini veren alt sorgu (None: FTS yok)."""
+    terms = _terms(query)
+    if not terms or not supports_fts():
+        return None
+    if connection.vendor == 'sqlite':
+        sql = f'SELECT object_id FROM {TABLE} WHERE {TABLE} MATCH %s AND kind = %s'
+        return RawSQL(sql, [_match(terms), kind])
+    sql = f"SELECT object_id FROM {TABLE} WHERE document @@ to_tsquery('simple', %s) AND kind = %s"
+    return RawSQL(sql, [_match(terms), kind])
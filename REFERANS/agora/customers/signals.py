@@ -0,0 +1,180 @@
+from django.db.backends.signals import connection_created
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import Signal, receiver
+
+from .models import Customer, HostingService, Domain, SSLCertificate, Invoice
+from . import cache, changes, db, nameservers, revenue, search, stats
+
+TRACKED_MODELS = (Customer, HostingService, Domain, SSLCertificate, Invoice)
+
+# bulk_create / QuerySet.update post_save göndermez; toplu yazan kodlar
+# işlem sonunda bu sinyali gönderir: bulk_changed.send(sender=Model)
+# (değişiklik günlüğüne ise kendi transaction'ları içinde changes.record* ile yazarlar)
+# Yalnızca belirli alanlar güncellendiyse fields=[...] verilebilir (None: her şey değişmiş olabilir);
+# ham DELETE ile satır silenler deleted=True gönderir. Fatura yazanlar etkilenen gelir özeti
+# satırlarını periods={(tür, dönem), ...} ile bildirebilir (revenue.period_keys)
+bulk_changed = Signal()
+
+
+# pre_save/post_save/post_delete alıcıları model başına bağlanır (dosyanın sonu). Göndericisiz
+# bir alıcı her modelde has_listeners() sonucunu True yapar ve Collector'ın hızlı silmesini
+# (oturumlar, LogEntry, DomainNameserver cascade'i) satır satır silmeye çevirir.
+
+def _owner_deleted(sender, instance):
+    # Müşteriye bağlı kayıtlarda müşterinin silinmek üzere işaretli olup olmadığı; pre_save'de
+    # önceki satırla birlikte okunduysa (aynı müşteri) yeniden sorgulanmaz
+    if sender not in stats.OWNED_MODELS:
+        return False
+    known = getattr(instance, '_owner_state', None)
+    if known is not None and known[0] == instance.customer_id:
+        return known[1]
+    deleted = stats.owner_deleted(instance)
+    instance._owner_state = (instance.customer_id, deleted)
+    return deleted
+
+
+def _nameservers_updated(update_fields):
+    return update_fields is None or bool(set(update_fields) & set(nameservers.FIELDS))
+
+
+def _needs_previous(sender, update_fields):
+    # save(update_fields=[...]) sayılan, gelir özetine giren ya da nameserver alanlarına
+    # dokunmuyorsa önceki satır okunmaz; post_save alıcıları da aynı alanlara bakıp atlar
+    return (
+        stats.counts_fields(sender, update_fields)
+        or (sender is Invoice and revenue.affects_rollups(update_fields))
+        or (sender is Domain and _nameservers_updated(update_fields))
+    )
+
+
+def remember_counter_contributions(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not _needs_previous(sender, update_fields):
+        return
+    previous = None
+    if instance.pk is not None and not instance._state.adding:
+        queryset = sender._base_manager.filter(pk=instance.pk)
+        if sender in stats.OWNED_MODELS:
+            queryset = queryset.select_related('customer')
+        previous = queryset.first()
+    instance._counter_contributions = (
+        stats.contributions(previous, _owner_deleted(sender, previous)) if previous else {}
+    )
+    if previous is not None and sender in stats.OWNED_MODELS:
+        instance._owner_state = previous._owner_state
+    if sender is Invoice:
+        instance._revenue_contributions = revenue.contributions(previous) if previous else {}
+    if sender is Domain:
+        instance._previous_nameservers = nameservers.hostnames(previous) if previous else None
+
+
+def update_counters_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not stats.counts_fields(sender, update_fields):
+        return
+    old = getattr(instance, '_counter_contributions', {})
+    new = stats.contributions(instance, _owner_deleted(sender, instance))
+    stats.apply_deltas(stats.diff_contributions(old, new))
+    instance._counter_contributions = new
+
+
+def update_counters_on_delete(sender, instance, **kwargs):
+    stats.apply_deltas(stats.diff_contributions(stats.contributions(instance, _owner_deleted(sender, instance)), {}))
+
+
+@receiver(bulk_changed)
+def rebuild_counters_after_bulk_change(sender, fields=None, **kwargs):
+    # Yalnızca göndericinin sayaçları; sayılan alanlara dokunmayan güncellemeler atlanır
+    if stats.counts_fields(sender, fields):
+        stats.rebuild_counters([sender])
+
+
+@receiver(post_save, sender=Invoice)
+def update_revenue_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    if raw or not revenue.affects_rollups(update_fields):
+        return
+    new = revenue.contributions(instance)
+    revenue.apply_deltas(stats.diff_contributions(getattr(instance, '_revenue_contributions', {}), new))
+    instance._revenue_contributions = new
+
+
+@receiver(post_delete, sender=Invoice)
+def update_revenue_on_delete(sender, instance, **kwargs):
+    revenue.apply_deltas(stats.diff_contributions(revenue.contributions(instance), {}))
+
+
+@receiver(bulk_changed, sender=Invoice)
+def refresh_revenue_after_bulk_change(sender, fields=None, periods=None, **kwargs):
+    # Yazan etkilenen (tür, dönem) çiftlerini bildirdiyse yalnızca onlar yeniden hesaplanır
+    if periods is not None:
+        revenue.refresh(periods)
+    elif revenue.affects_rollups(fields):
+        revenue.rebuild()
+
+
+@receiver(post_save, sender=Domain)
+def sync_nameservers_on_save(sender, instance, raw=False, update_fields=None, **kwargs):
+    # Nameserver alanları değişmediyse bağlantılara dokunulmaz
+    if raw or not _nameservers_updated(update_fields):
+        return
+    current = nameservers.hostnames(instance)
+    if current != getattr(instance, '_previous_nameservers', None):
+        nameservers.sync([instance])
+    instance._previous_nameservers = current
+
+
+def invalidate_cache_on_write(sender, **kwargs):
+    cache.invalidate(sender)
+
+
+@receiver(bulk_changed)
+def invalidate_cache_after_bulk_change(sender, **kwargs):
+    cache.invalidate(sender)
+
+
+def update_search_index_on_save(sender, instance, raw=False, **kwargs):
+    # Fixture yüklemesi (loaddata): index sonradan search.rebuild ile kurulur
+    if raw:
+        return
+    search.index_object(instance)
+
+
+def update_search_index_on_delete(sender, instance, **kwargs):
+    search.remove_object(instance)
+
+
+@receiver(bulk_changed)
+def rebuild_search_index_after_bulk_change(sender, fields=None, deleted=False, **kwargs):
+    # Satır silen kod index satırlarını kendisi çıkarır (search.remove_ids)
+    if deleted or sender not in search.MODEL_KINDS:
+        return
+    kind = search.MODEL_KINDS[sender]
+    if fields is None or set(fields) & search.INDEXED_FIELDS[kind]:
+        search.rebuild([kind])
+
+
+def record_change_on_save(sender, instance, raw=False, **kwargs):
+    if raw:
+        return
+    changes.record(sender, [instance.pk], deleted=getattr(instance, 'deleted_at', None) is not None)
+
+
+def record_change_on_delete(sender, instance, **kwargs):
+    changes.record(sender, [instance.pk], deleted=True)
+
+
+@receiver(connection_created)
+def configure_connection(sender, connection, **kwargs):
+    db.apply_pragmas(connection)
+
+
+for model in TRACKED_MODELS:
+    pre_save.connect(remember_counter_contributions, sender=model)
+    post_save.connect(update_counters_on_save, sender=model)
+    post_delete.connect(update_counters_on_delete, sender=model)
+    post_save.connect(invalidate_cache_on_write, sender=model)
+    post_delete.connect(invalidate_cache_on_write, sender=model)
+    post_save.connect(record_change_on_save, sender=model)
+    post_delete.connect(record_change_on_delete, sender=model)
+
+for model in search.MODEL_KINDS:
+    post_save.connect(update_search_index_on_save, sender=model)
+    post_delete.connect(update_search_index_on_delete, sender=model)
@@ -0,0 +1,362 @@
+import asyncio
+from datetime import timedelta
+
+from decimal import Decimal
+
+from django.db import transaction
+from django.db.models import Count, F, Q, Sum
+from django.utils import timezone
+
+from .expirations import soon
+from .sweeper import overdue_q, pending_q
+from .models import Customer, HostingService, Domain, SSLCertificate, Invoice, DashboardCounter
+
+CENT = Decimal('0.01')
+# Sayaçlar ve pencere sorguları silinmek üzere işaretli müşterilerin (deleted_at) kayıtlarını
+# saymaz; "yakında bitecek" listeleriyle (expirations._base) aynı kapsam. soft_delete bu
+# kayıtların katkısını sayaçlardan düşer, purge satırları siler.
+OWNED_MODELS = (HostingService, Domain, SSLCertificate, Invoice)
+LIVE_OWNER = Q(customer__deleted_at__isnull=True)
+
+
+def _windows(now=None):
+    now = now or timezone.now()
+    today = timezone.localdate(now)
+    return {
+        'now': now,
+        'today': today,
+        'soon': soon(today),
+        'thirty_days_ago': now - timedelta(days=30),
+    }
+
+
+def _invoice_aggregates(now=None):
+    # Tek sorguda her durum için adet + tutar; sonuç eski {'paid': {'count', 'amount'}} yapısında döner
+    w = _windows(now)
+    groups = {
+        'total': None,
+        'paid': Q(payment_status='paid'),
+        'pending': pending_q(w['today']),
+        'overdue': overdue_q(w['today']),
+    }
+    aggregates = {}
+    for name, condition in groups.items():
+        aggregates[f'{name}_count'] = Count('id', filter=condition)
+        aggregates[f'{name}_amount'] = Sum('amount', filter=condition)
+    return groups, aggregates
+
+
+def _invoice_result(groups, row):
+    return {
+        name: {'count': row[f'{name}_count'], 'amount': row[f'{name}_amount']}
+        for name in groups
+    }
+
+
+def invoice_stats(queryset=None, now=None):
+    if queryset is None:
+        queryset = Invoice.objects.all()
+    groups, aggregates = _invoice_aggregates(now)
+    return _invoice_result(groups, queryset.aggregate(**aggregates))
+
+
+async def ainvoice_stats(queryset=None, now=None):
+    if queryset is None:
+        queryset = Invoice.objects.all()
+    groups, aggregates = _invoice_aggregates(now)
+    return _invoice_result(groups, await queryset.aaggregate(**aggregates))
+
+
+# Önceden hesaplanmış sayaçlar (DashboardCounter)
+#
+# Zamandan bağımsız sayaçlar (toplam, aktif, duruma göre adet/tutar) her kayıt
+# ve silmede sinyallerle artımlı güncellenir. Zamana bağlı olanlar (yakında
+# bitecek, süresi geçmiş, gecikmiş, son 30 gün) tarih penceresiyle sınırlı
+# sorgularla hesaplanır.
+
+def owner_deleted(instance):
+    """Kaydın müşterisi silinmek üzere işaretli mi? Müşteri nesnesi yüklüyse sorgu atılmaz."""
+    if type(instance).customer.is_cached(instance):
+        return instance.customer.deleted_at is not None
+    return Customer._base_manager.filter(pk=instance.customer_id, deleted_at__isnull=False).exists()
+
+
+def contributions(instance, owner_deleted=False):
+    """Bir kaydın sayaçlara katkısı: {sayaç adı: (adet, tutar)}
+
+    Silinmiş müşteri ve (``owner_deleted``) silinmiş müşterinin kayıtları sayılmaz.
+    """
+    zero = Decimal('0')
+    if isinstance(instance, Customer):
+        return {} if instance.deleted_at else {'customer.total': (1, zero)}
+    if owner_deleted:
+        return {}
+    if isinstance(instance, HostingService):
+        return {
+            'hosting.total': (1, zero),
+            f'hosting.status.{instance.status}': (1, zero),
+        }
+    if isinstance(instance, (Domain, SSLCertificate)):
+        prefix = 'domain' if isinstance(instance, Domain) else 'ssl'
+        result = {f'{prefix}.total': (1, zero)}
+        if instance.is_active:
+            result[f'{prefix}.active'] = (1, zero)
+        return result
+    if isinstance(instance, Invoice):
+        amount = Decimal(instance.amount or 0)
+        return {
+            'invoice.total': (1, amount),
+            f'invoice.status.{instance.payment_status}': (1, amount),
+        }
+    return {}
+
+
+def diff_contributions(old, new):
+    deltas = {}
+    for name in set(old) | set(new):
+        old_count, old_amount = old.get(name, (0, Decimal('0')))
+        new_count, new_amount = new.get(name, (0, Decimal('0')))
+        if old_count != new_count or old_amount != new_amount:
+            deltas[name] = (new_count - old_count, new_amount - old_amount)
+    return deltas
+
+
+def sum_contributions(instances, contribution=contributions):
+    """Yeni eklenen kayıtların toplam katkısı; bulk_create sonrası apply_deltas'a verilir."""
+    total = {}
+    for instance in instances:
+        for name, (count, amount) in contribution(instance).items():
+            old_count, old_amount = total.get(name, (0, Decimal('0')))
+            total[name] = (old_count + count, old_amount + amount)
+    return total
+
+
+def apply_deltas(deltas):
+    if not deltas:
+        return
+    with transaction.atomic():
+        for name, (count, amount) in deltas.items():
+            updated = DashboardCounter.objects.filter(name=name).update(
+                count=F('count') + count,
+                amount=F('amount') + amount,
+            )
+            if not updated:
+                DashboardCounter.objects.get_or_create(name=name)
+                DashboardCounter.objects.filter(name=name).update(
+                    count=F('count') + count,
+                    amount=F('amount') + amount,
+                )
+
+
+def _customer_counters(scope):
+    return {'customer.total': (Customer.objects.count(), Decimal('0'))}
+
+
+def _hosting_counters(scope):
+    counters, total = {}, 0
+    for row in HostingService.objects.filter(scope).values('status').annotate(count=Count('id')).order_by():
+        counters[f"hosting.status.{row['status']}"] = (row['count'], Decimal('0'))
+        total += row['count']
+    counters['hosting.total'] = (total, Decimal('0'))
+    return counters
+
+
+def _expiry_counters(model, scope):
+    prefix = 'domain' if model is Domain else 'ssl'
+    row = model.objects.filter(scope).aggregate(total=Count('id'), active=Count('id', filter=Q(is_active=True)))
+    return {
+        f'{prefix}.total': (row['total'], Decimal('0')),
+        f'{prefix}.active': (row['active'], Decimal('0')),
+    }
+
+
+def _invoice_counters(scope):
+    zero = Decimal('0')
+    counters, count, total = {}, 0, zero
+    rows = Invoice.objects.filter(scope).values('payment_status').annotate(count=Count('id'), amount=Sum('amount')).order_by()
+    for row in rows:
+        # SQLite SUM ondalıkları float olarak toplar; kuruşa yuvarla
+        amount = (row['amount'] or zero).quantize(CENT)
+        counters[f"invoice.status.{row['payment_status']}"] = (row['count'], amount)
+        count += row['count']
+        total += amount
+    counters['invoice.total'] = (count, total)
+    return counters
+
+
+# Model -> (sayaç adı öneki, sayaçları hesaplayan fonksiyon(kapsam), sayaçları etkileyen alanlar).
+# customer_id de sayılan alandır: kayıt silinmiş müşteriye taşınırsa sayılmaz olur.
+COUNTERS = {
+    Customer: ('customer.', _customer_counters, {'deleted_at'}),
+    HostingService: ('hosting.', _hosting_counters, {'status', 'customer', 'customer_id'}),
+    Domain: ('domain.', lambda scope: _expiry_counters(Domain, scope), {'is_active', 'customer', 'customer_id'}),
+    SSLCertificate: (
+        'ssl.', lambda scope: _expiry_counters(SSLCertificate, scope), {'is_active', 'customer', 'customer_id'},
+    ),
+    Invoice: ('invoice.', _invoice_counters, {'payment_status', 'amount', 'customer', 'customer_id'}),
+}
+
+
+def counts_fields(model, fields):
+    """``fields`` güncellemesi modelin sayaçlarını değiştirebilir mi? (None: her şey değişmiş olabilir)"""
+    return model in COUNTERS and (fields is None or bool(set(fields) & COUNTERS[model][2]))
+
+
+def compute_counters(models=None, scope=LIVE_OWNER):
+    """Sayaçları canlı tablolardan baştan hesaplar (GROUP BY ile model başına bir sorgu).
+
+    ``scope`` müşteriye bağlı modellerin satırlarını süzer; varsayılan silinmemiş müşterilerinkiler.
+    """
+    counters = {}
+    for model in (models or COUNTERS):
+        counters.update(COUNTERS[model][1](scope))
+    return counters
+
+
+def discount_owner(customer_id):
+    """Silinmek üzere işaretlenen müşterinin kayıtlarının katkısını sayaçlardan düşer (soft_delete)."""
+    owned = compute_counters(OWNED_MODELS, scope=Q(customer_id=customer_id))
+    apply_deltas(diff_contributions(owned, {}))
+
+
+def stored_counters():
+    return {
+        name: (count, amount)
+        for name, count, amount in DashboardCounter.objects.values_list('name', 'count', 'amount')
+    }
+
+
+async def astored_counters():
+    return {
+        name: (count, amount)
+        async for name, count, amount in DashboardCounter.objects.values_list('name', 'count', 'amount')
+    }
+
+
+def find_drift(stored=None, live=None):
+    """Kayıtlı ve canlı sayaçlar arasındaki farklar: {ad: (kayıtlı, canlı)}"""
+    stored = stored_counters() if stored is None else stored
+    live = compute_counters() if live is None else live
+    empty = (0, Decimal('0'))
+    return {
+        name: (stored.get(name, empty), live.get(name, empty))
+        for name in set(stored) | set(live)
+        if stored.get(name, empty) != live.get(name, empty)
+    }
+
+
+def rebuild_counters(models=None):
+    """Verilen modellerin (None: hepsinin) sayaçlarını yeniden yazar."""
+    live = compute_counters(models)
+    stale = DashboardCounter.objects.exclude(name__in=live)
+    if models is not None:
+        prefixes = Q()
+        for model in models:
+            prefixes |= Q(name__startswith=COUNTERS[model][0])
+        stale = stale.filter(prefixes)
+    with transaction.atomic():
+        stale.delete()
+        for name, (count, amount) in live.items():
+            DashboardCounter.objects.update_or_create(
+                name=name, defaults={'count': count, 'amount': amount},
+            )
+    return live
+
+
+def _window_queries(now=None):
+    # Yalnızca tarih penceresine düşen satırları tarayan sorgular: ad -> (queryset, aggregate'ler)
+    # aggregate'ler None ise count() kullanılır
+    w = _windows(now)
+    expiry = {
+        'expired': Count('id', filter=Q(expiration_date__lt=w['today'])),
+        'expiring_soon': Count('id', filter=Q(is_active=True)),
+    }
+    return {
+        'new_customers': (Customer.objects.filter(created_at__gte=w['thirty_days_ago']), None),
+        'hosting_expiring': (
+            HostingService.objects.filter(LIVE_OWNER, status='active', expiration_date__lte=w['soon']), None,
+        ),
+        'domain': (Domain.objects.filter(LIVE_OWNER, expiration_date__lte=w['soon']), expiry),
+        'ssl': (SSLCertificate.objects.filter(LIVE_OWNER, expiration_date__lte=w['soon']), expiry),
+        # Son taramadan sonra vadesi geçenler; overdue sayacına eklenip pending'den düşülür
+        'late_pending': (
+            Invoice.objects.filter(LIVE_OWNER, payment_status='pending', due_date__lt=w['today']),
+            {'count': Count('id'), 'amount': Sum('amount')},
+        ),
+    }
+
+
+def _window_stats(now=None):
+    return {
+        name: queryset.aggregate(**aggregates) if aggregates else queryset.count()
+        for name, (queryset, aggregates) in _window_queries(now).items()
+    }
+
+
+async def _awindow_stats(now=None):
+    queries = _window_queries(now)
+    results = await asyncio.gather(*(
+        queryset.aaggregate(**aggregates) if aggregates else queryset.acount()
+        for queryset, aggregates in queries.values()
+    ))
+    return dict(zip(queries, results))
+
+
+def _dashboard_stats(counters, window):
+    zero = Decimal('0')
+
+    def count(name):
+        return counters.get(name, (0, zero))[0]
+
+    def money(name, count_delta=0, amount_delta=zero):
+        c, amount = counters.get(name, (0, zero))
+        c, amount = c + count_delta, amount + amount_delta
+        return {'count': c, 'amount': amount if c else None}
+
+    # Son taramadan sonra vadesi geçen pending faturalar gecikmiş sayılır
+    late_count = window['late_pending']['count']
+    late_amount = window['late_pending']['amount'] or zero
+
+    return {
+        'customer_stats': {
+            'total': count('customer.total'),
+            'new': window['new_customers'],
+        },
+        'hosting_stats': {
+            'total': count('hosting.total'),
+            'active': count('hosting.status.active'),
+            'suspended': count('hosting.status.suspended'),
+            'expired': count('hosting.status.expired'),
+            'expiring_soon': window['hosting_expiring'],
+        },
+        'domain_stats': {
+            'total': count('domain.total'),
+            'active': count('domain.active'),
+            **window['domain'],
+        },
+        'ssl_stats': {
+            'total': count('ssl.total'),
+            'active': count('ssl.active'),
+            **window['ssl'],
+        },
+        'invoice_stats': {
+            'total': money('invoice.total'),
+            'paid': money('invoice.status.paid'),
+            'pending': money('invoice.status.pending', -late_count, -late_amount),
+            'overdue': money('invoice.status.overdue', late_count, late_amount),
+        },
+    }
+
+
+def get_dashboard_stats(now=None):
+    """Dashboard sayaçları; sabit sayaçlar DashboardCounter tablosundan tek sorguyla okunur.
+
+    Yalnızca okur: sayaçlar migration'da (0017) ve rebuild_dashboard_stats ile doldurulur.
+    """
+    return _dashboard_stats(stored_counters(), _window_stats(now))
+
+
+async def aget_dashboard_stats(now=None):
+    """get_dashboard_stats'ın async karşılığı; sayaç ve pencere sorguları birlikte beklenir."""
+    counters, window = await asyncio.gather(astored_counters(), _awindow_stats(now))
+    return _dashboard_stats(counters, window)
@@ -0,0 +1,73 @@
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import HostingService, Invoice, SweepRun
+from . import changes, signals
+
+# Ödenmemiş faturalar: vadesi geçmemiş (pending) ve geçmiş (overdue)
+UNPAID_STATUSES = ('pending', 'overdue')
+
+
+def overdue_q(today=None):
+    """Gecikmiş faturalar: durum sütunu 'overdue' olanlar ve son taramadan sonra vadesi geçenler.
+
+    İkinci koşul invoice_pending_due_idx (yalnızca pending satırlar) üzerinde bir
+    aralık okumasıdır; tarama düzenli çalıştıkça neredeyse boştur.
+    """
+    today = today or timezone.localdate()
+    return Q(payment_status='overdue') | Q(payment_status='pending', due_date__lt=today)
+
+
+def pending_q(today=None):
+    """Vadesi henüz gelmemiş ödenmemiş faturalar (overdue_q ile kesişmez)."""
+    today = today or timezone.localdate()
+    return Q(payment_status='pending', due_date__gte=today)
+
+
+def unpaid_q():
+    return Q(payment_status__in=UNPAID_STATUSES)
+
+
+def last_sweep():
+    return SweepRun.objects.order_by('-ran_at').first()
+
+
+def sweep(today=None, dry_run=False):
+    """Tarihi geçen durumları kalıcı hale getirir; üç küme UPDATE'i tek transaction'da.
+
+    - vadesi geçmiş pending faturalar -> overdue
+    - süresi dolmuş aktif hostingler -> expired (süresi uzatılmış expired -> active)
+
+    overdue faturalar geri alınmaz: elle gecikmiş işaretlenmiş de olabilirler ve vade yalnızca
+    fatura düzenlenirken ileri alınır (durum aynı formda seçilir).
+
+    Domain ve SSL'in ayrı bir durum sütunu yok; "süresi dolmuş" sayıları zaten
+    expiration_date index'i üzerinden okunur. Çalıştırma SweepRun'a kaydedilir.
+    """
+    today = today or timezone.localdate()
+    updates = {
+        'overdue_invoices': (Invoice, Q(payment_status='pending', due_date__lt=today), {'payment_status': 'overdue'}),
+        'expired_hosting': (HostingService, Q(status='active', expiration_date__lt=today), {'status': 'expired'}),
+        'reactivated_hosting': (HostingService, Q(status='expired', expiration_date__gte=today), {'status': 'active'}),
+    }
+    if dry_run:
+        counts = {name: model.objects.filter(condition).count() for name, (model, condition, _) in updates.items()}
+        return SweepRun(as_of=today, **counts)
+
+    now = timezone.now()
+    with transaction.atomic():
+        counts = {}
+        for name, (model, condition, values) in updates.items():
+            # QuerySet.update auto_now alanını doldurmaz; olaylar güncellenecek satırlar için önce yazılır
+            changes.record_queryset(model.objects.filter(condition))
+            counts[name] = model.objects.filter(condition).update(**values, updated_at=now)
+        run = SweepRun.objects.create(as_of=today, **counts)
+
+    # QuerySet.update post_save göndermez; sayaçlar ve önbellek tazelenir. pending -> overdue
+    # gelir özetlerini değiştirmez (ikisi de "open"), bu yüzden etkilenen dönem yoktur
+    for model, names, extra in ((Invoice, ('overdue_invoices',), {'periods': ()}),
+                                (HostingService, ('expired_hosting', 'reactivated_hosting'), {})):
+        if any(counts[name] for name in names):
+            signals.bulk_changed.send(sender=model, fields=list(updates[names[0]][2]), **extra)
+    return run
@@ -1,3 +1,1717 @@
-from django.test import TestCase
+import csv
+import io
+import json
+import re
+import tempfile
+import time
+import zipfile
+from xml.etree import ElementTree
+from datetime import date, timedelta
+from importlib import import_module
+from decimal import Decimal
+from unittest import mock
 
-# Create your tests here.
+from django.apps import apps as django_apps
+from django.contrib.admin.models import LogEntry
+from django.contrib.auth.models import User
+from django.contrib.sessions.models import Session
+from django.core import mail
+from django.core.exceptions import MiddlewareNotUsed
+from django.core.management import CommandError, call_command
+from django.db import connection, connections
+from django.db.models.signals import post_delete, post_save, pre_save
+from django.test import RequestFactory, TestCase, override_settings
+from django.template import engines
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from django.utils import timezone
+
+from . import changes, nameservers, renewals, revenue
+from .admin import InvoiceAdmin
+from .autocomplete import suggest
+from .checks import check_shared_cache
+from .cache import _version_key, bump, get_cache, stats as cache_stats
+from .db import ReplicaRouter, journal_mode, read_from_replica, replica_reads, set_journal_mode
+from .importers import import_files
+from .metrics import Histogram, InstrumentedDjangoTemplates, RequestMetricsMiddleware, registry as metrics_registry
+from .lists import LISTS, paginate_options
+from .models import (
+    Customer, DashboardCounter, Domain, DomainNameserver, HostingService, SSLCertificate, Invoice, ReminderLog, Renewal,
+    RevenueRollup,
+)
+from .pagination import encode_cursor, keyset_paginate
+from .query_plans import check_plans, supports_plan_check
+from .reminders import pending_digests, send_digests
+from .purge import purge, soft_delete
+from .renewals import bulk_renew, generate_renewal_invoices
+from .search import fold, search
+from .signals import bulk_changed
+from .stats import find_drift, get_dashboard_stats
+from .sweeper import last_sweep, sweep
+
+
+# Testler gerçek önbellek dizinine (BASE_DIR/cache) yazmaz ve onu silmez; aynı checkout'ta
+# çalışan sitenin önbelleği etkilenmez
+TEST_CACHES = {
+    'default': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache'},
+    'customers': {'BACKEND': 'django.core.cache.backends.locmem.LocMemCache', 'LOCATION': 'customers-tests'},
+}
+_test_caches = override_settings(CACHES=TEST_CACHES)
+
+
+def setUpModule():
+    _test_caches.enable()
+
+
+def tearDownModule():
+    _test_caches.disable()
+
+
+class QueryPlanTests(TestCase):
+    def test_view_queries_use_indexes(self):
+        if not supports_plan_check():
+            self.skipTest('Plan kontrolü bu veritabanında desteklenmiyor.')
+        for label, ok, plan in check_plans():
+            with self.subTest(label):
+                self.assertTrue(ok, plan)
+
+
+def create_rows(rows):
+    """Her modelden ``rows`` kayıt (müşteriler onda bir); sayaçlar ve index'ler tazelenir."""
+    today = date.today()
+    customer_count = max(1, rows // 10)
+    customers = Customer.objects.bulk_create(
+        Customer(
+            company_name=f'Firma {i}', contact_name=f'Kişi {i}', email=f'firma{i}@example.com',
+            phone='555', registration_date=today,
+        )
+        for i in range(customer_count)
+    )
+    domains = Domain.objects.bulk_create(
+        Domain(
+            customer=customers[i % customer_count], name=f'alan{i}.com',
+            registration_date=today, expiration_date=today + timedelta(days=i % 60),
+            nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+        )
+        for i in range(rows)
+    )
+    HostingService.objects.bulk_create(
+        HostingService(
+            customer=domain.customer, domain=domain, package='Başlangıç', status='active',
+            start_date=today, expiration_date=domain.expiration_date,
+        )
+        for domain in domains
+    )
+    SSLCertificate.objects.bulk_create(
+        SSLCertificate(
+            customer=domain.customer, domain=domain,
+            start_date=today, expiration_date=domain.expiration_date,
+        )
+        for domain in domains
+    )
+    Invoice.objects.bulk_create(
+        Invoice(
+            customer=customers[i % customer_count], invoice_number=f'F{i}', description='Hosting',
+            amount=Decimal('100.00'), issue_date=today, due_date=today + timedelta(days=(i % 60) - 30),
+            payment_status='paid' if i % 3 == 0 else 'pending',
+        )
+        for i in range(rows)
+    )
+    changes.record(Domain, [domain.pk for domain in domains])
+    for model in (Customer, Domain, HostingService, SSLCertificate, Invoice):
+        bulk_changed.send(sender=model)
+
+
+class QueryCountMixin:
+    """Sorgu sayısı satır sayısından bağımsız olmalı; alt sınıflar ROWS belirler."""
+
+    ROWS = 10
+
+    # Her istekte oturum + kullanıcı için 2 sorgu vardır
+    EXPECTED_QUERIES = {
+        'customers:dashboard': 10,
+        'customers:customer-list': 3,
+        'customers:hosting-list': 3,
+        'customers:domain-list': 3,
+        'customers:ssl-list': 3,
+        'customers:invoice-list': 3,
+        'customers:customer-detail': 8,
+        # Detay sayfaları: kayıt + son yenilemeler
+        'customers:hosting-detail': 4,
+        'customers:domain-detail': 4,
+        'customers:ssl-detail': 4,
+        'customers:invoice-detail': 3,
+        'customers:api-expirations': 3,
+        'customers:api-revenue': 4,
+        'customers:async-dashboard': 10,
+        'customers:async-customer-list': 3,
+        'customers:async-customer-detail': 8,
+        'customers:async-hosting-list': 3,
+        'customers:async-domain-list': 3,
+        'customers:async-ssl-list': 3,
+        'customers:async-invoice-list': 3,
+        # Form sayfaları: müşteri/domain seçenekleri gömülmez, yalnızca seçili kayıt okunur
+        'customers:hosting-add': 2,
+        'customers:domain-add': 2,
+        'customers:ssl-add': 2,
+        'customers:invoice-add': 2,
+        'customers:hosting-edit': 5,
+        'customers:domain-edit': 4,
+        'customers:ssl-edit': 5,
+        'customers:invoice-edit': 4,
+        # Değişiklik akışı: olaylar + sayfadaki domainler (tek IN sorgusu)
+        'customers:api-changes': 4,
+    }
+
+    # Admin: (URL adı, sorgu dizesi, sorgu sayısı). Toplam sayaçtan ya da sınırlı sayımla,
+    # tarih hiyerarşisi dönem başına bir index aramasıyla; satır sayısından bağımsız
+    ADMIN_EXPECTED_QUERIES = [
+        ('admin:customers_customer_changelist', '', 4),
+        ('admin:customers_domain_changelist', '', 4),
+        ('admin:customers_hostingservice_changelist', '', 9),
+        ('admin:customers_sslcertificate_changelist', '', 4),
+        ('admin:customers_invoice_changelist', '', 8),
+        ('admin:customers_invoice_changelist', '?payment_status=pending', 6),
+        ('admin:customers_invoice_changelist', f'?issue_date__year={date.today().year}', 6),
+        ('admin:autocomplete', '?app_label=customers&model_name=invoice&field_name=customer&term=Firma', 4),
+    ]
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        create_rows(cls.ROWS)
+
+    def setUp(self):
+        # Sorgu sayıları önbelleğin boş olduğu (ıska) durum için
+        get_cache().clear()
+        self.client.force_login(self.user)
+
+    def url_for(self, name):
+        model = {
+            'customers:customer-detail': Customer,
+            'customers:async-customer-detail': Customer,
+            'customers:hosting-detail': HostingService,
+            'customers:domain-detail': Domain,
+            'customers:ssl-detail': SSLCertificate,
+            'customers:invoice-detail': Invoice,
+            'customers:hosting-edit': HostingService,
+            'customers:domain-edit': Domain,
+            'customers:ssl-edit': SSLCertificate,
+            'customers:invoice-edit': Invoice,
+        }.get(name)
+        if model is None:
+            return reverse(name)
+        return reverse(name, args=[model.objects.order_by('pk').values_list('pk', flat=True).first()])
+
+    def test_query_counts(self):
+        for name, expected in self.EXPECTED_QUERIES.items():
+            url = self.url_for(name)
+            # Senkron ve async görünümler aynı önbellek kayıtlarını paylaşır
+            get_cache().clear()
+            with self.subTest(name):
+                with self.assertNumQueries(expected):
+                    response = self.client.get(url)
+                self.assertEqual(response.status_code, 200)
+
+    def test_admin_query_counts(self):
+        for name, query_string, expected in self.ADMIN_EXPECTED_QUERIES:
+            with self.subTest(name, query_string=query_string):
+                with self.assertNumQueries(expected):
+                    response = self.client.get(reverse(name) + query_string)
+                self.assertEqual(response.status_code, 200)
+
+    def test_admin_counts_without_full_scan(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('admin:customers_invoice_changelist'))
+        self.assertEqual(response.context['cl'].result_count, self.ROWS)
+        self.assertFalse([q['sql'] for q in queries if 'COUNT(' in q['sql'] or 'DISTINCT' in q['sql']])
+        pending = self.client.get(reverse('admin:customers_invoice_changelist') + '?payment_status=pending')
+        self.assertEqual(pending.context['cl'].result_count, Invoice.objects.filter(payment_status='pending').count())
+
+
+class AsyncViewEquivalenceTests(TestCase):
+    """/async/ görünümleri senkron karşılıklarıyla aynı context'i ve HTML'i üretir."""
+
+    # Liste adı -> URL adı (async karşılığı async- önekli)
+    LIST_URLS = {
+        'customers': 'customer-list',
+        'hosting': 'hosting-list',
+        'domains': 'domain-list',
+        'ssl': 'ssl-list',
+        'invoices': 'invoice-list',
+    }
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        create_rows(30)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def both(self, name, args=(), params=None):
+        # Önbellek iki yolda ortak; her yanıt kendi sorgularıyla üretilsin
+        responses = []
+        for url_name in (f'customers:{name}', f'customers:async-{name}'):
+            get_cache().clear()
+            response = self.client.get(reverse(url_name, args=args), params or {})
+            self.assertEqual(response.status_code, 200, url_name)
+            responses.append(response)
+        sync, async_ = responses
+        # CSRF belirteci her yanıtta farklı maskelenir
+        html = [re.sub(rb'name="csrfmiddlewaretoken" value="[^"]*"', b'', r.content) for r in responses]
+        self.assertEqual(html[0], html[1], name)
+        return sync.context, async_.context
+
+    def page_state(self, page):
+        return [obj.pk for obj in page], page.has_previous, page.has_next, page.previous_cursor, page.next_cursor
+
+    def test_dashboard(self):
+        sync, async_ = self.both('dashboard')
+        for key in ('customer_stats', 'hosting_stats', 'domain_stats', 'ssl_stats', 'invoice_stats'):
+            self.assertEqual(sync[key], async_[key], key)
+        for key in ('recent_customers', 'pending_invoices'):
+            self.assertEqual([obj.pk for obj in sync[key]], [obj.pk for obj in async_[key]], key)
+        for kind in ('hosting', 'domains', 'ssl'):
+            self.assertEqual(
+                [obj.pk for obj in sync['expiring_services'][kind]],
+                [obj.pk for obj in async_['expiring_services'][kind]],
+                kind,
+            )
+
+    def test_customer_detail(self):
+        sync, async_ = self.both('customer-detail', args=[Customer.objects.order_by('pk').first().pk])
+        self.assertEqual(sync['customer'].pk, async_['customer'].pk)
+        self.assertEqual(sync['invoice_stats'], async_['invoice_stats'])
+        for key in ('hosting_services', 'domains', 'ssl_certificates', 'invoices'):
+            self.assertEqual([obj.pk for obj in sync[key]], [obj.pk for obj in async_[key]], key)
+
+    def test_lists_walk_the_same_keyset_pages(self):
+        for name, url_name in self.LIST_URLS.items():
+            options = LISTS[name]
+            for sort in (options['default_sort'], f"-{options['sort_fields'][0]}"):
+                with self.subTest(name, sort=sort):
+                    params = {'sort': sort, 'page_size': 2 if name == 'customers' else 7}
+                    # İleri: senkron yanıtın imleciyle her iki görünümde bir sonraki sayfa
+                    pages = []
+                    while True:
+                        sync, async_ = self.both(url_name, params=params)
+                        self.assertEqual(self.page_state(sync['page']), self.page_state(async_['page']))
+                        pages.append(sync['page'])
+                        if not sync['page'].has_next:
+                            break
+                        params = {**params, 'after': sync['page'].next_cursor}
+                    self.assertGreater(len(pages), 1)
+                    # Geri: before imleciyle
+                    params.pop('after', None)
+                    sync, async_ = self.both(url_name, params={**params, 'before': pages[-1].previous_cursor})
+                    self.assertEqual(self.page_state(sync['page']), self.page_state(async_['page']))
+                    self.assertEqual([obj.pk for obj in sync['page']], [obj.pk for obj in pages[-2]])
+
+
+class ExpirationIndexTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        create_rows(40)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_cursor_walks_merged_stream_in_order(self):
+        url = reverse('customers:api-expirations') + '?start=2000-01-01&end=2100-01-01&page_size=7'
+        items, cursor = [], ''
+        while True:
+            data = self.client.get(url + cursor).json()
+            items += [(item['expiration_date'], item['type'], item['id']) for item in data['items']]
+            if not data['has_next']:
+                break
+            cursor = '&after=' + data['next_cursor']
+        self.assertEqual(items, sorted(items))
+        self.assertEqual(len(items), Domain.objects.count() + HostingService.objects.count() + SSLCertificate.objects.count())
+
+    def test_type_and_date_filters(self):
+        url = reverse('customers:api-expirations')
+        today = date.today()
+        data = self.client.get(url, {'type': 'ssl', 'start': today, 'end': today + timedelta(days=10)}).json()
+        self.assertTrue(data['items'])
+        for item in data['items']:
+            self.assertEqual(item['type'], 'ssl')
+            self.assertLessEqual(item['expiration_date'], str(today + timedelta(days=10)))
+        self.assertEqual(self.client.get(url, {'type': 'fatura'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'start': '2024-02-30'}).status_code, 400)
+
+
+class ApiTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        create_rows(40)
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_sparse_fields_and_embeds_in_constant_queries(self):
+        url = reverse('customers:api-list', args=['hosting'])
+        params = {'fields': 'id,status', 'embed': 'customer,domain', 'fields.domain': 'name', 'page_size': 10}
+        with self.assertNumQueries(3):
+            data = self.client.get(url, params).json()
+        self.assertEqual(len(data['items']), 10)
+        self.assertEqual(set(data['items'][0]), {'id', 'status', 'customer', 'domain'})
+        self.assertEqual(set(data['items'][0]['domain']), {'name'})
+
+        # Geri ilişkiler sayfa başına tek ek sorgu
+        with self.assertNumQueries(4):
+            data = self.client.get(reverse('customers:api-list', args=['customers']), {'embed': 'domains'}).json()
+        self.assertEqual(sum(len(item['domains']) for item in data['items']), Domain.objects.count())
+
+    def test_cursor_and_errors(self):
+        url = reverse('customers:api-list', args=['invoices'])
+        first = self.client.get(url, {'page_size': 25}).json()
+        second = self.client.get(url, {'page_size': 25, 'after': first['next_cursor']}).json()
+        ids = [item['id'] for item in first['items'] + second['items']]
+        self.assertEqual(len(ids), Invoice.objects.count())
+        self.assertEqual(len(set(ids)), len(ids))
+        self.assertEqual(self.client.get(url, {'fields': 'id,sifre'}).status_code, 400)
+        self.assertEqual(self.client.get(url, {'embed': 'domains'}).status_code, 400)
+        self.assertEqual(self.client.get(reverse('customers:api-list', args=['kullanicilar'])).status_code, 404)
+
+
+class KeysetPaginationTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        today = date.today()
+        # Aynı adlar ve tarihler: eşitlikte pk sırası belirler
+        Customer.objects.bulk_create(
+            Customer(
+                company_name=f'Firma {i % 4}', contact_name='Kişi', email=f'firma{i}@example.com', phone='555',
+                registration_date=today - timedelta(days=i % 3),
+            )
+            for i in range(11)
+        )
+
+    def setUp(self):
+        self.factory = RequestFactory()
+
+    def paginate(self, **params):
+        request = self.factory.get('/', params)
+        return keyset_paginate(request, LISTS['customers']['queryset'](), **paginate_options('customers'))
+
+    def walk(self, **params):
+        # İleri: after imleciyle son sayfaya kadar; (sayfalar, son sayfa) döner
+        pages, cursor = [], {}
+        while True:
+            page = self.paginate(**params, **cursor)
+            pages.append([customer.pk for customer in page])
+            if not page.has_next:
+                return pages, page
+            cursor = {'after': page.next_cursor}
+
+    def test_walks_forward_and_back_without_gaps(self):
+        for sort, ordering in (('company_name', ('company_name', 'pk')), ('-registration_date', ('-registration_date', '-pk'))):
+            with self.subTest(sort):
+                pages, page = self.walk(sort=sort, page_size=3)
+                expected = list(Customer.objects.order_by(*ordering).values_list('pk', flat=True))
+                self.assertEqual([pk for page_ids in pages for pk in page_ids], expected)
+                self.assertEqual([len(page_ids) for page_ids in pages], [3, 3, 3, 2])
+
+                # Son sayfadan before imleciyle geri: aynı sayfalar ters sırada
+                back = []
+                while page.has_previous:
+                    page = self.paginate(sort=sort, page_size=3, before=page.previous_cursor)
+                    back.append([customer.pk for customer in page])
+                self.assertEqual(back, pages[-2::-1])
+                self.assertTrue(page.has_next)
+
+    def test_invalid_cursors_fall_back_to_first_page(self):
+        first = [customer.pk for customer in self.paginate(page_size=3)]
+        other_sort = self.paginate(sort='registration_date', page_size=3).next_cursor
+        for cursor in (
+            'bozuk!', 'e30', encode_cursor('company_name', 'Firma 1'), encode_cursor('company_name', ['Firma 1']),
+            encode_cursor('company_name', ['Firma 1', 'x']), other_sort,
+        ):
+            for direction in ('after', 'before'):
+                with self.subTest(cursor=cursor, direction=direction):
+                    page = self.paginate(page_size=3, **{direction: cursor})
+                    self.assertEqual([customer.pk for customer in page], first)
+                    self.assertFalse(page.has_previous)
+        # Tarih alanında geçersiz değer de ilk sayfaya döner
+        page = self.paginate(sort='registration_date', page_size=3, after=encode_cursor('registration_date', ['2024-02-30', 1]))
+        self.assertFalse(page.has_previous)
+
+    def test_sort_search_and_page_size_params(self):
+        self.assertEqual(self.paginate(sort='email').sort, 'company_name')
+        self.assertEqual(self.paginate(sort='-company_name').sort, '-company_name')
+        self.assertEqual({customer.company_name for customer in self.paginate(q='firma 2')}, {'Firma 2'})
+        self.assertEqual(len(self.paginate(q='firma 2')), 3)
+        self.assertEqual(len(self.paginate(q='yok')), 0)
+        self.assertIsNone(self.paginate(q='yok').next_cursor)
+        self.assertEqual(self.paginate(page_size=0).page_size, 1)
+        self.assertEqual(self.paginate(page_size='abc').page_size, 50)
+        self.assertEqual(self.paginate(page_size=10 ** 6).page_size, 500)
+
+    def test_search_folds_turkish_case_on_key_columns(self):
+        Customer.objects.create(
+            company_name='ŞAHİN IŞIK Ltd', contact_name='Kişi', email='sahin@example.com', phone='555',
+            registration_date=date.today(),
+        )
+        for query in ('şahin ışık', 'Şahin Işık', 'SAHIN isik', 'ŞAHİN'):
+            with self.subTest(query):
+                self.assertEqual([customer.company_name for customer in self.paginate(q=query)], ['ŞAHİN IŞIK Ltd'])
+
+    def test_list_rows_are_not_numbered_per_page(self):
+        # Sıra numarası her keyset sayfasında 1'den başlardı
+        self.client.force_login(self.user)
+        params = {'page_size': 3, 'after': self.paginate(page_size=3).next_cursor}
+        response = self.client.get(reverse('customers:customer-list'), params)
+        self.assertNotContains(response, '<th>#</th>')
+
+    def test_list_view_ignores_tampered_cursor(self):
+        self.client.force_login(self.user)
+        url = reverse('customers:customer-list')
+        for params in ({'after': 'bozuk!'}, {'before': encode_cursor('company_name', [{'x': 1}, None])}, {'sort': 'parola'}):
+            with self.subTest(params):
+                response = self.client.get(url, params)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.context['page']), 11)
+
+
+@override_settings(CUSTOMERS_METRICS_ENABLED=True, CUSTOMERS_METRICS_TOKEN='gizli')
+class MetricsTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.staff = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        cls.user = User.objects.create_user('kullanici', 'kullanici@example.com', 'parola')
+        Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=date.today(),
+        )
+
+    def setUp(self):
+        metrics_registry.reset()
+        self.addCleanup(metrics_registry.reset)
+
+    def test_records_request_sql_and_template_per_view(self):
+        self.client.force_login(self.user)
+        for _ in range(2):
+            self.assertEqual(self.client.get(reverse('customers:customer-list')).status_code, 200)
+        view = metrics_registry.snapshot()['customers:customer-list']
+        self.assertEqual(view['requests'], 2)
+        self.assertGreaterEqual(view['queries']['avg'], 1)
+        self.assertGreater(view['sql_ms']['avg'], 0)
+        self.assertGreater(view['template_ms']['avg'], 0)
+        self.assertLessEqual(view['template_ms']['avg'], view['request_ms']['avg'])
+        self.assertIn('SELECT', view['slowest_sql'])
+
+    def test_template_backend_measures_only_inside_requests(self):
+        backend = next(engine for engine in engines.all() if isinstance(engine, InstrumentedDjangoTemplates))
+        # İstek dışında (komutlar, e-posta) şablon normal render edilir, ölçüm yazılmaz
+        self.assertEqual(backend.from_string('{{ ad }}!').render({'ad': 'Acme'}), 'Acme!')
+        # Sarmalayıcı diğer özellikleri asıl şablona devreder
+        self.assertEqual(backend.get_template('customers/customer_list.html').origin.template_name, 'customers/customer_list.html')
+        self.assertEqual(metrics_registry.snapshot(), {})
+
+    def test_endpoint_requires_staff_or_token(self):
+        url = reverse('customers:metrics')
+        self.client.get(reverse('login'))
+        self.assertEqual(self.client.get(url).status_code, 403)
+        self.assertEqual(self.client.get(url, headers={'Authorization': 'Bearer yanlis'}).status_code, 403)
+        self.assertEqual(self.client.get(url, headers={'Authorization': 'gizli'}).status_code, 403)
+        self.client.force_login(self.user)
+        self.assertEqual(self.client.get(url).status_code, 403)
+
+        self.client.logout()
+        response = self.client.get(url, headers={'Authorization': 'Bearer gizli'})
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain'))
+        self.assertIn('agora_request_duration_ms_bucket{view="login",le="+Inf"} 1', response.content.decode())
+
+        self.client.force_login(self.staff)
+        data = self.client.get(url, {'format': 'json'}).json()
+        self.assertIn('customers:metrics', data['views'])
+        self.assertIn('cache', data)
+
+    @override_settings(CUSTOMERS_METRICS_TOKEN=None)
+    def test_unset_token_never_matches(self):
+        url = reverse('customers:metrics')
+        for header in ('Bearer None', 'Bearer ', ''):
+            with self.subTest(header=header):
+                self.assertEqual(self.client.get(url, headers={'Authorization': header}).status_code, 403)
+
+    @override_settings(CUSTOMERS_METRICS_ENABLED=False)
+    def test_disabled_middleware_leaves_the_chain(self):
+        with self.assertRaises(MiddlewareNotUsed):
+            RequestMetricsMiddleware(lambda request: None)
+
+    def test_histogram_quantiles(self):
+        histogram = Histogram((10, 20, 40))
+        self.assertIsNone(histogram.quantile(0.5))
+        for value in (5, 15, 15, 30):
+            histogram.observe(value)
+        self.assertEqual(histogram.quantile(0.5), 15)
+        self.assertEqual(list(histogram.cumulative()), [(10, 1), (20, 3), (40, 4), ('+Inf', 4)])
+
+
+class ExportTests(TestCase):
+    SHEET = '{http://schemas.openxmlformats.org/spreadsheetml/2006/main}'
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_user('kullanici', 'kullanici@example.com', 'parola')
+        today = date.today()
+        customers = Customer.objects.bulk_create(
+            Customer(
+                company_name=name, contact_name='Çağrı', email='a@example.com', phone='555',
+                registration_date=today, notes=notes,
+            )
+            for name, notes in (('Şahin Lojistik', 'Satır\nsonu, "tırnak"'), ('Acme', 'kontrol\x01karakteri'), ('Beta', None))
+        )
+        Invoice.objects.bulk_create(
+            Invoice(
+                customer=customers[i % 3], invoice_number=f'F{i:03d}', description='Hosting', amount=Decimal('10.50'),
+                issue_date=today - timedelta(days=i), due_date=today, payment_status='paid' if i % 2 else 'pending',
+            )
+            for i in range(120)
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def export(self, name, **params):
+        response = self.client.get(reverse('customers:export', args=[name]), params)
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response.streaming)
+        return response, b''.join(response.streaming_content)
+
+    def test_csv_follows_list_search_and_sort(self):
+        response, content = self.export('customers', q='a', sort='-company_name')
+        self.assertEqual(response['Content-Type'], 'text/csv; charset=utf-8')
+        self.assertRegex(response['Content-Disposition'], r'attachment; filename="customers-\d{4}-\d{2}-\d{2}\.csv"')
+        text = content.decode('utf-8')
+        self.assertTrue(text.startswith('\ufeff'))
+        rows = list(csv.reader(io.StringIO(text[1:])))
+        self.assertEqual(rows[0], [title for title, _ in LISTS['customers']['columns']])
+        self.assertEqual([row[1] for row in rows[1:]], ['Şahin Lojistik', 'Beta', 'Acme'])
+        self.assertEqual(rows[1][11], 'Satır\nsonu, "tırnak"')
+
+    def test_streamed_rows_are_read_from_replica(self):
+        # Akış görünüm döndükten sonra tüketilir; sorgu replica bağlantısına sabitlenmiş olmalı
+        with mock.patch('customers.db.replica_alias', return_value='replica'):
+            with mock.patch('customers.views.export_rows', return_value=iter([])) as export_rows:
+                self.client.get(reverse('customers:export', args=['customers']))
+        self.assertEqual(export_rows.call_args.args[1].db, 'replica')
+
+    def test_csv_writes_choice_labels_in_chunks(self):
+        with mock.patch('customers.exports.CSV_ROWS_PER_CHUNK', 50):
+            response = self.client.get(reverse('customers:export', args=['invoices']))
+            chunks = list(response.streaming_content)
+        # BOM + başlık, ardından 50'şerlik parçalar
+        self.assertEqual(len(chunks), 4)
+        rows = list(csv.reader(io.StringIO(b''.join(chunks).decode('utf-8-sig'))))
+        self.assertEqual(len(rows), 121)
+        self.assertEqual(rows[1][1], 'F000')
+        self.assertEqual({row[7] for row in rows[1:]}, {'Ödendi', 'Beklemede'})
+
+    def test_xlsx_is_a_valid_workbook(self):
+        response = self.client.get(reverse('customers:export', args=['invoices']), {'format': 'xlsx'})
+        self.assertEqual(response['Content-Type'], 'application/vnd.openxmlformats-officedocument.spreadsheetml.sheet')
+        stream = iter(response.streaming_content)
+        # Sabit parçalar satırlar okunmadan gönderilir
+        with self.assertNumQueries(0):
+            chunks = [next(stream)]
+        chunks += list(stream)
+        archive = zipfile.ZipFile(io.BytesIO(b''.join(chunks)))
+        self.assertIsNone(archive.testzip())
+        self.assertEqual(set(archive.namelist()), {
+            '[Content_Types].xml', '_rels/.rels', 'xl/workbook.xml', 'xl/_rels/workbook.xml.rels',
+            'xl/styles.xml', 'xl/worksheets/sheet1.xml',
+        })
+        for part in archive.namelist():
+            ElementTree.fromstring(archive.read(part))
+        workbook = ElementTree.fromstring(archive.read('xl/workbook.xml'))
+        self.assertEqual(workbook.find(f'{self.SHEET}sheets/{self.SHEET}sheet').get('name'), 'Faturalar')
+
+        rows = ElementTree.fromstring(archive.read('xl/worksheets/sheet1.xml')).findall(f'{self.SHEET}sheetData/{self.SHEET}row')
+        self.assertEqual(len(rows), 121)
+        header = [cell.findtext(f'{self.SHEET}is/{self.SHEET}t') for cell in rows[0]]
+        self.assertEqual(header, [title for title, _ in LISTS['invoices']['columns']])
+        first = rows[1]
+        self.assertEqual(first[1].findtext(f'{self.SHEET}is/{self.SHEET}t'), 'F000')
+        self.assertEqual(first[4].findtext(f'{self.SHEET}v'), '10.50')
+        # Tarihler Excel seri numarası, tarih biçimiyle
+        self.assertEqual(first[5].get('s'), '1')
+        self.assertEqual(int(first[5].findtext(f'{self.SHEET}v')), (date.today() - date(1899, 12, 30)).days)
+
+    def test_xlsx_strips_control_characters(self):
+        _, content = self.export('customers', format='xlsx', q='acme')
+        sheet = zipfile.ZipFile(io.BytesIO(content)).read('xl/worksheets/sheet1.xml')
+        rows = ElementTree.fromstring(sheet).findall(f'{self.SHEET}sheetData/{self.SHEET}row')
+        self.assertEqual(rows[1][11].findtext(f'{self.SHEET}is/{self.SHEET}t'), 'kontrolkarakteri')
+
+    def test_streams_in_constant_queries(self):
+        # oturum + kullanıcı + tek sorgu (values_list.iterator); satır sayısından bağımsız
+        for file_format in ('csv', 'xlsx'):
+            with self.subTest(file_format), self.assertNumQueries(3):
+                response = self.client.get(reverse('customers:export', args=['invoices']), {'format': file_format})
+                b''.join(response.streaming_content)
+
+    def test_errors(self):
+        self.assertEqual(self.client.get(reverse('customers:export', args=['kullanicilar'])).status_code, 404)
+        self.assertEqual(self.client.get(reverse('customers:export', args=['invoices']), {'format': 'pdf'}).status_code, 400)
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse('customers:export', args=['invoices'])).status_code, 302)
+
+
+class CacheTests(TestCase):
+    def setUp(self):
+        get_cache().clear()
+        cache_stats.reset()
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parola'))
+        self.customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=date.today(),
+        )
+
+    def create_invoice(self, number):
+        return Invoice.objects.create(
+            customer=self.customer, invoice_number=number, description='Hosting', amount=Decimal('10.00'),
+            issue_date=date.today(), due_date=date.today(),
+        )
+
+    def test_hit_then_invalidated_by_save_and_bulk_change(self):
+        url = reverse('customers:invoice-list')
+        self.create_invoice('F1')
+        self.client.get(url)
+        with self.assertNumQueries(2):  # yalnızca oturum + kullanıcı
+            response = self.client.get(url)
+        self.assertContains(response, 'F1')
+        self.assertEqual(cache_stats.snapshot()['invoice_list'], {'hits': 1, 'misses': 1})
+
+        invoice = self.create_invoice('F2')
+        self.assertContains(self.client.get(url), 'F2')
+        invoice.delete()
+        self.assertNotContains(self.client.get(url), 'F2')
+
+        Invoice.objects.filter(invoice_number='F1').update(invoice_number='F9')
+        bulk_changed.send(sender=Invoice)
+        self.assertContains(self.client.get(url), 'F9')
+
+    def test_related_model_write_invalidates(self):
+        url = reverse('customers:invoice-list')
+        self.create_invoice('F1')
+        self.assertContains(self.client.get(url), 'Acme')
+        self.customer.company_name = 'Beta'
+        self.customer.save()
+        self.assertContains(self.client.get(url), 'Beta')
+
+    def test_process_local_cache_is_flagged(self):
+        self.assertEqual([warning.id for warning in check_shared_cache(None)], ['customers.W001'])
+        shared = {'customers': {'BACKEND': 'django.core.cache.backends.filebased.FileBasedCache', 'LOCATION': '/tmp'}}
+        with override_settings(CACHES=shared):
+            self.assertEqual(check_shared_cache(None), [])
+
+    def test_version_keys_never_expire(self):
+        cache = get_cache()
+        key = _version_key(Invoice)
+        cache.delete(key)
+        bump(Invoice)
+        first = cache.get(key)
+        bump(Invoice)
+        second = cache.get(key)
+        self.assertGreater(second, first)
+        # Varsayılan TIMEOUT geçtikten sonra da sürüm durur (incr varsayılan süreyle yazardı)
+        with mock.patch('time.time', return_value=time.time() + 10 * 365 * 24 * 3600):
+            self.assertEqual(cache.get(key), second)
+
+
+class QueryCount10Tests(QueryCountMixin, TestCase):
+    ROWS = 10
+
+
+class QueryCount1000Tests(QueryCountMixin, TestCase):
+    ROWS = 1000
+
+
+class QueryCount10000Tests(QueryCountMixin, TestCase):
+    ROWS = 10000
+
+
+@mock.patch('customers.admin.COUNT_LIMIT', 10)
+@mock.patch.object(InvoiceAdmin, 'list_per_page', 2)
+class AdminPaginationTests(TestCase):
+    def setUp(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parola'))
+        today = date.today()
+        customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=today,
+        )
+        Invoice.objects.bulk_create(
+            Invoice(
+                customer=customer, invoice_number=f'F{i:02d}', description='Hosting', amount=Decimal('10'),
+                issue_date=today, due_date=today,
+            )
+            for i in range(30)
+        )
+        self.url = reverse('admin:customers_invoice_changelist') + '?payment_status=pending'
+
+    def test_truncated_count_still_reaches_later_pages(self):
+        first = self.client.get(self.url)
+        self.assertTrue(first.context['cl'].paginator.truncated)
+        self.assertContains(first, '12+ Faturalar')
+
+        # Sayım istenen sayfanın ötesine uzar; son satırlara kadar gidilebilir
+        page = self.client.get(self.url + '&p=8')
+        self.assertEqual(page.status_code, 200)
+        self.assertEqual(page.context['cl'].result_count, 26)
+        last = self.client.get(self.url + '&p=15')
+        self.assertEqual([invoice.invoice_number for invoice in last.context['cl'].result_list], ['F01', 'F00'])
+        self.assertFalse(last.context['cl'].paginator.truncated)
+        self.assertContains(last, '30 Faturalar')
+
+
+class ImportTests(TestCase):
+    CUSTOMERS = (
+        'id,customer_no,first_name,last_name,company,registration_date,email1,phone1,city\n'
+        'c1,100,Ali,Veli,Acme,2024-01-05T10:00:00,ali@acme.com,555,İstanbul\n'
+        'c2,101,Ayşe,Kaya,Beta,2024-01-05,gecersiz,555,\n'
+        'c3,102,Can,Demir,Gamma,05.02.2023,can@gamma.com,555,\n'
+    )
+    HOSTINGS = (
+        'customer_id,domain_name,start_date,end_date,status\n'
+        'c1,acme.com,2024-01-01,2026-01-01,1\n'
+        'c2,beta.com,2024-01-01,2026-01-01,1\n'
+        'c3,gamma.com,2024-01-01,2026-01-01,0\n'
+    )
+
+    def run_import(self, **files):
+        return import_files([(kind, io.StringIO(text), 'csv') for kind, text in files.items()], batch_size=2)
+
+    def test_d1_export_with_bad_rows(self):
+        report = self.run_import(customers=self.CUSTOMERS, hostings=self.HOSTINGS)
+        self.assertEqual(report.counts['customers'], {'created': 2, 'updated': 0, 'failed': 1})
+        self.assertEqual(report.counts['hostings'], {'created': 2, 'updated': 0, 'failed': 1})
+        self.assertEqual(report.counts['domains']['created'], 2)
+        self.assertEqual([(kind, line) for kind, line, _ in report.errors], [('customers', 3), ('hostings', 3)])
+
+        customer = Customer.objects.get(customer_no=100)
+        self.assertEqual(customer.contact_name, 'Ali Veli')
+        self.assertEqual(customer.registration_date, date(2024, 1, 5))
+        self.assertEqual(
+            dict(HostingService.objects.values_list('domain__name', 'status')),
+            {'acme.com': 'active', 'gamma.com': 'suspended'},
+        )
+        self.assertEqual(find_drift(), {})
+
+    def test_reimport_updates_by_natural_key(self):
+        self.run_import(customers=self.CUSTOMERS)
+        invoices = (
+            'customer_no,invoice_number,description,amount,issue_date,due_date\n'
+            '100,F1,Hosting,10.00,2024-01-01,2024-02-01\n'
+            '100,F1,Hosting,12.50,2024-01-01,2024-02-01\n'
+            '999,F2,Hosting,5.00,2024-01-01,2024-02-01\n'
+        )
+        report = self.run_import(customers=self.CUSTOMERS.replace('Acme', 'Acme A.Ş.'), invoices=invoices)
+        self.assertEqual(report.counts['customers']['updated'], 2)
+        self.assertEqual(Customer.objects.count(), 2)
+        self.assertTrue(Customer.objects.filter(customer_no=100, company_name='Acme A.Ş.', company_name_key='acme a.s.').exists())
+        self.assertEqual(Invoice.objects.get().amount, Decimal('12.50'))
+        self.assertEqual(report.counts['invoices']['failed'], 2)
+
+    def test_deleted_and_unnumbered_customers_are_rejected(self):
+        self.run_import(customers=self.CUSTOMERS)
+        soft_delete(Customer.objects.get(customer_no=100))
+        customers = self.CUSTOMERS + 'c4,,Deniz,Ak,Delta,2024-01-05,deniz@delta.com,555,\n'
+        invoices = (
+            'customer_no,invoice_number,description,amount,issue_date,due_date\n'
+            '100,F1,Hosting,10.00,2024-01-01,2024-02-01\n'
+            '102,F2,Hosting,5.00,2024-01-01,2024-02-01\n'
+        )
+        report = self.run_import(customers=customers, invoices=invoices)
+        self.assertEqual(report.counts['customers'], {'created': 0, 'updated': 1, 'failed': 3})
+        self.assertEqual(report.counts['invoices'], {'created': 1, 'updated': 0, 'failed': 1})
+        messages = {(kind, line): message for kind, line, message in report.errors}
+        self.assertIn('silinmek üzere işaretli: 100', messages[('customers', 2)])
+        self.assertIn('numarası gerekli', messages[('customers', 5)])
+        self.assertIn('silinmek üzere işaretli: 100', messages[('invoices', 2)])
+        self.assertEqual(Customer.all_objects.count(), 2)
+        self.assertFalse(Customer.objects.filter(customer_no=100).exists())
+
+    def test_dry_run_writes_nothing(self):
+        report = import_files([('customers', io.StringIO(self.CUSTOMERS), 'csv')], dry_run=True)
+        self.assertEqual(report.counts['customers']['created'], 2)
+        self.assertFalse(Customer.objects.exists())
+
+
+class ReminderTests(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali Veli', email='ali@acme.com', email2='muhasebe@acme.com',
+            phone='555', registration_date=today,
+        )
+        Customer.objects.create(company_name='Beta', contact_name='Ayşe', email='ayse@beta.com', phone='555', registration_date=today)
+        self.domain = Domain.objects.create(
+            customer=self.customer, name='acme.com', registration_date=today, expiration_date=today + timedelta(days=5),
+            nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+        )
+        HostingService.objects.create(
+            customer=self.customer, domain=self.domain, package='Standart', status='active',
+            start_date=today, expiration_date=today + timedelta(days=10),
+        )
+        SSLCertificate.objects.create(
+            customer=self.customer, domain=self.domain, start_date=today, expiration_date=today + timedelta(days=400),
+        )
+
+    def test_one_digest_per_customer(self):
+        with self.assertNumQueries(3):
+            digests = pending_digests()
+        result = send_digests(digests, workers=2)
+        self.assertEqual(result.sent, 1)
+        self.assertEqual(len(mail.outbox), 1)
+        message = mail.outbox[0]
+        self.assertEqual(message.to, ['ali@acme.com', 'muhasebe@acme.com'])
+        self.assertIn('Domain: acme.com', message.body)
+        self.assertIn('Hosting: acme.com', message.body)
+        self.assertNotIn('SSL', message.body)
+        self.assertEqual(ReminderLog.objects.count(), 2)
+
+    def test_logs_written_as_each_digest_is_sent(self):
+        beta = Customer.objects.get(company_name='Beta')
+        Domain.objects.create(
+            customer=beta, name='beta.com', registration_date=date.today(), expiration_date=date.today() + timedelta(days=3),
+            nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+        )
+        # Kayıtlar gönderim sonuna bırakılmaz: süreç öldürülse de gönderilenler atlanır
+        with mock.patch.object(ReminderLog.objects, 'bulk_create', wraps=ReminderLog.objects.bulk_create) as bulk_create:
+            result = send_digests(pending_digests(), workers=1)
+        self.assertEqual(result.sent, 2)
+        self.assertEqual(sorted(len(call.args[0]) for call in bulk_create.call_args_list), [1, 2])
+
+    def test_rerun_skips_sent_until_renewed(self):
+        send_digests(pending_digests())
+        self.assertEqual(pending_digests(), [])
+        self.domain.expiration_date += timedelta(days=1)
+        self.domain.save()
+        digests = pending_digests()
+        self.assertEqual([item['type'] for digest in digests for item in digest.items], ['domain'])
+
+
+class SearchTests(TestCase):
+    def setUp(self):
+        today = date.today()
+        self.customer = Customer.objects.create(
+            company_name='IŞIK Yazılım A.Ş.', contact_name='Çağrı Öztürk', email='info@isik.com.tr',
+            phone='555', registration_date=today, tax_number='1234567890',
+        )
+        self.other = Customer.objects.create(
+            company_name='İstanbul Gıda', contact_name='Ali', email='ali@gida.com', phone='555', registration_date=today,
+        )
+        self.domain = Domain.objects.create(
+            customer=self.customer, name='isikyazilim.com.tr', registration_date=today, expiration_date=today,
+            nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+        )
+        Invoice.objects.create(
+            customer=self.other, invoice_number='INV-2024-001', description='Hosting yenileme',
+            amount=Decimal('10'), issue_date=today, due_date=today,
+        )
+
+    def titles(self, query, **kwargs):
+        return [(item['type'], item['title']) for item in search(query, **kwargs)]
+
+    def test_turkish_folding(self):
+        self.assertEqual(fold('IŞIK İSTANBUL Çağrı'), 'isik istanbul cagri')
+        for query in ('ışık yaz', 'ISIK YAZ', 'isik yaz'):
+            self.assertEqual(self.titles(query, kinds=['customer']), [('customer', 'IŞIK Yazılım A.Ş.')])
+        self.assertEqual(self.titles('İSTANBUL'), [('customer', 'İstanbul Gıda')])
+        self.assertEqual(self.titles('cagri ozturk'), [('customer', 'IŞIK Yazılım A.Ş.')])
+
+    def test_type_filter_and_api(self):
+        self.assertEqual(self.titles('isik', kinds=['domain']), [('domain', 'isikyazilim.com.tr')])
+        self.assertEqual(self.titles('inv 2024'), [('invoice', 'INV-2024-001')])
+        User.objects.create_user('admin', password='x')
+        self.client.login(username='admin', password='x')
+        response = self.client.get(reverse('customers:api-search'), {'q': 'gıda', 'type': 'customer'})
+        self.assertEqual([item['id'] for item in response.json()['items']], [self.other.pk])
+        response = self.client.get(reverse('customers:api-search'), {'q': 'gıda', 'type': 'nope'})
+        self.assertEqual(response.status_code, 400)
+
+    def test_api_reads_index_from_replica(self):
+        User.objects.create_user('admin', password='x')
+        self.client.login(username='admin', password='x')
+        with mock.patch('customers.db.replica_alias', return_value='replica'):
+            with mock.patch('customers.search.connections') as search_connections:
+                search_connections.__getitem__.return_value = connection
+                response = self.client.get(reverse('customers:api-search'), {'q': 'gıda'})
+        search_connections.__getitem__.assert_called_once_with('replica')
+        self.assertEqual([item['id'] for item in response.json()['items']], [self.other.pk])
+
+    def test_raw_saves_are_not_indexed(self):
+        customer = Customer(
+            company_name='Fixture Ltd', contact_name='Ali', email='ali@fixture.com', phone='555',
+            registration_date=date.today(), created_at=timezone.now(), updated_at=timezone.now(),
+        )
+        customer.save_base(raw=True)
+        self.assertEqual(self.titles('fixture'), [])
+
+    def test_index_follows_writes(self):
+        self.customer.company_name = 'Karanlık Ltd'
+        self.customer.save()
+        self.assertEqual(self.titles('yazılım', kinds=['customer']), [])
+        self.assertEqual(self.titles('karanlik'), [('customer', 'Karanlık Ltd')])
+        self.domain.delete()
+        self.assertEqual(self.titles('isikyazilim'), [])
+        Customer.objects.filter(pk=self.other.pk).update(company_name='Ankara Gıda')
+        bulk_changed.send(sender=Customer)
+        self.assertEqual(self.titles('ankara'), [('customer', 'Ankara Gıda')])
+
+
+class AutocompleteTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        today = date.today()
+        cls.customers = Customer.objects.bulk_create(
+            Customer(company_name=name, contact_name='Kişi', email='a@example.com', phone='555', registration_date=today)
+            for name in ('Anka Yazılım', 'anadolu Tekstil', 'Şahin Lojistik', 'Beta Enerji')
+        )
+        Domain.objects.bulk_create(
+            Domain(
+                customer=customer, name=f'{prefix}{i}.com', registration_date=today, expiration_date=today,
+                nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+            )
+            for i, customer in enumerate(cls.customers) for prefix in ('alan', 'site')
+        )
+
+    def setUp(self):
+        self.client.force_login(self.user)
+
+    def test_prefix_is_case_insensitive(self):
+        items, has_more = suggest('customers', 'AN')
+        self.assertEqual([item['text'] for item in items], ['anadolu Tekstil', 'Anka Yazılım'])
+        self.assertFalse(has_more)
+        # Türkçe harfler katlanarak karşılaştırılır: büyük, küçük ya da aksansız
+        for term in ('şah', 'ŞAHİN', 'sahin'):
+            self.assertEqual([item['text'] for item in suggest('customers', term)[0]], ['Şahin Lojistik'])
+        self.assertEqual([item['text'] for item in suggest('customers', 'ANKA YAZI')[0]], ['Anka Yazılım'])
+
+    def test_key_follows_renames(self):
+        customer = self.customers[3]
+        customer.company_name = 'IŞIK Enerji'
+        customer.save()
+        self.assertEqual(Customer.objects.get(pk=customer.pk).company_name_key, 'isik enerji')
+        self.assertEqual([item['text'] for item in suggest('customers', 'ışı')[0]], ['IŞIK Enerji'])
+
+    def test_domains_filtered_by_customer(self):
+        url = reverse('customers:api-autocomplete', args=['domains'])
+        data = self.client.get(url, {'q': 'al', 'customer': self.customers[1].pk, 'limit': 1}).json()
+        self.assertEqual([item['text'] for item in data['items']], ['alan1.com'])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self.client.get(url, {'q': 'al', 'limit': 1}).json()['has_more'], True)
+        self.assertEqual(self.client.get(url, {'customer': 'x'}).status_code, 400)
+
+    def test_form_renders_only_selected_option(self):
+        hosting = HostingService.objects.create(
+            customer=self.customers[0], domain=Domain.objects.filter(customer=self.customers[0]).first(),
+            package='Başlangıç', status='active', start_date=date.today(), expiration_date=date.today(),
+        )
+        size = len(self.client.get(reverse('customers:hosting-edit', args=[hosting.pk])).content)
+        Customer.objects.bulk_create(
+            Customer(company_name=f'Firma {i}', contact_name='Kişi', email='a@example.com', phone='555',
+                     registration_date=date.today())
+            for i in range(50)
+        )
+        response = self.client.get(reverse('customers:hosting-edit', args=[hosting.pk]))
+        self.assertEqual(len(response.content), size)
+        self.assertContains(response, 'Anka Yazılım')
+        self.assertNotContains(response, 'Beta Enerji')
+
+
+class DatabaseRoutingTests(TestCase):
+    def test_reads_use_replica_only_inside_marked_views(self):
+        router = ReplicaRouter()
+        self.assertIsNone(router.db_for_read(Customer))
+        with read_from_replica():
+            self.assertIsNone(router.db_for_read(Customer))
+        # Test ortamında replica yok; var olan bir alias'ı replica olarak gösteririz
+        with override_settings(CUSTOMERS_REPLICA_ALIAS='default'):
+            view = replica_reads(lambda request: router.db_for_read(Customer))
+            factory = RequestFactory()
+            self.assertEqual(view(factory.get('/')), 'default')
+            self.assertIsNone(view(factory.post('/')))
+        self.assertEqual(router.db_for_write(Customer), 'default')
+        self.assertIsNone(router.db_for_read(Customer))
+
+    def test_sqlite_pragmas(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite pragmaları')
+        with connection.cursor() as cursor:
+            cursor.execute('PRAGMA synchronous')
+            self.assertEqual(cursor.fetchone()[0], 1)  # NORMAL
+            cursor.execute('PRAGMA temp_store')
+            self.assertEqual(cursor.fetchone()[0], 2)  # MEMORY
+
+    def test_connections_leave_journal_mode_alone(self):
+        if connection.vendor != 'sqlite':
+            self.skipTest('SQLite pragmaları')
+        with tempfile.TemporaryDirectory() as directory:
+            other = type(connections['default'])({**connection.settings_dict, 'NAME': f'{directory}/db.sqlite3'}, alias='journal')
+            # Ayara yazılmış olsa da kalıcı journal_mode bağlantı açılışında uygulanmaz
+            with override_settings(CUSTOMERS_SQLITE_PRAGMAS={'journal_mode': 'WAL', 'synchronous': 'OFF'}):
+                other.ensure_connection()
+            try:
+                self.assertEqual(journal_mode(other), 'delete')
+                with other.cursor() as cursor:
+                    cursor.execute('PRAGMA synchronous')
+                    self.assertEqual(cursor.fetchone()[0], 0)
+                self.assertEqual(set_journal_mode(other, 'WAL'), 'wal')
+            finally:
+                other.close()
+        # Bellekteki test veritabanı WAL olamaz; komut sessizce geçmez
+        with self.assertRaises(CommandError):
+            call_command('set_journal_mode', stdout=io.StringIO())
+
+
+@override_settings(
+    CUSTOMERS_INVOICE_PREFIX='YNL-{year}-',
+    CUSTOMERS_RENEWAL_PRICES={'domain': '100', 'hosting': '1000'},
+    CUSTOMERS_RENEWAL_PACKAGE_PRICES={'Kurumsal': '2500'},
+)
+class RenewalInvoiceTests(TestCase):
+    def setUp(self):
+        self.today = date(2025, 3, 1)
+        self.customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=self.today,
+        )
+        for i, package in enumerate(['Başlangıç', 'Kurumsal']):
+            domain = Domain.objects.create(
+                customer=self.customer, name=f'acme{i}.com', registration_date=self.today,
+                expiration_date=self.today + timedelta(days=10), nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+            )
+            HostingService.objects.create(
+                customer=self.customer, domain=domain, package=package, status='active',
+                start_date=self.today, expiration_date=self.today + timedelta(days=20),
+            )
+            SSLCertificate.objects.create(
+                customer=self.customer, domain=domain, start_date=self.today, expiration_date=self.today + timedelta(days=5),
+            )
+        Invoice.objects.create(
+            customer=self.customer, invoice_number='YNL-2025-000041', description='Elle', amount=Decimal('1'),
+            issue_date=self.today, due_date=self.today,
+        )
+
+    def test_generates_numbered_invoices_once(self):
+        with CaptureQueriesContext(connection) as queries:
+            result = generate_renewal_invoices(issue_date=self.today)
+        self.assertEqual(result.created, 4)
+        # Sayaçlar, gelir özetleri ve arama index'i yalnızca yeni faturalarla güncellenir
+        self.assertFalse([query for query in queries if 'GROUP BY' in query['sql'] or 'WHERE kind' in query['sql']])
+        self.assertEqual(find_drift(), {})
+        self.assertEqual(revenue.find_drift(), {})
+        self.assertEqual(len(search('acme0 hosting yenileme', ['invoice'])), 1)
+        self.assertEqual(result.unpriced, [('ssl', item) for item in SSLCertificate.objects.values_list('pk', flat=True)])
+        invoices = Invoice.objects.filter(service_type__isnull=False).order_by('invoice_number')
+        self.assertEqual(
+            [invoice.invoice_number for invoice in invoices],
+            ['YNL-2025-000042', 'YNL-2025-000043', 'YNL-2025-000044', 'YNL-2025-000045'],
+        )
+        self.assertEqual(
+            sorted((invoice.service_type, invoice.amount) for invoice in invoices),
+            [('domain', Decimal('100.00'))] * 2 + [('hosting', Decimal('1000.00')), ('hosting', Decimal('2500.00'))],
+        )
+
+        again = generate_renewal_invoices(issue_date=self.today)
+        self.assertEqual((again.created, again.existing), (0, 4))
+
+        # Hizmet yenilenince yeni dönem için yeni fatura kesilir
+        domain = Domain.objects.get(name='acme0.com')
+        domain.expiration_date += timedelta(days=5)
+        domain.save()
+        result = generate_renewal_invoices(issue_date=self.today)
+        self.assertEqual([invoice.invoice_number for invoice in result.invoices], ['YNL-2025-000046'])
+
+    def test_dry_run_writes_nothing(self):
+        result = generate_renewal_invoices(issue_date=self.today, dry_run=True)
+        self.assertEqual(result.created, 4)
+        self.assertEqual(result.invoices[0].invoice_number, 'YNL-2025-000042')
+        self.assertEqual(Invoice.objects.count(), 1)
+        self.assertEqual(generate_renewal_invoices(issue_date=self.today).invoices[0].invoice_number, 'YNL-2025-000042')
+
+
+class SweeperTests(TestCase):
+    def setUp(self):
+        self.today = date.today()
+        customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=self.today,
+        )
+        for i, days in enumerate((-10, -1, 5)):
+            Invoice.objects.create(
+                customer=customer, invoice_number=f'F{i}', description='Hosting', amount=Decimal('10'),
+                issue_date=self.today, due_date=self.today + timedelta(days=days),
+            )
+            domain = Domain.objects.create(
+                customer=customer, name=f'alan{i}.com', registration_date=self.today,
+                expiration_date=self.today + timedelta(days=days), nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+            )
+            HostingService.objects.create(
+                customer=customer, domain=domain, package='Başlangıç', status='active',
+                start_date=self.today, expiration_date=domain.expiration_date,
+            )
+
+    def test_sweep_persists_states_and_keeps_stats(self):
+        before = get_dashboard_stats()
+        self.assertEqual(before['invoice_stats']['overdue']['count'], 2)
+        run = sweep(self.today)
+        self.assertEqual((run.overdue_invoices, run.expired_hosting), (2, 2))
+        self.assertEqual(last_sweep(), run)
+        self.assertEqual(Invoice.objects.filter(payment_status='overdue').count(), 2)
+        self.assertEqual(HostingService.objects.filter(status='expired').count(), 2)
+        after = get_dashboard_stats()
+        self.assertEqual(after['invoice_stats'], before['invoice_stats'])
+        self.assertEqual(after['hosting_stats']['expired'], 2)
+
+    def test_sweep_reverts_renewed_hosting_but_not_overdue_invoices(self):
+        sweep(self.today)
+        HostingService.objects.filter(status='expired').update(expiration_date=self.today + timedelta(days=365))
+        # Vadesi ileri alınan ya da elle gecikmiş işaretlenen fatura overdue kalır
+        Invoice.objects.filter(payment_status='overdue').update(due_date=self.today)
+        Invoice.objects.filter(payment_status='pending').update(payment_status='overdue')
+        run = sweep(self.today)
+        self.assertEqual(run.overdue_invoices, 0)
+        self.assertEqual(run.reactivated_hosting, 2)
+        self.assertFalse(HostingService.objects.exclude(status='active').exists())
+        self.assertEqual(Invoice.objects.filter(payment_status='overdue').count(), 3)
+
+
+class DashboardCounterTests(TestCase):
+    def test_model_signals_connected_per_model(self):
+        # Takip edilmeyen modellerde alıcı yok; Collector bunları (ve cascade'lerini) hızlı siler
+        for model in (Session, LogEntry, DomainNameserver):
+            self.assertFalse(pre_save.has_listeners(model))
+            self.assertFalse(post_save.has_listeners(model))
+            self.assertFalse(post_delete.has_listeners(model))
+        self.assertTrue(post_delete.has_listeners(Invoice))
+
+    def stored(self):
+        return {counter.name: (counter.count, counter.amount) for counter in DashboardCounter.objects.all()}
+
+    def test_single_writes_update_counters_incrementally(self):
+        today = date.today()
+        customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=today,
+        )
+        invoice = Invoice.objects.create(
+            customer=customer, invoice_number='F1', description='Hosting', amount=Decimal('10'),
+            issue_date=today, due_date=today,
+        )
+        Invoice.objects.create(
+            customer=customer, invoice_number='F2', description='Hosting', amount=Decimal('5'),
+            issue_date=today, due_date=today, payment_status='paid',
+        )
+        invoice.payment_status, invoice.amount = 'paid', Decimal('12')
+        invoice.save()
+        counters = self.stored()
+        self.assertEqual(counters['customer.total'][0], 1)
+        self.assertEqual(counters['invoice.total'], (2, Decimal('17')))
+        self.assertEqual(counters['invoice.status.paid'], (2, Decimal('17')))
+        self.assertEqual(counters['invoice.status.pending'][0], 0)
+
+        invoice.delete()
+        self.assertEqual(self.stored()['invoice.total'], (1, Decimal('5')))
+        self.assertEqual(find_drift(), {})
+
+    def test_unrelated_update_fields_skip_previous_row(self):
+        today = date.today()
+        customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=today,
+        )
+        invoice = Invoice.objects.create(
+            customer=customer, invoice_number='F1', description='Hosting', amount=Decimal('10'),
+            issue_date=today, due_date=today,
+        )
+        domain = Domain.objects.create(
+            customer=customer, name='acme.com', registration_date=today, expiration_date=today,
+            nameserver1='ns1.example.com',
+        )
+        for obj, fields in ((invoice, ['description']), (domain, ['expiration_date']), (customer, ['notes'])):
+            with CaptureQueriesContext(connection) as queries:
+                obj.save(update_fields=fields)
+            table = obj._meta.db_table
+            self.assertFalse([q for q in queries if q['sql'].startswith(f'SELECT "{table}"')], table)
+            self.assertFalse([q for q in queries if 'customers_dashboardcounter' in q['sql']], table)
+
+        invoice.amount = Decimal('25')
+        invoice.save(update_fields=['amount'])
+        self.assertEqual(self.stored()['invoice.total'], (1, Decimal('25')))
+        domain.nameserver1 = 'ns9.example.com'
+        domain.save(update_fields=['nameserver1'])
+        self.assertEqual(nameservers.hostnames(domain), [(1, 'ns9.example.com')])
+        self.assertEqual(DomainNameserver.objects.get(domain=domain).nameserver.hostname, 'ns9.example.com')
+        self.assertEqual(find_drift(), {})
+
+    def test_bulk_change_rebuilds_only_sender_counters(self):
+        DashboardCounter.objects.filter(name='hosting.total').update(count=99)
+        # Sayılmayan alanlar: tablo okunmaz
+        with self.assertNumQueries(0):
+            bulk_changed.send(sender=Domain, fields=['expiration_date'])
+        bulk_changed.send(sender=Domain)
+        counters = self.stored()
+        self.assertEqual(counters['domain.total'][0], 0)
+        self.assertEqual(counters['hosting.total'][0], 99)
+
+    def test_dashboard_does_not_write_counters(self):
+        # Migration boş veritabanında da sayaçları açar
+        self.assertEqual(self.stored()['customer.total'], (0, Decimal('0')))
+        DashboardCounter.objects.all().delete()
+        self.assertEqual(get_dashboard_stats()['customer_stats']['total'], 0)
+        self.assertFalse(DashboardCounter.objects.exists())
+
+    def test_check_command_reports_drift_against_live_tables(self):
+        Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=date.today(),
+        )
+        out = io.StringIO()
+        call_command('rebuild_dashboard_stats', check=True, stdout=out)
+        self.assertIn('uyumlu', out.getvalue())
+        DashboardCounter.objects.filter(name='customer.total').update(count=7)
+        out = io.StringIO()
+        with self.assertRaises(CommandError):
+            call_command('rebuild_dashboard_stats', check=True, stdout=out)
+        self.assertIn('customer.total: kayıtlı adet=7', out.getvalue())
+        self.assertIn('canlı adet=1', out.getvalue())
+
+    def test_seed_migration_adds_only_missing_counters(self):
+        seed = import_module('customers.migrations.0017_seed_dashboard_counters').seed
+        DashboardCounter.objects.filter(name='hosting.total').delete()
+        DashboardCounter.objects.filter(name='invoice.total').update(count=5)
+        seed(django_apps, mock.Mock(connection=connection))
+        counters = self.stored()
+        self.assertEqual(counters['hosting.total'], (0, Decimal('0')))
+        self.assertEqual(counters['invoice.total'][0], 5)
+
+
+class SoftDeleteTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        self.client.force_login(self.user)
+        today = date.today()
+        self.customers = [
+            Customer.objects.create(
+                company_name=name, contact_name='Ali', email='ali@example.com', phone='555', registration_date=today,
+            )
+            for name in ('Silinecek', 'Kalacak')
+        ]
+        for customer in self.customers:
+            for i in range(3):
+                domain = Domain.objects.create(
+                    customer=customer, name=f'{customer.pk}-{i}.com', registration_date=today, expiration_date=today,
+                    nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+                )
+                HostingService.objects.create(
+                    customer=customer, domain=domain, package='Başlangıç', status='active',
+                    start_date=today, expiration_date=today,
+                )
+                SSLCertificate.objects.create(customer=customer, domain=domain, start_date=today, expiration_date=today)
+                Invoice.objects.create(
+                    customer=customer, invoice_number=f'F{customer.pk}-{i}', description='Hosting',
+                    amount=Decimal('10'), issue_date=today, due_date=today,
+                )
+
+    def test_delete_hides_customer_without_loading_related_rows(self):
+        customer = self.customers[0]
+        # Müşteri UPDATE'i + kayıtlarının sayaç katkısı (model başına bir GROUP BY) düşülür
+        with self.assertNumQueries(27):
+            response = self.client.post(reverse('customers:customer-delete', args=[customer.pk]))
+        self.assertEqual(response.status_code, 302)
+        self.assertFalse(Customer.objects.filter(pk=customer.pk).exists())
+        self.assertTrue(Customer.all_objects.filter(pk=customer.pk).exists())
+        self.assertEqual(Invoice.objects.filter(customer=customer).count(), 3)
+        self.assertEqual(self.client.get(reverse('customers:customer-detail', args=[customer.pk])).status_code, 404)
+        stats = get_dashboard_stats()
+        self.assertEqual(stats['customer_stats']['total'], 1)
+        self.assertEqual(search('Silinecek', ['customer']), [])
+        # Kayıtları temizlenene kadar ne sayaçlarda ne pencere sayılarında görünür
+        self.assertEqual(stats['hosting_stats']['total'], 3)
+        self.assertEqual(stats['hosting_stats']['expiring_soon'], 3)
+        self.assertEqual(stats['domain_stats']['expiring_soon'], 3)
+        self.assertEqual(stats['invoice_stats']['total'], {'count': 3, 'amount': Decimal('30')})
+        self.assertEqual(stats['invoice_stats']['overdue']['count'] + stats['invoice_stats']['pending']['count'], 3)
+        self.assertEqual(find_drift(), {})
+
+    def test_writes_to_deleted_customers_records_are_not_counted(self):
+        deleted = self.customers[0]
+        soft_delete(deleted)
+        invoice = Invoice.objects.filter(customer=deleted).first()
+        invoice.payment_status = 'paid'
+        invoice.save()
+        HostingService.objects.filter(customer=deleted).first().delete()
+        Domain.objects.create(
+            customer=Customer.all_objects.get(pk=deleted.pk), name='yeni.com', registration_date=date.today(),
+            expiration_date=date.today(),
+        )
+        self.assertEqual(find_drift(), {})
+        # Silinmiş müşteriden canlı müşteriye taşınan kayıt yeniden sayılır
+        invoice.customer = self.customers[1]
+        invoice.save()
+        self.assertEqual(DashboardCounter.objects.get(name='invoice.total').count, 4)
+        self.assertEqual(find_drift(), {})
+
+    def test_batch_writers_skip_deleted_customer(self):
+        deleted, kept = self.customers
+        soft_delete(deleted)
+        today = date.today()
+        result = generate_renewal_invoices(start=today, end=today, issue_date=today)
+        self.assertTrue(result.invoices)
+        self.assertEqual({invoice.customer_id for invoice in result.invoices}, {kept.pk})
+        self.assertEqual(bulk_renew('domain', Domain.objects.filter(customer=deleted).values_list('pk', flat=True)), [])
+        self.assertEqual(nameservers.replace('ns1.example.com', 'ns9.example.com'), 3)
+        self.assertEqual(Domain.objects.filter(customer=deleted, nameserver1='ns1.example.com').count(), 3)
+
+    def test_purge_resumes_after_interruption(self):
+        job = soft_delete(self.customers[0])
+
+        def crash(job):
+            raise RuntimeError('kesildi')
+
+        with self.assertRaises(RuntimeError):
+            purge(job, batch_size=2, progress=crash)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_ssl, job.total_rows), ('failed', 2, 12))
+        self.assertEqual(SSLCertificate.objects.filter(customer=self.customers[0]).count(), 1)
+
+        purge(job, batch_size=2)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.deleted_rows), ('done', 12))
+        self.assertFalse(Customer.all_objects.filter(pk=self.customers[0].pk).exists())
+        for model in (Domain, HostingService, SSLCertificate, Invoice):
+            self.assertEqual(model.objects.count(), 3)
+        self.assertEqual(find_drift(), {})
+        self.assertEqual(search('1-0', ['domain']), [])
+
+
+class ChangeFeedTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        self.client.force_login(self.user)
+        self.today = date.today()
+        self.customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=self.today,
+        )
+        self.cursor = changes.latest_cursor()
+
+    def feed(self, since, **params):
+        response = self.client.get(reverse('customers:api-changes'), {'since': since, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_returns_latest_state_and_tombstones(self):
+        domain = Domain.objects.create(
+            customer=self.customer, name='acme.com', registration_date=self.today, expiration_date=self.today,
+            nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+        )
+        domain.is_active = False
+        domain.save()
+        invoice = Invoice.objects.create(
+            customer=self.customer, invoice_number='F1', description='Hosting', amount=Decimal('10'),
+            issue_date=self.today, due_date=self.today,
+        )
+        invoice_id = invoice.pk
+        invoice.delete()
+
+        data = self.feed(self.cursor)
+        self.assertEqual(
+            [(item['type'], item['id'], item['deleted']) for item in data['items']],
+            [('domains', domain.pk, False), ('invoices', invoice_id, True)],
+        )
+        self.assertFalse(data['items'][0]['data']['is_active'])
+        self.assertIsNone(data['items'][1]['data'])
+        self.assertFalse(data['has_more'])
+        self.assertEqual(self.feed(data['next_cursor'])['items'], [])
+
+        # Sayfalama ve tür filtresi
+        page = self.feed(self.cursor, limit=1)
+        self.assertTrue(page['has_more'])
+        self.assertEqual(self.feed(self.cursor, type='invoices')['items'][0]['id'], invoice_id)
+
+    def test_soft_deleted_customer_is_tombstone(self):
+        soft_delete(self.customer)
+        item, = self.feed(self.cursor)['items']
+        self.assertEqual((item['type'], item['id'], item['deleted']), ('customers', self.customer.pk, True))
+
+    def test_bulk_writers_record_changes(self):
+        Invoice.objects.create(
+            customer=self.customer, invoice_number='F1', description='Hosting', amount=Decimal('10'),
+            issue_date=self.today, due_date=self.today - timedelta(days=3),
+        )
+        cursor = changes.latest_cursor()
+        sweep(self.today)
+        item, = self.feed(cursor)['items']
+        self.assertEqual(item['data']['payment_status'], 'overdue')
+        self.assertEqual(Invoice.objects.get().updated_at.isoformat()[:19], item['data']['updated_at'][:19])
+
+    def test_invalid_parameters(self):
+        url = reverse('customers:api-changes')
+        self.assertEqual(self.client.get(url, {'since': 'abc'}).json(), {'error': 'INVALID_CURSOR'})
+        self.assertEqual(self.client.get(url, {'type': 'users'}).status_code, 400)
+
+
+class RevenueTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        self.client.force_login(self.user)
+        self.today = date(2025, 5, 20)
+        self.customer = Customer.objects.create(
+            company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=self.today,
+        )
+        self.invoices = [
+            Invoice.objects.create(
+                customer=self.customer, invoice_number=f'F{i}', description='Hosting', amount=Decimal(amount),
+                issue_date=issue_date, due_date=issue_date + timedelta(days=15),
+            )
+            for i, (amount, issue_date) in enumerate((
+                ('100.00', date(2025, 1, 10)), ('50.00', date(2025, 2, 3)), ('25.50', date(2025, 4, 28)),
+            ))
+        ]
+
+    def test_rollups_follow_single_writes(self):
+        invoice = self.invoices[0]
+        invoice.payment_status, invoice.payment_date, invoice.payment_method = 'paid', date(2025, 3, 2), 'credit_card'
+        invoice.save()
+        self.invoices[1].delete()
+        self.assertEqual(revenue.find_drift(), {})
+
+        months = revenue.series(date(2025, 1, 1), date(2025, 4, 30))
+        self.assertEqual([item['billed']['amount'] for item in months], [Decimal('100'), 0, 0, Decimal('25.5')])
+        self.assertEqual(months[2]['collected']['by_method'], {'credit_card': Decimal('100')})
+        quarters = revenue.series(date(2025, 1, 1), date(2025, 6, 30), 'quarter')
+        self.assertEqual([item['period'] for item in quarters], ['2025-Q1', '2025-Q2'])
+        self.assertEqual(quarters[0]['collected']['amount'], Decimal('100'))
+
+    def test_aging_buckets(self):
+        buckets = revenue.aging(self.today)
+        # Vadeler: 25 Ocak (115 gün), 18 Şubat (91 gün), 13 Mayıs (7 gün)
+        self.assertEqual(buckets['0_30'], {'count': 1, 'amount': Decimal('25.50')})
+        self.assertEqual(buckets['90_plus'], {'count': 2, 'amount': Decimal('150.00')})
+        self.assertEqual(buckets['current']['count'], 0)
+
+    def test_bulk_changes_refresh_only_reported_periods(self):
+        RevenueRollup.objects.filter(kind='billed', period=date(2025, 1, 1)).update(amount=Decimal('1'))
+        invoices = Invoice.objects.filter(pk=self.invoices[2].pk)
+        periods = revenue.period_keys(invoices)
+        invoices.update(payment_status='paid', payment_date=self.today, payment_method='cash')
+        periods |= revenue.period_keys(invoices)
+        bulk_changed.send(sender=Invoice, fields=['payment_status', 'payment_date', 'payment_method'], periods=periods)
+        # Bildirilmeyen dönem yeniden hesaplanmaz
+        self.assertEqual(list(revenue.find_drift()), [('billed', date(2025, 1, 1), '')])
+        self.assertEqual(revenue.series(date(2025, 5, 1), date(2025, 5, 31))[0]['collected']['amount'], Decimal('25.5'))
+
+        # pending <-> overdue özetleri değiştirmez; tarama özet tablosuna dokunmaz
+        with CaptureQueriesContext(connection) as queries:
+            run = sweep(self.today)
+        self.assertEqual(run.overdue_invoices, 2)
+        self.assertFalse([query for query in queries if 'customers_revenuerollup' in query['sql']])
+
+    def test_bulk_changes_rebuild_and_api(self):
+        Invoice.objects.filter(pk=self.invoices[2].pk).update(payment_status='paid', payment_date=self.today)
+        bulk_changed.send(sender=Invoice, fields=['payment_status'])
+        self.assertEqual(revenue.find_drift(), {})
+
+        url = reverse('customers:api-revenue')
+        data = self.client.get(url, {'start': '2025-01-01', 'end': '2025-06-30', 'grain': 'quarter'}).json()
+        self.assertEqual(data['series'][1]['collected']['by_method'], {'unknown': '25.50'})
+        self.assertEqual(len(self.client.get(url).json()['series']), 12)
+        self.assertEqual(self.client.get(url, {'grain': 'year'}).json(), {'error': 'INVALID_GRAIN'})
+        self.assertEqual(self.client.get(url, {'start': '2025-13-01'}).status_code, 400)
+
+
+class BulkRenewTests(TestCase):
+    def setUp(self):
+        self.customer = Customer.objects.create(
+            customer_no=7, company_name='Acme', contact_name='Ali', email='ali@acme.com', phone='555', registration_date=date.today(),
+        )
+        self.hostings = []
+        for i, expiration_date in enumerate((date(2025, 1, 31), date(2025, 1, 31), date(2025, 6, 15))):
+            domain = Domain.objects.create(
+                customer=self.customer, name=f'alan{i}.com', registration_date=date(2024, 1, 1),
+                expiration_date=expiration_date, nameserver1='ns1.example.com', nameserver2='ns2.example.com',
+            )
+            self.hostings.append(HostingService.objects.create(
+                customer=self.customer, domain=domain, package='Başlangıç', status='active',
+                start_date=date(2024, 1, 1), expiration_date=expiration_date, renewal_count=2,
+            ))
+
+    def test_renews_with_single_update(self):
+        cursor = changes.latest_cursor()
+        ids = [hosting.pk for hosting in self.hostings]
+        # İki farklı bitiş tarihi tek CASE'li UPDATE ile ilerletilir
+        with CaptureQueriesContext(connection) as queries:
+            renewals = bulk_renew('hosting', ids, months=1)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "customers_hostingservice"') for query in queries), 1)
+        self.assertEqual(len(renewals), 3)
+
+        self.assertEqual(
+            list(HostingService.objects.order_by('pk').values_list('expiration_date', 'renewal_count')),
+            [(date(2025, 2, 28), 3), (date(2025, 2, 28), 3), (date(2025, 7, 15), 3)],
+        )
+        renewal = Renewal.objects.get(object_id=ids[0])
+        self.assertEqual((renewal.previous_expiration, renewal.new_expiration), (date(2025, 1, 31), date(2025, 2, 28)))
+        self.assertEqual(len(changes.since(cursor)['items']), 3)
+        self.assertEqual(find_drift(), {})
+
+        client = self.client
+        client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parola'))
+        response = client.get(reverse('customers:hosting-detail', args=[ids[0]]))
+        self.assertContains(response, '28.02.2025')
+
+    def test_renewing_expired_hosting_reactivates_it(self):
+        hosting = self.hostings[2]
+        hosting.status, hosting.expiration_date = 'expired', date.today() - timedelta(days=10)
+        hosting.save()
+        bulk_renew('hosting', [hosting.pk], months=12)
+        hosting.refresh_from_db()
+        self.assertEqual(hosting.status, 'active')
+        self.assertEqual(get_dashboard_stats()['hosting_stats']['expired'], 0)
+        self.assertEqual(find_drift(), {})
+
+    def test_skipped_rows_get_no_history(self):
+        ids = [hosting.pk for hosting in self.hostings]
+        calendar_months = renewals.add_months
+
+        def concurrent_write(value, months):
+            # Okumadan sonra başka bir yazma ilk hizmetin bitişini değiştirir
+            HostingService.objects.filter(pk=ids[0]).update(expiration_date=date(2025, 3, 1))
+            return calendar_months(value, months)
+
+        with mock.patch.object(renewals, 'add_months', concurrent_write):
+            created = bulk_renew('hosting', ids, months=1)
+        self.assertEqual(sorted(renewal.object_id for renewal in created), ids[1:])
+        self.assertEqual(HostingService.objects.get(pk=ids[0]).expiration_date, date(2025, 3, 1))
+
+    def test_admin_action(self):
+        self.client.force_login(User.objects.create_superuser('admin', 'admin@example.com', 'parola'))
+        domain = self.hostings[2].domain
+        self.client.post(reverse('admin:customers_domain_changelist'), {
+            'action': 'renew_12_months', '_selected_action': [domain.pk],
+        })
+        domain.refresh_from_db()
+        self.assertEqual(domain.expiration_date, date(2026, 6, 15))
+        self.assertTrue(Renewal.objects.filter(service_type='domain', object_id=domain.pk).exists())
+
+    def test_import_renewal_dates(self):
+        hosting = io.StringIO(
+            'customer_no,domain_name,package,status,start_date,expiration_date,renewal_dates\n'
+            '7,yeni.com,Standart,1,2023-01-01,2026-01-01,"[""2024-01-01"", ""2025-01-01""]"\n'
+        )
+        for _ in range(2):
+            hosting.seek(0)
+            report = import_files([('hostings', hosting, 'csv')])
+            self.assertEqual(report.errors, [])
+        imported = HostingService.objects.get(domain__name='yeni.com')
+        self.assertEqual(imported.renewal_count, 2)
+        self.assertEqual(Renewal.objects.filter(object_id=imported.pk, service_type='hosting').count(), 2)
+
+
+class NameserverTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_superuser('admin', 'admin@example.com', 'parola')
+        self.client.force_login(self.user)
+        today = date.today()
+        self.customers = [
+            Customer.objects.create(
+                company_name=name, contact_name='Ali', email='ali@example.com', phone='555', registration_date=today,
+            )
+            for name in ('Acme', 'Beta')
+        ]
+        self.domains = [
+            Domain.objects.create(
+                customer=self.customers[i % 2], name=f'alan{i}.com', registration_date=today, expiration_date=today,
+                nameserver1='NS1.OldHost.com.' if i % 3 else 'ns1.example.com', nameserver2='ns2.oldhost.com',
+            )
+            for i in range(6)
+        ]
+
+    def lookup(self, host, **params):
+        response = self.client.get(reverse('customers:api-nameserver-domains'), {'host': host, **params})
+        self.assertEqual(response.status_code, 200)
+        return response.json()
+
+    def test_links_follow_fields_and_reverse_lookup(self):
+        self.assertEqual([item['id'] for item in self.lookup('ns1.oldhost.com')['items']],
+                         [domain.pk for domain in self.domains if domain.name not in ('alan0.com', 'alan3.com')])
+        domain = self.domains[0]
+        domain.nameserver3 = 'ns3.oldhost.com'
+        domain.save()
+        self.assertEqual(self.lookup('NS3.oldhost.com')['items'], [
+            {'id': domain.pk, 'name': 'alan0.com', 'customer_id': domain.customer_id, 'position': 3},
+        ])
+
+        page = self.lookup('ns2.oldhost.com', limit=4)
+        self.assertTrue(page['has_more'])
+        self.assertEqual(len(self.lookup('ns2.oldhost.com', after=page['next_cursor'])['items']), 2)
+        response = self.client.get(reverse('customers:api-nameserver-domains'))
+        self.assertEqual(response.json(), {'error': 'INVALID_HOST'})
+
+    def test_replace_updates_fields_and_index(self):
+        cursor = changes.latest_cursor()
+        with CaptureQueriesContext(connection) as queries:
+            count = nameservers.replace('ns1.oldhost.com', 'ns1.newhost.com', customer_id=self.customers[1].pk)
+        self.assertEqual(count, 2)
+        self.assertEqual(sum(query['sql'].startswith('UPDATE "customers_domain"') for query in queries), 4)
+        self.assertEqual(
+            sorted(Domain.objects.filter(nameserver1='ns1.newhost.com').values_list('name', flat=True)),
+            ['alan1.com', 'alan5.com'],
+        )
+        self.assertEqual(len(self.lookup('ns1.newhost.com')['items']), 2)
+        self.assertEqual(len(self.lookup('ns1.oldhost.com')['items']), 2)
+        self.assertEqual(len(changes.since(cursor)['items']), 2)
+
+        self.assertEqual(nameservers.replace('ns2.oldhost.com', 'ns2.newhost.com'), 6)
+        links = DomainNameserver.objects.count()
+        nameservers.rebuild()
+        self.assertEqual(DomainNameserver.objects.count(), links)
+        self.assertEqual(len(self.lookup('ns2.newhost.com')['items']), 6)
+
+    def test_replace_with_nameserver_already_listed(self):
+        domain = self.domains[1]
+        domain.nameserver3 = 'ns3.oldhost.com'
+        domain.save()
+        # alan1.com: ns1.oldhost, ns2.oldhost, ns3.oldhost -> ns2.oldhost zaten listede
+        self.assertEqual(nameservers.replace('ns1.oldhost.com', 'ns2.oldhost.com', customer_id=domain.customer_id), 2)
+        domain.refresh_from_db()
+        self.assertEqual(
+            [domain.nameserver1, domain.nameserver2, domain.nameserver3, domain.nameserver4],
+            ['ns2.oldhost.com', 'ns3.oldhost.com', None, None],
+        )
+        items = self.lookup('ns2.oldhost.com')['items']
+        self.assertEqual(len(items), 6)
+        self.assertEqual(len({item['id'] for item in items}), 6)
+        links = DomainNameserver.objects.count()
+        nameservers.rebuild()
+        self.assertEqual(DomainNameserver.objects.count(), links)
+
+
+class BenchmarkCommandTests(TestCase):
+    def test_generate_fixtures_and_run_benchmarks(self):
+        today = date.today()
+        call_command('generate_fixtures', customers=3, invoices=30, seed=7, stdout=io.StringIO())
+        self.assertEqual(Customer.objects.count(), 3)
+        self.assertEqual(Invoice.objects.count(), 30)
+        # Ödenmemiş faturaların durumu vadeyle tutarlı: sweep hiçbir şeyi değiştirmez
+        self.assertFalse(Invoice.objects.filter(payment_status='pending', due_date__lt=today).exists())
+        self.assertFalse(Invoice.objects.filter(payment_status='overdue', due_date__gte=today).exists())
+        self.assertFalse(HostingService.objects.filter(status='active', expiration_date__lt=today).exists())
+
+        User.objects.create_superuser('bench', 'bench@example.com', 'x')
+        stderr = io.StringIO()
+        with tempfile.NamedTemporaryFile(suffix='.json') as output:
+            call_command('run_benchmarks', repeat=2, output=output.name, stdout=io.StringIO(), stderr=stderr)
+            report = json.load(output)
+        self.assertEqual(stderr.getvalue(), '')
+        self.assertEqual(report['row_counts']['Customer'], 3)
+        results = report['results']
+        self.assertIn('customers:api-detail[customers]', results)
+        self.assertIn('customers:api-autocomplete[customers]', results)
+        self.assertIn('customers:export[' + next(iter(LISTS)) + ']', results)
+        self.assertIn('customers:async-customer-detail', results)
+        for name, result in results.items():
+            self.assertEqual(result['status'], 200, name)
+            self.assertLessEqual(result['queries_min'], result['queries'])
+            self.assertLessEqual(result['queries'], result['queries_max'])
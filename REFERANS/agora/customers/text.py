@@ -0,0 +1,13 @@
+import unicodedata
+
+# Türkçe küçük harf: İ -> i, I -> ı; ardından aksanlar atılır (ı -> i, ş -> s ...)
+# ki "ISIK", "ışık" ve "isik" aynı terime dönüşsün
+_ASCII = str.maketrans('çğıöşü', 'cgiosu')
+
+
+def fold(text):
+    if not text:
+        return ''
+    text = str(text).replace('İ', 'i').replace('I', 'ı').lower().translate(_ASCII)
+    text = unicodedata.normalize('NFKD', text)
+    return ''.join(char for char in text if not unicodedata.combining(char))
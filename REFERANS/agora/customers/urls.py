@@ -1,10 +1,21 @@
 from django.urls import path
-from . import views
+from . import async_views, views
 
 app_name = 'customers'
 
 urlpatterns = [
     path('', views.dashboard, name='dashboard'),
+    path('api/stats/', views.dashboard_stats_api, name='api-stats'),
+    path('api/expirations/', views.expirations_api, name='api-expirations'),
+    path('api/revenue/', views.revenue_api, name='api-revenue'),
+    path('api/search/', views.search_api, name='api-search'),
+    path('api/autocomplete/<str:resource>/', views.autocomplete_api, name='api-autocomplete'),
+    path('api/changes/', views.changes_api, name='api-changes'),
+    path('api/nameservers/', views.nameserver_domains_api, name='api-nameserver-domains'),
+    path('api/<str:resource>/', views.api_list, name='api-list'),
+    path('api/<str:resource>/<int:pk>/', views.api_detail, name='api-detail'),
+    path('metrics/', views.metrics, name='metrics'),
+    path('export/<str:name>/', views.export, name='export'),
     
     # Müşteri URL'leri
     path('customers/', views.customer_list, name='customer-list'),
@@ -40,4 +51,13 @@ urlpatterns = [
     path('invoices/<int:pk>/', views.invoice_detail, name='invoice-detail'),
     path('invoices/<int:pk>/edit/', views.invoice_edit, name='invoice-edit'),
     path('invoices/<int:pk>/delete/', views.invoice_delete, name='invoice-delete'),
-] 
\ No newline at end of file
+    
+    # Async görünümler (ASGI altında sorgular birlikte beklenir)
+    path('async/', async_views.dashboard, name='async-dashboard'),
+    path('async/customers/', async_views.customer_list, name='async-customer-list'),
+    path('async/customers/<int:pk>/', async_views.customer_detail, name='async-customer-detail'),
+    path('async/hosting/', async_views.hosting_list, name='async-hosting-list'),
+    path('async/domains/', async_views.domain_list, name='async-domain-list'),
+    path('async/ssl/', async_views.ssl_list, name='async-ssl-list'),
+    path('async/invoices/', async_views.invoice_list, name='async-invoice-list'),
+]
@@ -1,19 +1,51 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.auth.decorators import login_required
 from django.contrib import messages
-from django.db.models import Sum, Count, Q
 from django.utils import timezone
-from datetime import timedelta
-from .models import Customer, HostingService, Domain, SSLCertificate, Invoice
+from .models import Customer, HostingService, Domain, SSLCertificate, Invoice, Renewal
 from .forms import CustomerForm, HostingServiceForm, DomainForm, SSLCertificateForm, InvoiceForm
 from django.views.generic import CreateView
 from django.urls import reverse_lazy
+import hmac
+from django.conf import settings
+from django.http import (
+    Http404, HttpResponse, HttpResponseBadRequest, HttpResponseForbidden, JsonResponse, StreamingHttpResponse,
+)
+from django.core.serializers.json import DjangoJSONEncoder
+from .stats import get_dashboard_stats, invoice_stats as get_invoice_stats
+from .pagination import decode_cursor, encode_cursor, get_page_size, get_sort, keyset_paginate
+from .lists import LISTS, paginate_options
+from .exports import export_header, export_queryset, export_rows, stream_csv
+from .xlsx import stream_xlsx
+from .metrics import registry as metrics_registry
+from .api import API_RESOURCES, ApiError, Selection
+from .db import replica_reads
+from .cache import cached, request_key, stats as cache_stats
+from .search import KINDS as SEARCH_KINDS, search as search_index
+from .autocomplete import DEFAULT_LIMIT as AUTOCOMPLETE_LIMIT, RESOURCES as AUTOCOMPLETE_RESOURCES, suggest
+from .sweeper import unpaid_q
+from .purge import soft_delete, soft_delete_enabled
+from .changes import DEFAULT_LIMIT as CHANGES_LIMIT, since as changes_since
+from .nameservers import DEFAULT_LIMIT as NAMESERVER_LIMIT, domains_using, normalize as normalize_nameserver
+from .revenue import GRAINS as REVENUE_GRAINS, add_months, aging as revenue_aging, series as revenue_series
+from .expirations import TYPES as EXPIRATION_TYPES, expiration_index, expiring, soon as expiration_soon
+from django.core.exceptions import ValidationError
+from django.utils.dateparse import parse_date
+
+# Detay sayfalarında gösterilen son yenileme sayısı
+RENEWAL_HISTORY_SIZE = 20
+
+
+def renewal_history(service_type, pk):
+    # renewal_unique_service_time index'inden sıralı okunur; şablon kullanmazsa çalışmaz
+    return Renewal.objects.filter(service_type=service_type, object_id=pk)[:RENEWAL_HISTORY_SIZE]
 
 # Müşteri Views
 @login_required
+@replica_reads
 def customer_list(request):
-    customers = Customer.objects.all().order_by('company_name')
-    return render(request, 'customers/customer_list.html', {'customers': customers})
+    page = keyset_paginate(request, LISTS['customers']['queryset'](), **paginate_options('customers'))
+    return render(request, 'customers/customer_list.html', {'customers': page, 'page': page})
 
 @login_required
 def customer_add(request):
@@ -44,49 +76,35 @@ def customer_edit(request, pk):
 def customer_delete(request, pk):
     customer = get_object_or_404(Customer, pk=pk)
     if request.method == 'POST':
-        customer.delete()
-        messages.success(request, 'Müşteri başarıyla silindi.')
+        if soft_delete_enabled():
+            # İlişkili kayıtlar istek içinde yüklenmez; purge_customers partiler halinde siler
+            soft_delete(customer)
+            messages.success(request, 'Müşteri silindi; ilişkili kayıtlar arka planda temizlenecek.')
+        else:
+            customer.delete()
+            messages.success(request, 'Müşteri başarıyla silindi.')
         return redirect('customers:customer-list')
     return render(request, 'customers/customer_confirm_delete.html', {'customer': customer})
 
 @login_required
+@replica_reads
 def customer_detail(request, pk):
     customer = get_object_or_404(Customer, pk=pk)
     
     # Müşteriye ait hosting hizmetleri
-    hosting_services = HostingService.objects.filter(customer=customer)
+    hosting_services = HostingService.objects.filter(customer=customer).select_related('domain')
     
     # Müşteriye ait domainler
     domains = Domain.objects.filter(customer=customer)
     
     # Müşteriye ait SSL sertifikaları
-    ssl_certificates = SSLCertificate.objects.filter(domain__customer=customer)
+    ssl_certificates = SSLCertificate.objects.filter(domain__customer=customer).select_related('domain')
     
     # Müşteriye ait faturalar
     invoices = Invoice.objects.filter(customer=customer).order_by('-issue_date')
     
-    # Fatura istatistikleri
-    invoice_stats = {
-        'total': invoices.aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-        'paid': invoices.filter(payment_status='paid').aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-        'pending': invoices.filter(payment_status='pending').aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-        'overdue': invoices.filter(
-            payment_status='pending',
-            due_date__lt=timezone.now()
-        ).aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-    }
+    # Fatura istatistikleri (tek aggregate sorgusu)
+    invoice_stats = get_invoice_stats(queryset=invoices.order_by())
     
     context = {
         'customer': customer,
@@ -127,23 +145,28 @@ def hosting_edit(request, pk):
 
 @login_required
 def hosting_delete(request, pk):
-    hosting = get_object_or_404(HostingService, pk=pk)
+    hosting = get_object_or_404(HostingService.objects.select_related('domain'), pk=pk)
     if request.method == 'POST':
-        customer_pk = hosting.customer.pk
+        customer_pk = hosting.customer_id
         hosting.delete()
         messages.success(request, 'Hosting hizmeti başarıyla silindi.')
         return redirect('customers:customer-detail', pk=customer_pk)
     return render(request, 'customers/hosting_confirm_delete.html', {'hosting': hosting})
 
 @login_required
+@replica_reads
 def hosting_list(request):
-    hosting_services = HostingService.objects.all()
-    return render(request, 'customers/hosting_list.html', {'hosting_services': hosting_services})
+    page = keyset_paginate(request, LISTS['hosting']['queryset'](), **paginate_options('hosting'))
+    return render(request, 'customers/hosting_list.html', {'hosting_services': page, 'page': page})
 
 @login_required
+@replica_reads
 def hosting_detail(request, pk):
-    hosting = get_object_or_404(HostingService, pk=pk)
-    return render(request, 'customers/hosting_detail.html', {'hosting': hosting})
+    hosting = get_object_or_404(HostingService.objects.select_related('domain', 'customer'), pk=pk)
+    return render(request, 'customers/hosting_detail.html', {
+        'hosting': hosting,
+        'renewals': renewal_history('hosting', pk),
+    })
 
 # Domain Views
 @login_required
@@ -175,35 +198,34 @@ def domain_edit(request, pk):
 def domain_delete(request, pk):
     domain = get_object_or_404(Domain, pk=pk)
     if request.method == 'POST':
-        customer_pk = domain.customer.pk
+        customer_pk = domain.customer_id
         domain.delete()
         messages.success(request, 'Domain başarıyla silindi.')
         return redirect('customers:customer-detail', pk=customer_pk)
     return render(request, 'customers/domain_confirm_delete.html', {'domain': domain})
 
 @login_required
+@replica_reads
 def domain_list(request):
-    domains = Domain.objects.all().select_related('customer')
-    
-    # Domain istatistikleri
-    stats = {
-        'active': domains.filter(is_active=True),
-        'expired': domains.filter(expiration_date__lt=timezone.now()),
-        'expiring_soon': domains.filter(
-            is_active=True,
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ),
-    }
+    page = cached(
+        'domain_list', [Domain, Customer],
+        lambda: keyset_paginate(request, LISTS['domains']['queryset'](), **paginate_options('domains')),
+        key_parts=request_key(request),
+    )
     
     return render(request, 'customers/domain_list.html', {
-        'domains': domains,
-        'stats': stats,
+        'domains': page,
+        'page': page,
     })
 
 @login_required
+@replica_reads
 def domain_detail(request, pk):
-    domain = get_object_or_404(Domain, pk=pk)
-    return render(request, 'customers/domain_detail.html', {'domain': domain})
+    domain = get_object_or_404(Domain.objects.select_related('customer'), pk=pk)
+    return render(request, 'customers/domain_detail.html', {
+        'domain': domain,
+        'renewals': renewal_history('domain', pk),
+    })
 
 # SSL Views
 @login_required
@@ -233,37 +255,36 @@ def ssl_edit(request, pk):
 
 @login_required
 def ssl_delete(request, pk):
-    ssl = get_object_or_404(SSLCertificate, pk=pk)
+    ssl = get_object_or_404(SSLCertificate.objects.select_related('domain'), pk=pk)
     if request.method == 'POST':
-        domain_pk = ssl.domain.pk
+        domain_pk = ssl.domain_id
         ssl.delete()
         messages.success(request, 'SSL sertifikası başarıyla silindi.')
         return redirect('customers:domain-detail', pk=domain_pk)
     return render(request, 'customers/ssl_confirm_delete.html', {'ssl': ssl})
 
 @login_required
+@replica_reads
 def ssl_list(request):
-    ssl_certificates = SSLCertificate.objects.all().select_related('domain', 'domain__customer')
-    
-    # SSL istatistikleri
-    stats = {
-        'active': ssl_certificates.filter(is_active=True),
-        'expired': ssl_certificates.filter(expiration_date__lt=timezone.now()),
-        'expiring_soon': ssl_certificates.filter(
-            is_active=True,
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ),
-    }
+    page = cached(
+        'ssl_list', [SSLCertificate, Domain, Customer],
+        lambda: keyset_paginate(request, LISTS['ssl']['queryset'](), **paginate_options('ssl')),
+        key_parts=request_key(request),
+    )
     
     return render(request, 'customers/ssl_list.html', {
-        'ssl_certificates': ssl_certificates,
-        'stats': stats,
+        'ssl_certificates': page,
+        'page': page,
     })
 
 @login_required
+@replica_reads
 def ssl_detail(request, pk):
-    ssl = get_object_or_404(SSLCertificate, pk=pk)
-    return render(request, 'customers/ssl_detail.html', {'ssl': ssl})
+    ssl = get_object_or_404(SSLCertificate.objects.select_related('domain__customer'), pk=pk)
+    return render(request, 'customers/ssl_detail.html', {
+        'ssl': ssl,
+        'renewals': renewal_history('ssl', pk),
+    })
 
 # Invoice Views
 @login_required
@@ -295,139 +316,59 @@ def invoice_edit(request, pk):
 def invoice_delete(request, pk):
     invoice = get_object_or_404(Invoice, pk=pk)
     if request.method == 'POST':
-        customer_pk = invoice.customer.pk
+        customer_pk = invoice.customer_id
         invoice.delete()
         messages.success(request, 'Fatura başarıyla silindi.')
         return redirect('customers:customer-detail', pk=customer_pk)
     return render(request, 'customers/invoice_confirm_delete.html', {'invoice': invoice})
 
 @login_required
+@replica_reads
 def invoice_list(request):
-    invoices = Invoice.objects.all().select_related('customer')
-    
-    # Fatura istatistikleri
-    stats = {
-        'all': invoices,
-        'paid': invoices.filter(payment_status='paid'),
-        'pending': invoices.filter(payment_status='pending'),
-        'overdue': invoices.filter(
-            payment_status='pending',
-            due_date__lt=timezone.now()
-        ),
-    }
+    page = cached(
+        'invoice_list', [Invoice, Customer],
+        lambda: keyset_paginate(request, LISTS['invoices']['queryset'](), **paginate_options('invoices')),
+        key_parts=request_key(request),
+    )
     
     return render(request, 'customers/invoice_list.html', {
-        'invoices': invoices,
-        'stats': stats,
+        'invoices': page,
+        'page': page,
     })
 
 @login_required
+@replica_reads
 def invoice_detail(request, pk):
-    invoice = get_object_or_404(Invoice, pk=pk)
+    invoice = get_object_or_404(Invoice.objects.select_related('customer'), pk=pk)
     return render(request, 'customers/invoice_detail.html', {'invoice': invoice})
 
 @login_required
+@replica_reads
 def dashboard(request):
-    # Son 30 günlük istatistikler
-    thirty_days_ago = timezone.now() - timedelta(days=30)
-    
-    # Müşteri istatistikleri
-    customer_stats = {
-        'total': Customer.objects.count(),
-        'new': Customer.objects.filter(created_at__gte=thirty_days_ago).count(),
-    }
-    
-    # Hosting istatistikleri
-    hosting_stats = {
-        'total': HostingService.objects.count(),
-        'active': HostingService.objects.filter(status='active').count(),
-        'suspended': HostingService.objects.filter(status='suspended').count(),
-        'expired': HostingService.objects.filter(status='expired').count(),
-        'expiring_soon': HostingService.objects.filter(
-            status='active',
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ).count(),
-    }
-    
-    # Domain istatistikleri
-    domain_stats = {
-        'total': Domain.objects.count(),
-        'active': Domain.objects.filter(is_active=True).count(),
-        'expired': Domain.objects.filter(
-            expiration_date__lt=timezone.now()
-        ).count(),
-        'expiring_soon': Domain.objects.filter(
-            is_active=True,
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ).count(),
-    }
-    
-    # SSL istatistikleri
-    ssl_stats = {
-        'total': SSLCertificate.objects.count(),
-        'active': SSLCertificate.objects.filter(is_active=True).count(),
-        'expired': SSLCertificate.objects.filter(
-            expiration_date__lt=timezone.now()
-        ).count(),
-        'expiring_soon': SSLCertificate.objects.filter(
-            is_active=True,
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ).count(),
-    }
-    
-    # Fatura istatistikleri
-    invoice_stats = {
-        'total': Invoice.objects.aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-        'paid': Invoice.objects.filter(payment_status='paid').aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-        'pending': Invoice.objects.filter(payment_status='pending').aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-        'overdue': Invoice.objects.filter(
-            payment_status='pending',
-            due_date__lt=timezone.now()
-        ).aggregate(
-            count=Count('id'),
-            amount=Sum('amount')
-        ),
-    }
+    # Tüm sayaçlar model başına tek aggregate sorgusuyla hesaplanır
+    stats = cached_dashboard_stats()
     
     # Son eklenen müşteriler
-    recent_customers = Customer.objects.order_by('-created_at')[:5]
+    recent_customers = cached(
+        'recent_customers', [Customer], lambda: list(Customer.objects.order_by('-created_at')[:5]),
+    )
     
     # Yakında bitecek hizmetler
+    soon = expiration_soon()
     expiring_services = {
-        'hosting': HostingService.objects.filter(
-            status='active',
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ).order_by('expiration_date')[:5],
-        'domains': Domain.objects.filter(
-            is_active=True,
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ).order_by('expiration_date')[:5],
-        'ssl': SSLCertificate.objects.filter(
-            is_active=True,
-            expiration_date__lte=timezone.now() + timedelta(days=30)
-        ).order_by('expiration_date')[:5],
+        'hosting': expiring('hosting', end=soon).select_related('domain', 'customer').order_by('expiration_date')[:5],
+        'domains': expiring('domain', end=soon).select_related('customer').order_by('expiration_date')[:5],
+        'ssl': expiring('ssl', end=soon).select_related('domain', 'customer').order_by('expiration_date')[:5],
     }
     
     # Ödenmemiş faturalar
-    pending_invoices = Invoice.objects.filter(
-        payment_status='pending'
-    ).order_by('due_date')[:5]
+    pending_invoices = cached(
+        'pending_invoices', [Invoice, Customer],
+        lambda: list(Invoice.objects.filter(unpaid_q()).select_related('customer').order_by('due_date')[:5]),
+    )
     
     context = {
-        'customer_stats': customer_stats,
-        'hosting_stats': hosting_stats,
-        'domain_stats': domain_stats,
-        'ssl_stats': ssl_stats,
-        'invoice_stats': invoice_stats,
+        **stats,
         'recent_customers': recent_customers,
         'expiring_services': expiring_services,
         'pending_invoices': pending_invoices,
@@ -435,6 +376,233 @@ def dashboard(request):
     
     return render(request, 'customers/dashboard.html', context)
 
+def cached_dashboard_stats():
+    # Tarih pencereleri (yakında bitecek, gecikmiş) gün değişince yeniden hesaplanır
+    return cached(
+        'dashboard_stats', [Customer, HostingService, Domain, SSLCertificate, Invoice], get_dashboard_stats,
+        key_parts=[timezone.localdate()],
+    )
+
+@login_required
+@replica_reads
+def dashboard_stats_api(request):
+    return JsonResponse(cached_dashboard_stats(), encoder=DjangoJSONEncoder)
+
+@login_required
+@replica_reads
+def revenue_api(request):
+    # ?start=&end= (YYYY-MM-DD, varsayılan son 12 ay), ?grain=month|quarter
+    today = timezone.localdate()
+    try:
+        end = parse_date(request.GET['end']) if request.GET.get('end') else today
+        start = parse_date(request.GET['start']) if request.GET.get('start') else (end and add_months(end, -11))
+    except ValueError:
+        start = end = None
+    if start is None or end is None or start > end:
+        return JsonResponse({'error': 'INVALID_DATE_RANGE'}, status=400)
+    grain = request.GET.get('grain', 'month')
+    if grain not in REVENUE_GRAINS:
+        return JsonResponse({'error': 'INVALID_GRAIN'}, status=400)
+    return JsonResponse({
+        'grain': grain,
+        'series': revenue_series(start, end, grain),
+        'aging': revenue_aging(today),
+    }, encoder=DjangoJSONEncoder)
+
+@login_required
+@replica_reads
+def expirations_api(request):
+    # Worker'daki /renewals karşılığı: ?start=&end= (YYYY-MM-DD), ?type=hosting,domain,ssl, ?active=1, ?after=
+    today = timezone.localdate()
+    try:
+        start = parse_date(request.GET['start']) if request.GET.get('start') else today
+        end = parse_date(request.GET['end']) if request.GET.get('end') else expiration_soon(start)
+    except ValueError:
+        start = end = None
+    if start is None or end is None or start > end:
+        return JsonResponse({'error': 'INVALID_DATE_RANGE'}, status=400)
+
+    requested = request.GET.get('type', 'all').lower()
+    types = EXPIRATION_TYPES if requested == 'all' else tuple(t for t in requested.split(',') if t)
+    if not set(types) <= set(EXPIRATION_TYPES):
+        return JsonResponse({'error': 'INVALID_TYPE'}, status=400)
+    active_only = request.GET.get('active') in ('1', 'true')
+
+    # İmleç: son satırın (expiration_date, type, id) değeri; bozuksa ilk sayfaya dönülür
+    after = decode_cursor(request.GET.get('after'), 'expiration')
+    if after is not None and (len(after) != 3 or after[1] not in EXPIRATION_TYPES):
+        after = None
+    page_size = get_page_size(request)
+    try:
+        rows = list(expiration_index(start, end, types, active_only, after)[:page_size + 1])
+    except (ValidationError, ValueError, TypeError):
+        rows = list(expiration_index(start, end, types, active_only)[:page_size + 1])
+
+    has_next = len(rows) > page_size
+    rows = rows[:page_size]
+    last = rows[-1] if rows else None
+    return JsonResponse({
+        'start': start,
+        'end': end,
+        'items': rows,
+        'has_next': has_next,
+        'next_cursor': encode_cursor('expiration', [last['expiration_date'], last['type'], last['id']]) if has_next else None,
+    }, encoder=DjangoJSONEncoder)
+
+@login_required
+@replica_reads
+def search_api(request):
+    # ?q=, ?type=customer,domain,invoice, ?limit=
+    kinds = [kind for kind in request.GET.get('type', '').split(',') if kind]
+    if not set(kinds) <= set(SEARCH_KINDS):
+        return JsonResponse({'error': 'INVALID_TYPE'}, status=400)
+    try:
+        limit = int(request.GET.get('limit', 20))
+    except ValueError:
+        limit = 20
+    query = request.GET.get('q', '').strip()
+    return JsonResponse({'query': query, 'items': search_index(query, kinds or None, limit)})
+
+@login_required
+@replica_reads
+def autocomplete_api(request, resource):
+    # ?q= (önek), ?limit=, domainler için ?customer=
+    if resource not in AUTOCOMPLETE_RESOURCES:
+        raise Http404
+    filters = {}
+    for name in AUTOCOMPLETE_RESOURCES[resource]['filters']:
+        value = request.GET.get(name, '')
+        if not value:
+            continue
+        if not value.isdigit():
+            return JsonResponse({'error': 'INVALID_FILTER'}, status=400)
+        filters[name] = int(value)
+    try:
+        limit = int(request.GET.get('limit', AUTOCOMPLETE_LIMIT))
+    except ValueError:
+        limit = AUTOCOMPLETE_LIMIT
+    query = request.GET.get('q', '').strip()
+    items, has_more = suggest(resource, query, limit, filters)
+    return JsonResponse({'query': query, 'items': items, 'has_more': has_more})
+
+
+@login_required
+@replica_reads
+def nameserver_domains_api(request):
+    # ?host= (ör. ns1.oldhost.com), ?after= (önceki sayfanın next_cursor'ı), ?limit=
+    host = normalize_nameserver(request.GET.get('host'))
+    if not host:
+        return JsonResponse({'error': 'INVALID_HOST'}, status=400)
+    after = request.GET.get('after', '0') or '0'
+    if not after.isdigit():
+        return JsonResponse({'error': 'INVALID_CURSOR'}, status=400)
+    try:
+        limit = int(request.GET.get('limit', NAMESERVER_LIMIT))
+    except ValueError:
+        limit = NAMESERVER_LIMIT
+    items, has_more = domains_using(host, int(after), limit)
+    return JsonResponse({
+        'nameserver': host,
+        'items': items,
+        'has_more': has_more,
+        'next_cursor': items[-1]['id'] if has_more else None,
+    })
+
+
+@login_required
+@replica_reads
+def changes_api(request):
+    # ?since= (önceki yanıtın next_cursor'ı; 0 ya da yok: baştan), ?limit=, ?type=domains,invoices
+    since = request.GET.get('since', '0') or '0'
+    if not since.isdigit():
+        return JsonResponse({'error': 'INVALID_CURSOR'}, status=400)
+    resources = None
+    if request.GET.get('type'):
+        resources = [name for name in request.GET['type'].replace(' ', '').split(',') if name]
+        if any(name not in API_RESOURCES for name in resources):
+            return JsonResponse({'error': 'INVALID_TYPE'}, status=400)
+    try:
+        limit = int(request.GET.get('limit', CHANGES_LIMIT))
+    except ValueError:
+        limit = CHANGES_LIMIT
+    return JsonResponse(changes_since(int(since), resources, limit), encoder=DjangoJSONEncoder)
+
+
+@login_required
+@replica_reads
+def api_list(request, resource):
+    # ?fields=, ?embed=, ?q=, ?sort=, ?after= / ?before=, ?page_size=
+    if resource not in API_RESOURCES:
+        raise Http404
+    try:
+        selection = Selection(request, resource)
+    except ApiError as exc:
+        return JsonResponse({'error': exc.code, 'detail': exc.detail}, status=400)
+    options = paginate_options(resource)
+    sort = get_sort(request, options['sort_fields'], options['default_sort'])
+    # İmleç için sıralama alanı da okunur; çıktıda yalnızca seçilen alanlar yer alır
+    queryset = API_RESOURCES[resource]['model'].objects.values(*selection.columns(extra=[sort.lstrip('-')]))
+    page = keyset_paginate(request, queryset, **options)
+    return JsonResponse({
+        'items': selection.serialize(page.object_list),
+        'has_next': page.has_next,
+        'has_previous': page.has_previous,
+        'next_cursor': page.next_cursor if page.has_next else None,
+        'previous_cursor': page.previous_cursor if page.has_previous else None,
+    }, encoder=DjangoJSONEncoder)
+
+@login_required
+@replica_reads
+def api_detail(request, resource, pk):
+    if resource not in API_RESOURCES:
+        raise Http404
+    try:
+        selection = Selection(request, resource)
+    except ApiError as exc:
+        return JsonResponse({'error': exc.code, 'detail': exc.detail}, status=400)
+    row = API_RESOURCES[resource]['model'].objects.filter(pk=pk).values(*selection.columns()).first()
+    if row is None:
+        raise Http404
+    return JsonResponse(selection.serialize([row])[0], encoder=DjangoJSONEncoder)
+
+@login_required
+@replica_reads
+def export(request, name):
+    if name not in LISTS:
+        raise Http404
+    file_format = request.GET.get('format', 'csv')
+    if file_format not in ('csv', 'xlsx'):
+        return HttpResponseBadRequest('Desteklenmeyen format.')
+
+    # Satırlar görünüm döndükten sonra (akış sırasında) okunur; okuma bağlantısı şimdi sabitlenir
+    queryset = export_queryset(name, request)
+    queryset = queryset.using(queryset.db)
+    header, rows = export_header(name), export_rows(name, queryset)
+    if file_format == 'xlsx':
+        response = StreamingHttpResponse(
+            stream_xlsx(header, rows, sheet_name=LISTS[name]['title']),
+            content_type='application/vnd.openxmlformats-officedocument.spreadsheetml.sheet',
+        )
+    else:
+        response = StreamingHttpResponse(stream_csv(header, rows), content_type='text/csv; charset=utf-8')
+    filename = f'{name}-{timezone.localdate():%Y-%m-%d}.{file_format}'
+    response['Content-Disposition'] = f'attachment; filename="{filename}"'
+    return response
+
+def metrics(request):
+    # Prometheus kazıyıcıları oturum açamadığı için token ile de erişilebilir
+    token = getattr(settings, 'CUSTOMERS_METRICS_TOKEN', None)
+    header = request.headers.get('Authorization', '')
+    has_token = bool(token) and hmac.compare_digest(header, f'Bearer {token}')
+    if not (has_token or request.user.is_staff):
+        return HttpResponseForbidden()
+    if request.GET.get('format') == 'json':
+        return JsonResponse({'views': metrics_registry.snapshot(), 'cache': cache_stats.snapshot()})
+    return HttpResponse(
+        metrics_registry.prometheus() + cache_stats.prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
 class HostingCreateView(CreateView):
     model = HostingService
     form_class = HostingServiceForm